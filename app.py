@@ -2,18 +2,48 @@ import os
 from datetime import datetime
 from typing import Optional
 
-from fastapi import FastAPI, Request
+from fastapi import BackgroundTasks, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from pydantic import ValidationError
 from starlette.responses import HTMLResponse, RedirectResponse
-from uvicorn import run as app_run
 
 # Importing constants and pipeline modules from the project
-from src.constants import APP_HOST, APP_PORT
-from src.pipeline.prediction_pipeline import VehicleData, VehicleDataClassifier
-from src.pipeline.training_pipeline import TrainPipeline
+from src.constants import (
+    ADMISSION_BATCH_MAX_CONCURRENCY,
+    ADMISSION_BATCH_MAX_QUEUE,
+    ADMISSION_PREDICT_MAX_CONCURRENCY,
+    ADMISSION_PREDICT_MAX_QUEUE,
+    ADMISSION_TRAIN_MAX_CONCURRENCY,
+    ADMISSION_TRAIN_MAX_QUEUE,
+    APP_HOST,
+    APP_PORT,
+    APP_WORKERS,
+    PREDICTION_MAX_BATCH_SIZE,
+    PROMETHEUS_MULTIPROC_DIR,
+    TRAINING_JOB_STATE_DIR,
+)
+from src.logger import get_logging_stats, logging
+from src.entity.prediction_schema import format_validation_errors, get_vehicle_record_adapter
+from src.pipeline.prediction_pipeline import (
+    VehicleData,
+    VehicleDataBatch,
+    VehicleDataClassifier,
+    load_vehicle_model,
+    predict_vehicle_dataframe,
+    predict_vehicle_records,
+)
+from src.pipeline.admission_control import AdmissionController, AdmissionMiddleware, worker_share
+from src.pipeline.prediction_batcher import PredictionBatcher
+from src.pipeline.inference_executor import InferenceExecutor
+from src.pipeline.training_jobs import TrainingJobRunner
+from src.pipeline.prefork_server import PreforkServer
+from src.pipeline.health_monitor import HealthMonitor, probe_model, probe_mongodb
+from src.pipeline.model_warmup import ModelWarmup
+from src.pipeline.shadow_scorer import ShadowScorer
+from src.utils.metrics import clear_stale_metric_files, mark_worker_dead, render_metrics, time_stage
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -28,6 +58,26 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 # Set up Jinja2 template engine for rendering HTML templates
 templates = Jinja2Templates(directory='templates')
 
+def admission_controller(route: str, max_concurrency: int, max_queue: int) -> AdmissionController:
+    # The ADMISSION_* limits are for the whole server; every pre-forked worker admits its share
+    return AdmissionController(route,
+                               worker_share(max_concurrency, APP_WORKERS, minimum=1),
+                               worker_share(max_queue, APP_WORKERS))
+
+# Bounded concurrency and wait queue per route; overload is answered with 503 + Retry-After
+admission_controllers = {
+    "predict": admission_controller("predict", ADMISSION_PREDICT_MAX_CONCURRENCY, ADMISSION_PREDICT_MAX_QUEUE),
+    "batch": admission_controller("batch", ADMISSION_BATCH_MAX_CONCURRENCY, ADMISSION_BATCH_MAX_QUEUE),
+    "train": admission_controller("train", ADMISSION_TRAIN_MAX_CONCURRENCY, ADMISSION_TRAIN_MAX_QUEUE),
+}
+app.add_middleware(AdmissionMiddleware, routes={
+    ("POST", "/"): admission_controllers["predict"],
+    ("POST", "/predict"): admission_controllers["predict"],
+    ("POST", "/predict/batch"): admission_controllers["batch"],
+    ("GET", "/train"): admission_controllers["train"],
+    ("POST", "/train/jobs"): admission_controllers["train"],
+})
+
 # Allow all origins for Cross-Origin Resource Sharing (CORS)
 origins = ["*"]
 
@@ -40,6 +90,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Model loading and inference run in a bounded pool so the event loop stays responsive
+inference_executor = InferenceExecutor()
+
+# Concurrent single-record predictions are coalesced into one vectorized model call
+prediction_batcher = PredictionBatcher(predict_fn=predict_vehicle_records, executor=inference_executor)
+
+# Compiled once from config/schema.yaml, shared by every JSON prediction request
+vehicle_record_adapter = get_vehicle_record_adapter()
+
+# Training runs in a separate worker process, never inside a request handler;
+# pre-forked app workers share job state so any of them can report on or join a run
+training_job_runner = TrainingJobRunner(state_dir=TRAINING_JOB_STATE_DIR if APP_WORKERS > 1 else None)
+
+# Dependency health is probed in the background; /health only reads the last snapshot
+health_monitor = HealthMonitor(probes={"mongodb": probe_mongodb, "model": probe_model})
+
+async def load_production_model():
+    await inference_executor.run(load_vehicle_model)
+
+async def predict_warmup_batch(vehicle_batch: VehicleDataBatch):
+    return await inference_executor.run(predict_vehicle_dataframe, vehicle_batch.get_vehicle_input_data_frame())
+
+# The replica reports ready on /ready only after the model is loaded and synthetic predictions went through
+model_warmup = ModelWarmup(
+    load_model=load_production_model,
+    predict_one=prediction_batcher.predict,
+    predict_batch=predict_warmup_batch,
+)
+
+# A candidate model (SHADOW_MODEL_PATH) scores a sample of requests after their response is sent
+shadow_scorer = ShadowScorer.from_path(production_model=lambda: VehicleDataClassifier().model_holder.get_model())
+
+@app.on_event("startup")
+async def start_health_monitor():
+    health_monitor.start()
+    model_warmup.start()
+
+@app.on_event("shutdown")
+async def shutdown_inference_executor():
+    await model_warmup.stop()
+    await health_monitor.stop()
+    await prediction_batcher.close()
+    shadow_scorer.shutdown()
+    inference_executor.shutdown(wait=False)
+
 class DataForm:
     """
     DataForm class to handle and process incoming form data.
@@ -91,14 +186,15 @@ async def index(request: Request):
 @app.get("/train")
 async def trainRouteClient(request: Request):
     """
-    Endpoint to initiate the model training pipeline.
+    Endpoint to start the model training pipeline as a background job.
     """
     try:
-        train_pipeline = TrainPipeline()
-        train_pipeline.run_pipeline()
+        job, created = training_job_runner.submit()
+        message = "started" if created else "is already running"
         return templates.TemplateResponse(
             "training.html",
-            {"request": request, "context": "Training Completed Successfully!"}
+            {"request": request, "context": f"Training job {job.job_id} {message}. "
+                                            f"Track it at /train/jobs/{job.job_id}"}
         )
 
     except Exception as e:
@@ -107,51 +203,144 @@ async def trainRouteClient(request: Request):
             {"request": request, "context": f"Error Occurred! {e}"}
         )
 
+# Route to submit a training job from API clients
+@app.post("/train/jobs", status_code=202)
+async def submitTrainingJob():
+    """
+    Starts a training job, or returns the one already in flight.
+    """
+    job, created = training_job_runner.submit()
+    return {"job_id": job.job_id, "status": job.status, "merged": not created}
+
+# Route to report status and per-stage progress of a training job
+@app.get("/train/jobs/{job_id}")
+async def trainingJobStatus(job_id: str):
+    job = training_job_runner.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"status": False, "error": f"Unknown training job {job_id}"})
+    return job.to_dict()
+
+# Route to fetch the artifacts produced by a finished training job
+@app.get("/train/jobs/{job_id}/result")
+async def trainingJobResult(job_id: str):
+    job = training_job_runner.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"status": False, "error": f"Unknown training job {job_id}"})
+    if job.is_active:
+        return JSONResponse(status_code=409, content={"status": False, "error": f"Training job is {job.status}"})
+    return job.to_dict(include_result=True)
+
 # Route to handle form submission and make predictions
 @app.post("/")
-async def predictRouteClient(request: Request):
+async def predictRouteClient(request: Request, background_tasks: BackgroundTasks):
     """
     Endpoint to receive form data, process it, and make a prediction.
     """
     try:
         form = DataForm(request)
-        await form.get_vehicle_data()
-
-        vehicle_data = VehicleData(
-                                Gender= form.Gender,
-                                Age = form.Age,
-                                Driving_License = form.Driving_License,
-                                Region_Code = form.Region_Code,
-                                Previously_Insured = form.Previously_Insured,
-                                Annual_Premium = form.Annual_Premium,
-                                Policy_Sales_Channel = form.Policy_Sales_Channel,
-                                Vintage = form.Vintage,
-                                Vehicle_Age_lt_1_Year = form.Vehicle_Age_lt_1_Year,
-                                Vehicle_Age_gt_2_Years = form.Vehicle_Age_gt_2_Years,
-                                Vehicle_Damage_Yes = form.Vehicle_Damage_Yes
-                                )
-
-        # Convert form data into a DataFrame for the model
-        vehicle_df = vehicle_data.get_vehicle_input_data_frame()
-
-        # Initialize the prediction pipeline
-        model_predictor = VehicleDataClassifier()
-
-        # Make a prediction and retrieve the result
-        value = model_predictor.predict(dataframe=vehicle_df)[0]
+        with time_stage("form_parsing"):
+            await form.get_vehicle_data()
+
+        with time_stage("validation"):
+            vehicle_data = VehicleData(
+                                    Gender= form.Gender,
+                                    Age = form.Age,
+                                    Driving_License = form.Driving_License,
+                                    Region_Code = form.Region_Code,
+                                    Previously_Insured = form.Previously_Insured,
+                                    Annual_Premium = form.Annual_Premium,
+                                    Policy_Sales_Channel = form.Policy_Sales_Channel,
+                                    Vintage = form.Vintage,
+                                    Vehicle_Age_lt_1_Year = form.Vehicle_Age_lt_1_Year,
+                                    Vehicle_Age_gt_2_Years = form.Vehicle_Age_gt_2_Years,
+                                    Vehicle_Damage_Yes = form.Vehicle_Damage_Yes
+                                    )
+
+        # Make a prediction, batched together with other in-flight requests
+        value = await prediction_batcher.predict(vehicle_data)
+        shadow_scorer.maybe_schedule(background_tasks, [vehicle_data], [value])
 
         # Interpret the prediction result as 'Response-Yes' or 'Response-No'
         status = "Response-Yes" if value == 1 else "Response-No"
 
         # Render the same HTML page with the prediction result
-        return templates.TemplateResponse(
-            "vehicledata.html",
-            {"request": request, "context": status},
-        )
+        with time_stage("template_render"):
+            return templates.TemplateResponse(
+                "vehicledata.html",
+                {"request": request, "context": status},
+            )
 
     except Exception as e:
         return {"status": False, "error": f"{e}"}
 
+# Route to score one JSON record, validated against the schema.yaml prediction columns
+@app.post("/predict")
+async def predictJsonRouteClient(request: Request, background_tasks: BackgroundTasks):
+    """
+    Endpoint to receive one vehicle as a JSON object and return its prediction.
+    """
+    body = await request.body()
+    try:
+        with time_stage("validation"):
+            record = vehicle_record_adapter.validate_json(body)
+    except ValidationError as ve:
+        return JSONResponse(
+            status_code=422,
+            content={"status": False, "errors": format_validation_errors(ve.errors(include_url=False))},
+        )
+
+    try:
+        vehicle_data = VehicleData.from_validated(record)
+        value = await prediction_batcher.predict(vehicle_data)
+        shadow_scorer.maybe_schedule(background_tasks, [vehicle_data], [value])
+        return {
+            "status": True,
+            "prediction": int(value),
+            "label": "Response-Yes" if value == 1 else "Response-No",
+        }
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"status": False, "error": f"{e}"})
+
+# Route to score many records in one vectorized call
+@app.post("/predict/batch")
+async def predictBatchRouteClient(request: Request, background_tasks: BackgroundTasks):
+    """
+    Endpoint to receive a JSON body {"records": [...]} and predict every record at once.
+    """
+    try:
+        body = await request.json()
+    except ValueError as ve:
+        # Malformed JSON (or bytes that are not UTF-8) is the client's error, not the server's
+        return JSONResponse(status_code=400, content={"status": False, "error": f"Request body is not valid JSON: {ve}"})
+    records = body.get("records") if isinstance(body, dict) else body
+
+    if isinstance(records, list) and len(records) > PREDICTION_MAX_BATCH_SIZE:
+        return JSONResponse(
+            status_code=413,
+            content={"status": False,
+                     "error": f"Batch of {len(records)} records exceeds the limit of {PREDICTION_MAX_BATCH_SIZE}"},
+        )
+
+    try:
+        vehicle_batch = VehicleDataBatch(records)
+    except ValueError as ve:
+        return JSONResponse(status_code=422, content={"status": False, "error": str(ve)})
+
+    try:
+        # One DataFrame, one transform and one predict call for the whole batch
+        vehicle_df = vehicle_batch.get_vehicle_input_data_frame()
+        predictions = await inference_executor.run(predict_vehicle_dataframe, vehicle_df)
+        shadow_scorer.maybe_schedule(background_tasks, vehicle_df, predictions)
+
+        return {
+            "status": True,
+            "count": vehicle_batch.size,
+            "predictions": [int(value) for value in predictions],
+        }
+
+    except Exception as e:
+        return JSONResponse(status_code=500, content={"status": False, "error": f"{e}"})
+
 # Health check endpoint for monitoring
 @app.get("/health")
 async def health_check():
@@ -159,29 +348,25 @@ async def health_check():
     Health check endpoint for monitoring the application status
     """
     try:
-        # Check if we can connect to MongoDB
-        mongo_status = "OK"
-        try:
-            from pymongo import MongoClient
-            mongodb_url = os.getenv("MONGODB_URL", "mongodb://localhost:27017/")
-            client = MongoClient(mongodb_url, serverSelectionTimeoutMS=1000)
-            client.server_info()  # Will raise an exception if cannot connect
-        except Exception as e:
-            mongo_status = f"Error: {str(e)}"
-
-        # Check if model files exist
-        from src.constants import ARTIFACT_DIR
-        local_model_path = os.path.join(ARTIFACT_DIR, "production_model", "model.pkl")
-        model_status = "OK" if os.path.exists(local_model_path) else "Not found"
-
+        # Dependencies are probed by the background health monitor, never on the request path
+        health = health_monitor.snapshot()
         return {
-            "status": "healthy",
+            "status": health["status"],
             "timestamp": str(datetime.now()),
             "environment": os.getenv("ENVIRONMENT", "development"),
-            "services": {
-                "mongodb": mongo_status,
-                "model": model_status
-            }
+            "checked_at": health["checked_at"],
+            "probe_age_seconds": health["probe_age_seconds"],
+            "services": health["services"],
+            "inference": {
+                "executor": inference_executor.stats(),
+                "batcher": prediction_batcher.stats(),
+                "prediction_cache": VehicleDataClassifier().prediction_cache.stats(),
+                "model": VehicleDataClassifier().model_holder.stats()
+            },
+            "warmup": model_warmup.snapshot(),
+            "shadow": shadow_scorer.stats(),
+            "admission": {route: controller.stats() for route, controller in admission_controllers.items()},
+            "logging": get_logging_stats()
         }
     except Exception as e:
         return {
@@ -190,6 +375,36 @@ async def health_check():
             "timestamp": str(datetime.now())
         }
 
+# Readiness endpoint for load balancers; liveness stays on /health
+@app.get("/ready")
+async def readiness_check():
+    """
+    Returns 200 once the startup warm-up has completed, 503 until then
+    """
+    warmup = model_warmup.snapshot()
+    return JSONResponse(status_code=200 if warmup["ready"] else 503, content=warmup)
+
+# Prometheus scrape endpoint for the in-process serving metrics
+@app.get("/metrics")
+async def metrics():
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
+
+def preload_production_model():
+    """
+    Loads and compiles the production model in the pre-fork master so workers share it.
+    """
+    holder = VehicleDataClassifier().model_holder
+    try:
+        holder.get_model()
+    except Exception as e:
+        logging.warning(f"Model preload failed, workers will load it on first request: {e}")
+    # Threads do not survive fork; every worker restarts its own watcher
+    holder.stop_watcher()
+
+def start_worker_model_watcher():
+    VehicleDataClassifier().model_holder.start_watcher()
+
 # Main entry point to start the FastAPI server
 if __name__ == "__main__":
     import webbrowser
@@ -208,4 +423,21 @@ if __name__ == "__main__":
     # Start the FastAPI server
     print(f"\n🚀 Starting server at http://{APP_HOST}:{APP_PORT}")
     print(f"✨ Environment: {os.getenv('ENVIRONMENT', 'development')}")
-    app_run(app, host=APP_HOST, port=APP_PORT)
\ No newline at end of file
+    clear_stale_metric_files()
+    if APP_WORKERS > 1:
+        if not PROMETHEUS_MULTIPROC_DIR:
+            logging.warning("PROMETHEUS_MULTIPROC_DIR is not set: /metrics only reports the worker answering the scrape")
+        # Production mode: one model in the master, shared copy-on-write by forked workers
+        PreforkServer(
+            app,
+            host=APP_HOST,
+            port=APP_PORT,
+            workers=APP_WORKERS,
+            preload=preload_production_model,
+            post_fork=start_worker_model_watcher,
+            worker_exit=mark_worker_dead,
+        ).run()
+    else:
+        from uvicorn import run as app_run
+
+        app_run(app, host=APP_HOST, port=APP_PORT)
\ No newline at end of file
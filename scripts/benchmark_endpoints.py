@@ -0,0 +1,216 @@
+"""
+Load-test benchmark for the serving endpoints of app.py.
+Drives the routes through an in-process ASGI transport (no sockets, no uvicorn) with a local
+model file standing in for S3 and a stub probe standing in for MongoDB, sweeps concurrency
+levels and reports requests/s, p50/p95/p99 latency and peak RSS.
+
+The transport sends no lifespan events, so the app's startup and shutdown handlers are run
+around the measurement: the health loop and the model warm-up are live, and measuring only
+starts once /ready answers 200.
+
+Usage:
+    python scripts/benchmark_endpoints.py                                   # synthetic 200-tree model
+    python scripts/benchmark_endpoints.py --model artifact/production_model/model.pkl
+    python scripts/benchmark_endpoints.py --concurrency 1 16 64 --requests 1000 --output bench.json
+    python scripts/benchmark_endpoints.py --baseline bench.json             # fail on regressions
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from src.utils.synthetic_data import synthetic_vehicle_model, synthetic_vehicle_records
+
+ENDPOINTS = ("form", "health", "batch")
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def is_error(response) -> bool:
+    """
+    POST / answers failures with 200 and {"status": false, "error": ...}, and /health reports
+    an unhealthy or degraded service in a 200 body, so the status code alone is not enough.
+    """
+    if response.status_code != 200:
+        return True
+    if not response.headers.get("content-type", "").startswith("application/json"):
+        return False
+    status = response.json().get("status")
+    return status is False or status in ("unhealthy", "degraded")
+
+
+async def run_level(client, endpoint: str, concurrency: int, total: int, records: list, batch_size: int) -> dict:
+    """
+    Sends `total` requests to one endpoint from `concurrency` concurrent clients.
+    """
+    latencies, errors = [], 0
+    next_request = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for index in next_request:
+            record = records[index % len(records)]
+            start = time.perf_counter()
+            if endpoint == "form":
+                response = await client.post("/", data=record)
+            elif endpoint == "health":
+                response = await client.get("/health")
+            else:
+                batch = [records[(index + offset) % len(records)] for offset in range(batch_size)]
+                response = await client.post("/predict/batch", json={"records": batch})
+            latencies.append(time.perf_counter() - start)
+            if is_error(response):
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = np.asarray(latencies) * 1000
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "requests_per_second": total / elapsed,
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p95_ms": float(np.percentile(latencies_ms, 95)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+async def wait_until_ready(client, timeout: float = 120) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        response = await client.get("/ready")
+        if response.status_code == 200:
+            return
+        if time.monotonic() >= deadline:
+            raise RuntimeError(f"App not ready after {timeout:.0f}s: {response.json()}")
+        await asyncio.sleep(0.1)
+
+
+async def run_benchmark(args, model_path: str) -> list:
+    import httpx
+
+    from src.entity.model_holder import ProductionModelHolder
+
+    # S3 stand-in: serve the local model file only
+    ProductionModelHolder.set_instance(
+        ProductionModelHolder(local_model_path=model_path, reload_interval=0, use_s3=False)
+    )
+    import app as app_module
+
+    # MongoDB stand-in: the health loop probes a stub instead of a live cluster
+    app_module.health_monitor.probes["mongodb"] = lambda: "OK (stand-in)"
+
+    # A bounded pool of records gives a realistic prediction cache hit rate
+    records = synthetic_vehicle_records(args.distinct_records)
+    results = []
+    # Starts the health loop and the model warm-up, as uvicorn would
+    await app_module.app.router.startup()
+    try:
+        async with httpx.AsyncClient(app=app_module.app, base_url="http://benchmark") as client:
+            await wait_until_ready(client)
+            for endpoint in args.endpoints:
+                for concurrency in args.concurrency:
+                    total = args.batch_requests if endpoint == "batch" else args.requests
+                    result = await run_level(client, endpoint, concurrency, total, records, args.batch_size)
+                    results.append(result)
+                    print(f"{endpoint:>7} c={concurrency:<4} {result['requests_per_second']:>9.1f} req/s  "
+                          f"p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  "
+                          f"p99 {result['p99_ms']:>8.2f} ms  errors {result['errors']}  "
+                          f"peak rss {result['peak_rss_mb']:.0f} MB")
+    finally:
+        # Stops the background loops and drains the batcher and the inference pool
+        await app_module.app.router.shutdown()
+    return results
+
+
+def compare(results: list, baseline_path: str, max_regression: float) -> list:
+    """
+    Returns descriptions of every endpoint/concurrency whose throughput dropped by more than max_regression.
+    """
+    with open(baseline_path) as file:
+        baseline = {(entry["endpoint"], entry["concurrency"]): entry for entry in json.load(file)["results"]}
+    regressions = []
+    for result in results:
+        previous = baseline.get((result["endpoint"], result["concurrency"]))
+        if previous is None:
+            continue
+        change = result["requests_per_second"] / previous["requests_per_second"] - 1
+        if change < -max_regression:
+            regressions.append(f"{result['endpoint']} c={result['concurrency']}: "
+                               f"{previous['requests_per_second']:.1f} -> {result['requests_per_second']:.1f} req/s "
+                               f"({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app.py endpoints in-process.")
+    parser.add_argument("--model", help="Pickled MyModel to serve; a synthetic 200-tree model is used otherwise")
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=list(ENDPOINTS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--requests", type=int, default=500, help="Requests per endpoint and concurrency level")
+    parser.add_argument("--batch-size", type=int, default=100, help="Records per /predict/batch request")
+    parser.add_argument("--batch-requests", type=int, default=100,
+                        help="/predict/batch requests per concurrency level")
+    parser.add_argument("--distinct-records", type=int, default=1000, help="Size of the record pool")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Earlier JSON output to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Allowed relative drop in requests/s before failing against the baseline")
+    args = parser.parse_args()
+
+    os.chdir(ROOT_DIR)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model_path = args.model
+        if model_path is None:
+            from src.utils.main_utils import save_object
+
+            model_path = os.path.join(temp_dir, "model.pkl")
+            save_object(model_path, synthetic_vehicle_model())
+
+        # Request logging would dominate the measurement
+        logging.getLogger().setLevel(logging.WARNING)
+        results = asyncio.run(run_benchmark(args, model_path))
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"commit": git_commit(), "python": sys.version.split()[0],
+                       "cpu_count": os.cpu_count(), "results": results}, file, indent=4)
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.max_regression)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        return 1 if regressions else 0
+    return 0 if all(result["errors"] == 0 for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
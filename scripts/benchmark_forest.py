@@ -0,0 +1,86 @@
+"""
+Benchmark for the flattened forest evaluator.
+Compares RandomForestClassifier.predict with FlatForest.predict at several batch sizes
+and checks that both return identical predictions.
+
+Usage:
+    python scripts/benchmark_forest.py                       # synthetic 200-tree forest
+    python scripts/benchmark_forest.py --model artifact/production_model/model.pkl
+    python scripts/benchmark_forest.py --batch-sizes 1 100 100000 --output bench.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.entity.flat_forest import FlatForest
+from src.utils.synthetic_data import synthetic_vehicle_frame, synthetic_vehicle_model
+
+
+def time_call(fn, features, min_seconds: float = 0.5) -> float:
+    """Returns the best per-call wall time in seconds over repeated runs."""
+    fn(features)
+    best, elapsed, runs = float("inf"), 0.0, 0
+    while elapsed < min_seconds or runs < 3:
+        start = time.perf_counter()
+        fn(features)
+        duration = time.perf_counter() - start
+        best = min(best, duration)
+        elapsed += duration
+        runs += 1
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sklearn vs flattened forest inference.")
+    parser.add_argument("--model", help="Path to a pickled MyModel; a synthetic forest is used otherwise")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 100, 100000])
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    if args.model:
+        from src.utils.main_utils import load_object
+        model = load_object(args.model)
+    else:
+        model = synthetic_vehicle_model(n_rows=20000)
+    forest = model.trained_model_object
+
+    flat = FlatForest.from_estimator(forest)
+    if flat is None:
+        print(f"{type(forest).__name__} cannot be flattened")
+        return 1
+
+    results = []
+    print(f"{flat.n_trees} trees, max depth {flat.max_depth}, {len(flat.feature)} nodes")
+    print(f"{'batch':>8} {'sklearn ms':>12} {'flat ms':>10} {'speed-up':>9} {'identical':>10}")
+    for batch_size in args.batch_sizes:
+        # Preprocessed synthetic records follow the same tree paths as real requests
+        features = model.preprocessing_object.transform(synthetic_vehicle_frame(batch_size, seed=7))
+        identical = bool(np.array_equal(forest.predict(features), flat.predict(features)))
+        sklearn_seconds = time_call(forest.predict, features)
+        flat_seconds = time_call(flat.predict, features)
+        results.append({
+            "batch_size": batch_size,
+            "sklearn_ms": sklearn_seconds * 1000,
+            "flat_ms": flat_seconds * 1000,
+            "speed_up": sklearn_seconds / flat_seconds,
+            "identical": identical,
+        })
+        print(f"{batch_size:>8} {sklearn_seconds * 1000:>12.3f} {flat_seconds * 1000:>10.3f} "
+              f"{sklearn_seconds / flat_seconds:>8.1f}x {str(identical):>10}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"trees": flat.n_trees, "max_depth": flat.max_depth, "results": results}, file, indent=4)
+
+    return 0 if all(result["identical"] for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
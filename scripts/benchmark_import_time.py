@@ -0,0 +1,95 @@
+"""
+Import-time budget for the serving entry point.
+Runs `python -X importtime -c "import app"` in a fresh interpreter, prints the slowest
+imports and fails when the total exceeds the budget or a training-only module is loaded.
+
+Usage:
+    python scripts/benchmark_import_time.py
+    python scripts/benchmark_import_time.py --module app --budget-ms 1500 --top 15 --output imports.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Default budget for `import app`, in milliseconds
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", 1500))
+
+# Modules serving must not pay for at startup; they load on first use
+FORBIDDEN_MODULES = (
+    "src.pipeline.training_pipeline",
+    "src.components",
+    "imblearn",
+    "sklearn.ensemble",
+    "boto3",
+    "mypy_boto3_s3",
+    "pymongo",
+)
+
+
+def measure(module: str) -> list:
+    """
+    Returns (self_us, cumulative_us, depth, name) for every module imported by `import module`.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the import time of the serving entry point.")
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest top-level imports to print")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    imports = measure(args.module)
+    loaded = {name for _, _, _, name in imports}
+    total_ms = next(cumulative for _, cumulative, depth, name in imports if name == args.module and depth == 0) / 1000
+    forbidden = sorted(
+        name for name in loaded
+        if any(name == module or name.startswith(f"{module}.") for module in FORBIDDEN_MODULES)
+    )
+
+    # Imports directly below the entry module (listed after the previous top-level import), slowest first
+    module_index = next(index for index, entry in enumerate(imports) if entry[3] == args.module and entry[2] == 0)
+    start = max((index for index, entry in enumerate(imports[:module_index]) if entry[2] == 0), default=-1) + 1
+    direct = sorted((entry for entry in imports[start:module_index] if entry[2] == 1),
+                    key=lambda entry: entry[1], reverse=True)
+    print(f"import {args.module}: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms), {len(loaded)} modules")
+    for _, cumulative, _, name in direct[:args.top]:
+        print(f"{cumulative / 1000:>10.1f} ms  {name}")
+    if forbidden:
+        print(f"Forbidden modules imported: {', '.join(forbidden)}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({
+                "module": args.module,
+                "total_ms": total_ms,
+                "budget_ms": args.budget_ms,
+                "modules": len(loaded),
+                "forbidden": forbidden,
+                "slowest": [{"module": name, "cumulative_ms": cumulative / 1000}
+                            for _, cumulative, _, name in direct[:args.top]],
+            }, file, indent=4)
+
+    return 0 if total_ms <= args.budget_ms and not forbidden else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
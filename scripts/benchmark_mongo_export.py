@@ -0,0 +1,193 @@
+"""
+Benchmark for the range-partitioned MongoDB export of src/data_access/columnar.py.
+Exports the same collection with 1, 2, 4, ... partitions and reports wall-clock time,
+documents/s and the speedup over a single cursor.
+
+Backends:
+    memory     in-process stand-in: documents decoded into fresh dicts, a simulated network
+               round trip (--latency-ms) per cursor batch (default)
+    mongomock  mongomock collection, pure Python and slow: use small --documents
+    mongodb    a real mongod at --url; a temporary collection is created, indexed and dropped
+
+Usage:
+    python scripts/benchmark_mongo_export.py
+    python scripts/benchmark_mongo_export.py --documents 500000 --partitions 1 2 4 8 --latency-ms 5
+    python scripts/benchmark_mongo_export.py --backend mongodb --url mongodb://localhost:27017/
+"""
+
+import argparse
+import bisect
+import json
+import os
+import random
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+BACKENDS = ("memory", "mongomock", "mongodb")
+
+
+def synthetic_documents(count: int, seed: int = 0) -> list:
+    """Documents shaped like the Insurance-Data collection."""
+    rng = random.Random(seed)
+    return [{
+        "id": index,
+        "Gender": rng.choice(("Male", "Female")),
+        "Age": rng.randint(20, 85),
+        "Driving_License": 1,
+        "Region_Code": float(rng.randint(0, 52)),
+        "Previously_Insured": rng.randint(0, 1),
+        "Vehicle_Age": rng.choice(("< 1 Year", "1-2 Year", "> 2 Years")),
+        "Vehicle_Damage": rng.choice(("Yes", "No")),
+        "Annual_Premium": float(rng.randint(2630, 60000)),
+        "Policy_Sales_Channel": float(rng.randint(1, 163)),
+        "Vintage": rng.randint(10, 299),
+        "Response": rng.randint(0, 1),
+    } for index in range(count)]
+
+
+class MemoryCursor:
+    def __init__(self, collection, documents: list, projection: dict):
+        self.collection = collection
+        self.documents = documents
+        self.fields = [name for name, include in (projection or {}).items() if include and name != "_id"]
+        self._batch_size = 101
+        self._limit = 0
+        self._sort = None
+
+    def batch_size(self, size: int):
+        self._batch_size = size
+        return self
+
+    def max_time_ms(self, _milliseconds: int):
+        return self
+
+    def limit(self, count: int):
+        self._limit = count
+        return self
+
+    def sort(self, key: str, direction: int):
+        self._sort = (key, direction)
+        return self
+
+    def __iter__(self):
+        documents = self.documents
+        if self._sort is not None:
+            key, direction = self._sort
+            documents = sorted(documents, key=lambda document: document[key], reverse=direction < 0)
+        if self._limit:
+            documents = documents[:self._limit]
+        fields = self.fields
+        for start in range(0, len(documents), self._batch_size):
+            # One getMore round trip per batch; sleeping releases the GIL like a socket read does
+            time.sleep(self.collection.latency)
+            for document in documents[start:start + self._batch_size]:
+                # The driver decodes every document from BSON into a new dict
+                yield {name: document[name] for name in fields if name in document} if fields else dict(document)
+
+
+class MemoryCollection:
+    """
+    Stand-in for a pymongo collection indexed on `key`; supports the queries the exporter issues.
+    """
+
+    name = "benchmark"
+
+    def __init__(self, documents: list, key: str, latency_ms: float):
+        self.key = key
+        self.latency = latency_ms / 1000
+        self.documents = sorted(documents, key=lambda document: document[key])
+        self.keys = [document[key] for document in self.documents]
+
+    def estimated_document_count(self) -> int:
+        return len(self.documents)
+
+    def _select(self, query: dict) -> list:
+        if not query:
+            return self.documents
+        condition = query[self.key]
+        if condition is None:
+            return []
+        low = bisect.bisect_left(self.keys, condition["$gte"]) if "$gte" in condition else 0
+        high = bisect.bisect_left(self.keys, condition["$lt"]) if "$lt" in condition else len(self.keys)
+        return self.documents[low:high]
+
+    def find(self, query=None, projection=None):
+        return MemoryCursor(self, self._select(query), projection)
+
+    def aggregate(self, pipeline: list):
+        size = next(stage["$sample"]["size"] for stage in pipeline if "$sample" in stage)
+        return [{self.key: document[self.key]}
+                for document in random.sample(self.documents, min(size, len(self.documents)))]
+
+
+def make_collection(args, documents: list):
+    """Returns (collection, cleanup)."""
+    if args.backend == "memory":
+        return MemoryCollection(documents, args.partition_key, args.latency_ms), lambda: None
+
+    if args.backend == "mongomock":
+        import mongomock
+
+        collection = mongomock.MongoClient()["vehicle"]["benchmark"]
+    else:
+        import pymongo
+
+        collection = pymongo.MongoClient(args.url)[args.database][f"benchmark_export_{os.getpid()}"]
+    collection.insert_many(documents)
+    collection.create_index(args.partition_key)
+    return collection, collection.drop
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the partitioned MongoDB export.")
+    parser.add_argument("--backend", choices=BACKENDS, default="memory")
+    parser.add_argument("--url", default="mongodb://localhost:27017/", help="mongod URL for --backend mongodb")
+    parser.add_argument("--database", default="vehicle")
+    parser.add_argument("--documents", type=int, default=200000)
+    parser.add_argument("--partitions", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--partition-key", default="id")
+    parser.add_argument("--split-method", choices=("sample", "minmax"), default="sample")
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--latency-ms", type=float, default=5.0,
+                        help="Simulated round trip per cursor batch for --backend memory")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    os.chdir(ROOT_DIR)
+    from src.data_access.columnar import export_collection_columnar, read_schema_column_types
+
+    column_types = read_schema_column_types()
+    collection, cleanup = make_collection(args, synthetic_documents(args.documents))
+    results = []
+    try:
+        for partitions in args.partitions:
+            start = time.perf_counter()
+            dataframe = export_collection_columnar(
+                collection, column_types, batch_size=args.batch_size, partitions=partitions,
+                partition_key=args.partition_key, split_method=args.split_method,
+            )
+            elapsed = time.perf_counter() - start
+            if len(dataframe) != args.documents:
+                raise RuntimeError(f"{partitions} partitions exported {len(dataframe)} of {args.documents} documents")
+            results.append({"partitions": partitions, "seconds": elapsed, "documents_per_second": len(dataframe) / elapsed})
+    finally:
+        cleanup()
+
+    baseline = results[0]["seconds"]
+    for result in results:
+        result["speedup"] = baseline / result["seconds"]
+        print(f"partitions {result['partitions']:>3}  {result['seconds']:>7.2f} s  "
+              f"{result['documents_per_second']:>10.0f} docs/s  speedup {result['speedup']:.2f}x")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({"backend": args.backend, "documents": args.documents, "batch_size": args.batch_size,
+                       "latency_ms": args.latency_ms, "cpu_count": os.cpu_count(), "results": results}, file, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
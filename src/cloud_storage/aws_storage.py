@@ -1,15 +1,18 @@
 import boto3
 from src.configuration.aws_connection import S3Client
 from io import StringIO
-from typing import Union,List
+from typing import TYPE_CHECKING, Union,List
 import os,sys
 from src.logger import logging
-from mypy_boto3_s3.service_resource import Bucket
 from src.exception import MyException
 from botocore.exceptions import ClientError
 from pandas import DataFrame,read_csv
 import pickle
 
+if TYPE_CHECKING:
+    # Type stubs only, not needed at runtime
+    from mypy_boto3_s3.service_resource import Bucket
+
 
 class SimpleStorageService:
     """
@@ -71,7 +74,7 @@ class SimpleStorageService:
         except Exception as e:
             raise MyException(e, sys) from e
 
-    def get_bucket(self, bucket_name: str) -> Bucket:
+    def get_bucket(self, bucket_name: str) -> "Bucket":
         """
         Retrieves the S3 bucket object based on the provided bucket name.
 
@@ -111,6 +114,24 @@ class SimpleStorageService:
         except Exception as e:
             raise MyException(e, sys) from e
 
+    def get_object_version(self, s3_key: str, bucket_name: str) -> str:
+        """
+        Returns a cheap version token for an S3 object without downloading it.
+
+        Args:
+            s3_key (str): Key path of the object in the bucket.
+            bucket_name (str): Name of the S3 bucket.
+
+        Returns:
+            str: The object's ETag combined with its LastModified timestamp.
+        """
+        try:
+            head = self.s3_client.head_object(Bucket=bucket_name, Key=s3_key)
+            etag = head["ETag"].strip('"')
+            return f"{etag}@{head['LastModified'].isoformat()}"
+        except Exception as e:
+            raise MyException(e, sys) from e
+
     def load_model(self, model_name: str, bucket_name: str, model_dir: str = None) -> object:
         """
         Loads a serialized model from the specified S3 bucket.
@@ -1,4 +1,3 @@
-import os
 import sys
 
 from pandas import DataFrame
@@ -9,6 +8,7 @@ from src.entity.artifact_entity import DataIngestionArtifact
 from src.exception import MyException
 from src.logger import logging
 from src.data_access.insurance_data import InsuranceData
+from src.utils.main_utils import log_memory_usage, write_dataframe
 
 
 class DataIngestion:
@@ -26,7 +26,7 @@ class DataIngestion:
     def export_data_into_feature_store(self) -> DataFrame:
         """
         Method Name :   export_data_into_feature_store
-        Description :   This method exports data from mongodb to csv file
+        Description :   This method exports data from mongodb to the parquet feature store
 
         Output      :   data is returned as artifact of data ingestion components
         On Failure  :   Write an exception log and then raise an exception
@@ -35,16 +35,20 @@ class DataIngestion:
             logging.info(f"Exporting data from mongodb")
             my_data = InsuranceData()
             dataframe = my_data.export_collection_as_dataframe(
-                collection_name=self.data_ingestion_config.collection_name
+                collection_name=self.data_ingestion_config.collection_name,
+                feature_store_cache_dir=self.data_ingestion_config.feature_store_cache_dir,
             )
             logging.info(f"Shape of dataframe: {dataframe.shape}")
+            log_memory_usage("data_ingestion", feature_store=dataframe)
             feature_store_file_path = self.data_ingestion_config.feature_store_file_path
-            dir_path = os.path.dirname(feature_store_file_path)
-            os.makedirs(dir_path, exist_ok=True)
             logging.info(
                 f"Saving exported data into feature store file path: {feature_store_file_path}"
             )
-            dataframe.to_csv(feature_store_file_path, index=False, header=True)
+            write_dataframe(feature_store_file_path, dataframe)
+            csv_file_path = self.data_ingestion_config.feature_store_csv_file_path
+            if csv_file_path:
+                logging.info(f"Exporting feature store as csv to: {csv_file_path}")
+                write_dataframe(csv_file_path, dataframe)
             return dataframe
 
         except Exception as e:
@@ -65,19 +69,13 @@ class DataIngestion:
                 dataframe, test_size=self.data_ingestion_config.train_test_split_ratio
             )
             logging.info("Performed train test split on the dataframe")
+            log_memory_usage("data_ingestion", train=train_set, test=test_set)
             logging.info(
                 "Exited split_data_as_train_test method of Data_Ingestion class"
             )
-            dir_path = os.path.dirname(self.data_ingestion_config.training_file_path)
-            os.makedirs(dir_path, exist_ok=True)
-
             logging.info(f"Exporting train and test file path.")
-            train_set.to_csv(
-                self.data_ingestion_config.training_file_path, index=False, header=True
-            )
-            test_set.to_csv(
-                self.data_ingestion_config.testing_file_path, index=False, header=True
-            )
+            write_dataframe(self.data_ingestion_config.training_file_path, train_set)
+            write_dataframe(self.data_ingestion_config.testing_file_path, test_set)
 
             logging.info(f"Exported train and test file path.")
         except Exception as e:
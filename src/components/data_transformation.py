@@ -15,7 +15,7 @@ from src.entity.artifact_entity import (
 )
 from src.exception import MyException
 from src.logger import logging
-from src.utils.main_utils import save_object, save_numpy_array_data, read_yaml_file
+from src.utils.main_utils import save_object, save_numpy_array_data, read_yaml_file, read_dataframe, log_memory_usage
 
 
 class DataTransformation:
@@ -33,10 +33,10 @@ class DataTransformation:
         except Exception as e:
             raise MyException(e, sys)
 
-    @staticmethod
-    def read_data(file_path) -> pd.DataFrame:
+    def read_data(self, file_path) -> pd.DataFrame:
         try:
-            return pd.read_csv(file_path)
+            columns = [name for column in self._schema_config["columns"] for name in column]
+            return read_dataframe(file_path, columns=columns, dtypes=self._schema_config.get("compact_dtypes"))
         except Exception as e:
             raise MyException(e, sys)
 
@@ -87,7 +87,7 @@ class DataTransformation:
     def _map_gender_column(self, df):
         """Map Gender column to 0 for Female and 1 for Male."""
         logging.info("Mapping 'Gender' column to binary values")
-        df["Gender"] = df["Gender"].map({"Female": 0, "Male": 1}).astype(int)
+        df["Gender"] = df["Gender"].map({"Female": 0, "Male": 1}).astype("int8")
         return df
 
     def _create_dummy_columns(self, df):
@@ -111,7 +111,7 @@ class DataTransformation:
             "Vehicle_Damage_Yes",
         ]:
             if col in df.columns:
-                df[col] = df[col].astype("int")
+                df[col] = df[col].astype("int8")
         return df
 
     def _drop_id_column(self, df):
@@ -139,6 +139,7 @@ class DataTransformation:
                 file_path=self.data_ingestion_artifact.test_file_path
             )
             logging.info("Train-Test data loaded")
+            log_memory_usage("data_transformation", train=train_df, test=test_df)
 
             input_feature_train_df = train_df.drop(columns=[TARGET_COLUMN], axis=1)
             target_feature_train_df = train_df[TARGET_COLUMN]
@@ -158,6 +159,8 @@ class DataTransformation:
             input_feature_test_df = self._create_dummy_columns(input_feature_test_df)
             input_feature_test_df = self._rename_columns(input_feature_test_df)
             logging.info("Custom transformations applied to train and test data")
+            log_memory_usage("data_transformation", train_features=input_feature_train_df,
+                             test_features=input_feature_test_df)
 
             logging.info("Starting data transformation")
             preprocessor = self.get_data_transformer_object()
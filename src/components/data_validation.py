@@ -2,13 +2,11 @@ import json
 import sys
 import os
 
-import pandas as pd
-
 from pandas import DataFrame
 
 from src.exception import MyException
 from src.logger import logging
-from src.utils.main_utils import read_yaml_file
+from src.utils.main_utils import read_yaml_file, read_dataframe_schema
 from src.entity.artifact_entity import DataIngestionArtifact, DataValidationArtifact
 from src.entity.config_entity import DataValidationConfig
 from src.constants import SCHEMA_FILE_PATH
@@ -83,10 +81,10 @@ class DataValidation:
         except Exception as e:
             raise MyException(e, sys) from e
 
-    @staticmethod
-    def read_data(file_path) -> DataFrame:
+    def read_data(self, file_path) -> DataFrame:
+        # The checks below only look at columns: read the file schema, not its rows
         try:
-            return pd.read_csv(file_path)
+            return read_dataframe_schema(file_path, dtypes=self._schema_config.get("compact_dtypes"))
         except Exception as e:
             raise MyException(e, sys)
 
@@ -103,10 +101,10 @@ class DataValidation:
             validation_error_msg = ""
             logging.info("Starting data validation")
             train_df, test_df = (
-                DataValidation.read_data(
+                self.read_data(
                     file_path=self.data_ingestion_artifact.trained_file_path
                 ),
-                DataValidation.read_data(
+                self.read_data(
                     file_path=self.data_ingestion_artifact.test_file_path
                 ),
             )
@@ -4,7 +4,8 @@ from sklearn.metrics import f1_score
 from src.exception import MyException
 from src.constants import TARGET_COLUMN
 from src.logger import logging
-from src.utils.main_utils import load_object
+from src.utils.main_utils import load_object, read_dataframe, log_memory_usage
+from src.data_access.columnar import read_schema_column_types, read_schema_compact_dtypes
 import sys
 import os
 import pandas as pd
@@ -77,7 +78,7 @@ class ModelEvaluation:
     def _map_gender_column(self, df):
         """Map Gender column to 0 for Female and 1 for Male."""
         logging.info("Mapping 'Gender' column to binary values")
-        df['Gender'] = df['Gender'].map({'Female': 0, 'Male': 1}).astype(int)
+        df['Gender'] = df['Gender'].map({'Female': 0, 'Male': 1}).astype('int8')
         return df
 
     def _create_dummy_columns(self, df):
@@ -95,7 +96,7 @@ class ModelEvaluation:
         })
         for col in ["Vehicle_Age_lt_1_Year", "Vehicle_Age_gt_2_Years", "Vehicle_Damage_Yes"]:
             if col in df.columns:
-                df[col] = df[col].astype('int')
+                df[col] = df[col].astype('int8')
         return df
 
     def _drop_id_column(self, df):
@@ -115,7 +116,10 @@ class ModelEvaluation:
         On Failure  :   Write an exception log and then raise an exception
         """
         try:
-            test_df = pd.read_csv(self.data_ingestion_artifact.test_file_path)
+            test_df = read_dataframe(self.data_ingestion_artifact.test_file_path,
+                                     columns=list(read_schema_column_types()),
+                                     dtypes=read_schema_compact_dtypes())
+            log_memory_usage("model_evaluation", test=test_df)
             x, y = test_df.drop(TARGET_COLUMN, axis=1), test_df[TARGET_COLUMN]
 
             logging.info("Test data loaded and now transforming it for prediction...")
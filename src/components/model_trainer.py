@@ -15,6 +15,7 @@ from src.entity.artifact_entity import (
     ClassificationMetricArtifact,
 )
 from src.entity.estimator import MyModel
+from src.entity.model_artifact import save_mmap_artifact
 
 
 class ModelTrainer:
@@ -143,6 +144,12 @@ class ModelTrainer:
                 "Saved final model object that includes both preprocessing and the trained model"
             )
 
+            # Memory-mappable copy of the same model for fast cold start in serving
+            try:
+                save_mmap_artifact(my_model, self.model_trainer_config.trained_model_file_path)
+            except Exception as e:
+                logging.warning(f"Could not save memory-mapped model artifact: {str(e)}")
+
             # Create and return the ModelTrainerArtifact
             model_trainer_artifact = ModelTrainerArtifact(
                 trained_model_file_path=self.model_trainer_config.trained_model_file_path,
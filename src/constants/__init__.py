@@ -10,14 +10,16 @@ PIPELINE_NAME: str = ""
 ARTIFACT_DIR: str = "artifact"
 
 MODEL_FILE_NAME = "model.pkl"
+MODEL_MMAP_DIR_NAME = "model_mmap"
 
 TARGET_COLUMN = "Response"
 CURRENT_YEAR = date.today().year
 PREPROCSSING_OBJECT_FILE_NAME = "preprocessing.pkl"
 
-FILE_NAME: str = "data.csv"
-TRAIN_FILE_NAME: str = "train.csv"
-TEST_FILE_NAME: str = "test.csv"
+FILE_NAME: str = "data.parquet"
+TRAIN_FILE_NAME: str = "train.parquet"
+TEST_FILE_NAME: str = "test.parquet"
+CSV_EXPORT_FILE_NAME: str = "data.csv"
 SCHEMA_FILE_PATH = os.path.join("config", "schema.yaml")
 
 
@@ -34,6 +36,19 @@ DATA_INGESTION_DIR_NAME: str = "data_ingestion"
 DATA_INGESTION_FEATURE_STORE_DIR: str = "feature_store"
 DATA_INGESTION_INGESTED_DIR: str = "ingested"
 DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO: float = 0.25
+DATA_INGESTION_EXPORT_BATCH_SIZE: int = int(os.getenv("DATA_INGESTION_EXPORT_BATCH_SIZE", 10000))
+DATA_INGESTION_EXPORT_MAX_TIME_MS: int = int(os.getenv("DATA_INGESTION_EXPORT_MAX_TIME_MS", 0))
+DATA_INGESTION_EXPORT_LIMIT: int = int(os.getenv("DATA_INGESTION_EXPORT_LIMIT", 0))
+DATA_INGESTION_EXPORT_PARTITIONS: int = int(os.getenv("DATA_INGESTION_EXPORT_PARTITIONS", 4))
+DATA_INGESTION_EXPORT_PARTITION_KEY: str = os.getenv("DATA_INGESTION_EXPORT_PARTITION_KEY", "id")
+DATA_INGESTION_EXPORT_SPLIT_METHOD: str = os.getenv("DATA_INGESTION_EXPORT_SPLIT_METHOD", "sample")
+DATA_INGESTION_EXPORT_SPLIT_SAMPLE_SIZE: int = int(os.getenv("DATA_INGESTION_EXPORT_SPLIT_SAMPLE_SIZE", 1000))
+DATA_INGESTION_INCREMENTAL: bool = os.getenv("DATA_INGESTION_INCREMENTAL", "true").lower() == "true"
+DATA_INGESTION_FEATURE_STORE_CACHE_DIR: str = "feature_store_cache"
+DATA_INGESTION_WATERMARK_FIELD: str = os.getenv("DATA_INGESTION_WATERMARK_FIELD", "id")
+DATA_INGESTION_CACHE_COMPACT_AFTER: int = int(os.getenv("DATA_INGESTION_CACHE_COMPACT_AFTER", 32))
+DATA_INGESTION_PARQUET_COMPRESSION: str = os.getenv("DATA_INGESTION_PARQUET_COMPRESSION", "zstd")
+DATA_INGESTION_EXPORT_CSV: bool = os.getenv("DATA_INGESTION_EXPORT_CSV", "false").lower() == "true"
 
 """
 Data Validation realted contant start with DATA_VALIDATION VAR NAME
@@ -70,6 +85,51 @@ MODEL_EVALUATION_CHANGED_THRESHOLD_SCORE: float = 0.02
 MODEL_BUCKET_NAME = "veh-insurance"
 MODEL_PUSHER_S3_KEY = "model-registry"
 
+"""
+Model serving related constants start with MODEL_SERVING var name
+"""
+PRODUCTION_MODEL_DIR_NAME: str = "production_model"
+MODEL_SERVING_RELOAD_INTERVAL_SECONDS: float = float(os.getenv("MODEL_RELOAD_INTERVAL_SECONDS", 60))
+MODEL_SERVING_S3_RETRY_BACKOFF_SECONDS: float = float(os.getenv("MODEL_S3_RETRY_BACKOFF_SECONDS", 5))
+MODEL_SERVING_S3_RETRY_BACKOFF_MAX_SECONDS: float = float(os.getenv("MODEL_S3_RETRY_BACKOFF_MAX_SECONDS", 300))
+PREDICTION_MAX_BATCH_SIZE: int = int(os.getenv("PREDICTION_MAX_BATCH_SIZE", 10000))
+MICRO_BATCH_MAX_SIZE: int = int(os.getenv("MICRO_BATCH_MAX_SIZE", 64))
+MICRO_BATCH_MAX_WAIT_MS: float = float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", 5))
+MICRO_BATCH_CLOSE_TIMEOUT_SECONDS: float = float(os.getenv("MICRO_BATCH_CLOSE_TIMEOUT_SECONDS", 5))
+INFERENCE_EXECUTOR_KIND: str = os.getenv("INFERENCE_EXECUTOR_KIND", "thread")
+INFERENCE_EXECUTOR_WORKERS: int = int(os.getenv("INFERENCE_EXECUTOR_WORKERS", min(4, os.cpu_count() or 1)))
+PREDICTION_CACHE_MAX_SIZE: int = int(os.getenv("PREDICTION_CACHE_MAX_SIZE", 10000))
+PREDICTION_CACHE_TTL_SECONDS: float = float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", 600))
+HEALTH_PROBE_INTERVAL_SECONDS: float = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", 5))
+HEALTH_PROBE_TIMEOUT_SECONDS: float = float(os.getenv("HEALTH_PROBE_TIMEOUT_SECONDS", 2))
+APP_WORKERS: int = int(os.getenv("APP_WORKERS", 1))
+# Set to a writable directory to aggregate /metrics across pre-forked workers (prometheus_client multiprocess mode)
+PROMETHEUS_MULTIPROC_DIR: str = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+PREFORK_MEMORY_REPORT_INTERVAL_SECONDS: float = float(os.getenv("PREFORK_MEMORY_REPORT_INTERVAL_SECONDS", 60))
+WARMUP_PREDICTIONS: int = int(os.getenv("WARMUP_PREDICTIONS", 20))
+WARMUP_RETRY_INTERVAL_SECONDS: float = float(os.getenv("WARMUP_RETRY_INTERVAL_SECONDS", 10))
+SHADOW_MODEL_PATH: str = os.getenv("SHADOW_MODEL_PATH", "")
+SHADOW_SAMPLE_RATE: float = float(os.getenv("SHADOW_SAMPLE_RATE", 0.1))
+SHADOW_TIME_BUDGET_MS: float = float(os.getenv("SHADOW_TIME_BUDGET_MS", 100))
+SHADOW_LATENCY_WINDOW: int = int(os.getenv("SHADOW_LATENCY_WINDOW", 1000))
+# Admission limits are server-wide; with APP_WORKERS > 1 each worker admits an even share
+ADMISSION_PREDICT_MAX_CONCURRENCY: int = int(os.getenv("ADMISSION_PREDICT_MAX_CONCURRENCY", 64))
+ADMISSION_PREDICT_MAX_QUEUE: int = int(os.getenv("ADMISSION_PREDICT_MAX_QUEUE", 256))
+ADMISSION_BATCH_MAX_CONCURRENCY: int = int(os.getenv("ADMISSION_BATCH_MAX_CONCURRENCY", 4))
+ADMISSION_BATCH_MAX_QUEUE: int = int(os.getenv("ADMISSION_BATCH_MAX_QUEUE", 16))
+ADMISSION_TRAIN_MAX_CONCURRENCY: int = int(os.getenv("ADMISSION_TRAIN_MAX_CONCURRENCY", 2))
+ADMISSION_TRAIN_MAX_QUEUE: int = int(os.getenv("ADMISSION_TRAIN_MAX_QUEUE", 0))
+ADMISSION_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", 1))
+ADMISSION_RETRY_AFTER_SECONDS: float = float(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", 1))
+
+"""
+Training job related constants start with TRAINING_JOB var name
+"""
+TRAINING_JOB_START_METHOD: str = "spawn"
+TRAINING_JOB_HISTORY_SIZE: int = 20
+# Job state shared by pre-forked app workers (APP_WORKERS > 1)
+TRAINING_JOB_STATE_DIR: str = os.getenv("TRAINING_JOB_STATE_DIR", os.path.join(ARTIFACT_DIR, "training_jobs"))
+
 
 APP_HOST = "0.0.0.0"
 APP_PORT = 5050
@@ -0,0 +1,444 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.constants import (
+    DATA_INGESTION_EXPORT_BATCH_SIZE,
+    DATA_INGESTION_EXPORT_LIMIT,
+    DATA_INGESTION_EXPORT_MAX_TIME_MS,
+    DATA_INGESTION_EXPORT_PARTITION_KEY,
+    DATA_INGESTION_EXPORT_PARTITIONS,
+    DATA_INGESTION_EXPORT_SPLIT_METHOD,
+    DATA_INGESTION_EXPORT_SPLIT_SAMPLE_SIZE,
+    SCHEMA_FILE_PATH,
+)
+from src.exception import MyException
+from src.logger import logging
+from src.utils.main_utils import read_yaml_file
+
+# Values the source data uses for "no value"
+MISSING_VALUES = frozenset(["na", "NA", ""])
+
+
+def _is_missing(value) -> bool:
+    return value is None or value != value or (isinstance(value, str) and value in MISSING_VALUES)
+
+
+def read_schema_column_types(schema_file_path: str = SCHEMA_FILE_PATH) -> Dict[str, str]:
+    """
+    Returns the `columns` section of schema.yaml as an ordered {name: type name} dict.
+    """
+    try:
+        column_types = {}
+        for column in read_yaml_file(file_path=schema_file_path)["columns"]:
+            (name, type_name), = column.items()
+            column_types[name] = type_name
+        return column_types
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def read_schema_compact_dtypes(schema_file_path: str = SCHEMA_FILE_PATH) -> Dict[str, str]:
+    """
+    Returns the `compact_dtypes` section of schema.yaml: {column name: pandas dtype name}.
+    """
+    try:
+        return dict(read_yaml_file(file_path=schema_file_path).get("compact_dtypes") or {})
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def _compact_dtype(series: pd.Series, dtype_name: str):
+    """
+    Returns the dtype series can be stored in, or None when the data does not fit dtype_name.
+    """
+    if dtype_name == "category":
+        return "category"
+    dtype = np.dtype(dtype_name)
+    if dtype.kind == "f":
+        # Training must see the float64 values serving sends: narrow only when nothing is rounded
+        if series.dtype.kind == "f" and dtype.itemsize < series.dtype.itemsize:
+            values = series.to_numpy()
+            if not np.array_equal(values.astype(dtype).astype(values.dtype), values, equal_nan=True):
+                return None
+        return dtype
+    if dtype.kind != "i":
+        return dtype
+    if series.dtype.name == "category" or series.dtype.kind not in "iuf":
+        return None
+    if series.isna().any():
+        # Integers cannot hold NaN; float32 still stores small integers exactly
+        return np.dtype(np.float32) if series.abs().max() < 2 ** 24 else None
+    if series.dtype.kind == "f" and not (series == np.floor(series)).all():
+        return None
+    limits = np.iinfo(dtype)
+    if len(series) and (series.min() < limits.min or series.max() > limits.max):
+        return None
+    return dtype
+
+
+def apply_compact_dtypes(dataframe: pd.DataFrame, compact_dtypes: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Converts the columns of dataframe to the schema's compact dtypes, one column at a time and in
+    place. A column whose values do not fit its compact dtype (out of range or fractional for an
+    int dtype, rounded by a narrower float dtype) keeps its dtype; an int column with missing
+    values becomes float32.
+    :param dataframe: Frame to convert
+    :param compact_dtypes: {column name: dtype name}, schema.yaml `compact_dtypes` by default
+    Returns: the same dataframe
+    """
+    try:
+        if compact_dtypes is None:
+            compact_dtypes = read_schema_compact_dtypes()
+        for name, dtype_name in compact_dtypes.items():
+            if name not in dataframe.columns:
+                continue
+            series = dataframe[name]
+            dtype = _compact_dtype(series, dtype_name)
+            if dtype is None:
+                logging.warning(f"Column {name} does not fit {dtype_name}, keeping {series.dtype}")
+            elif series.dtype != dtype:
+                dataframe[name] = series.astype(dtype)
+        return dataframe
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+class NumericColumnBuffer:
+    """
+    Growable typed buffer for an int or float column.
+    An int column that meets a missing or fractional value continues as float64, like pandas does.
+    """
+
+    def __init__(self, name: str, dtype, capacity: int = 1024):
+        self.name = name
+        self.dtype = np.dtype(dtype)
+        self.size = 0
+        self.seen = False
+        self._data = np.empty(max(1, capacity), dtype=self.dtype)
+
+    def _reserve(self, extra: int) -> None:
+        needed = self.size + extra
+        if needed > len(self._data):
+            grown = np.empty(max(needed, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self.size] = self._data[:self.size]
+            self._data = grown
+
+    def _convert(self, values: List) -> np.ndarray:
+        # Fast path: a clean chunk converts in one C-level pass
+        if self._data.dtype.kind == "f":
+            try:
+                return np.array(values, dtype=self._data.dtype)
+            except (TypeError, ValueError):
+                pass
+        else:
+            # Casting straight to int would truncate 1.5 to 1: let numpy infer the type first
+            inferred = np.array(values)
+            if inferred.dtype.kind in "iub":
+                return inferred.astype(self._data.dtype, copy=False)
+            if inferred.dtype.kind == "f" and np.array_equal(inferred, np.floor(inferred)):
+                return inferred.astype(self._data.dtype)
+
+        converted = np.empty(len(values), dtype=np.float64)
+        has_missing = False
+        for index, value in enumerate(values):
+            if _is_missing(value):
+                converted[index] = np.nan
+                has_missing = True
+            else:
+                converted[index] = float(value)
+        if self._data.dtype.kind == "i" and (has_missing or not np.array_equal(converted, np.floor(converted))):
+            logging.info(f"Column {self.name} has missing or fractional values, storing it as float64")
+            self._data = self._data.astype(np.float64)
+            return converted
+        return converted.astype(self._data.dtype)
+
+    def extend(self, values: List) -> None:
+        chunk = self._convert(values)
+        self._reserve(len(chunk))
+        self._data[self.size:self.size + len(chunk)] = chunk
+        self.size += len(chunk)
+
+    def extend_buffer(self, other: "NumericColumnBuffer") -> None:
+        if other._data.dtype != self._data.dtype:
+            self._data = self._data.astype(np.result_type(self._data.dtype, other._data.dtype))
+        self._reserve(other.size)
+        self._data[self.size:self.size + other.size] = other._data[:other.size]
+        self.size += other.size
+        self.seen = self.seen or other.seen
+
+    def to_array(self):
+        return self._data[:self.size]
+
+
+class CategoryColumnBuffer:
+    """
+    Dictionary-encoded buffer for a category column: int32 codes plus the distinct values,
+    so each distinct string is stored once however many rows use it.
+    """
+
+    def __init__(self, name: str, capacity: int = 1024):
+        self.name = name
+        self.seen = False
+        self.categories: Dict = {}
+        self._codes = NumericColumnBuffer(name, np.int32, capacity)
+
+    @property
+    def size(self) -> int:
+        return self._codes.size
+
+    def extend(self, values: List) -> None:
+        categories = self.categories
+        codes = np.empty(len(values), dtype=np.int32)
+        for index, value in enumerate(values):
+            code = categories.get(value)
+            if code is None:
+                if _is_missing(value):
+                    code = -1
+                else:
+                    code = categories[value] = len(categories)
+            codes[index] = code
+        self._codes._reserve(len(codes))
+        self._codes._data[self.size:self.size + len(codes)] = codes
+        self._codes.size += len(codes)
+
+    def extend_buffer(self, other: "CategoryColumnBuffer") -> None:
+        # Re-map the other buffer's codes onto this buffer's dictionary
+        mapping = np.empty(len(other.categories) + 1, dtype=np.int32)
+        mapping[-1] = -1
+        for value, code in other.categories.items():
+            mapping[code] = self.categories.setdefault(value, len(self.categories))
+        remapped = mapping[other._codes.to_array()]
+        self._codes._reserve(len(remapped))
+        self._codes._data[self.size:self.size + len(remapped)] = remapped
+        self._codes.size += len(remapped)
+        self.seen = self.seen or other.seen
+
+    def to_array(self):
+        return pd.Categorical.from_codes(self._codes.to_array(), categories=list(self.categories))
+
+
+class ColumnarFrameBuilder:
+    """
+    Accumulates documents column by column into typed buffers and builds the DataFrame at the end.
+    Only one chunk of documents is held as Python objects at a time.
+    """
+
+    def __init__(self, column_types: Dict[str, str], capacity: int = 1024):
+        """
+        :param column_types: Ordered {column name: schema type name} ("int", "float" or "category")
+        :param capacity: Expected number of rows, used to size the buffers up front
+        """
+        self.column_types = column_types
+        self.buffers = {}
+        for name, type_name in column_types.items():
+            if type_name == "category":
+                self.buffers[name] = CategoryColumnBuffer(name, capacity)
+            elif type_name in ("int", "float"):
+                self.buffers[name] = NumericColumnBuffer(name, np.int64 if type_name == "int" else np.float64, capacity)
+            else:
+                raise ValueError(f"Unsupported schema type '{type_name}' for column {name}")
+        self.rows = 0
+
+    def append_documents(self, documents: List[dict]) -> None:
+        for name, buffer in self.buffers.items():
+            if not buffer.seen:
+                buffer.seen = any(name in document for document in documents)
+            buffer.extend([document.get(name) for document in documents])
+        self.rows += len(documents)
+
+    def merge(self, other: "ColumnarFrameBuilder") -> None:
+        """
+        Appends the rows accumulated by another builder for the same columns.
+        """
+        for name, buffer in self.buffers.items():
+            buffer.extend_buffer(other.buffers[name])
+        self.rows += other.rows
+
+    def to_dataframe(self) -> pd.DataFrame:
+        # Columns no document had are left out, as a DataFrame built from the documents would
+        return pd.DataFrame({name: buffer.to_array() for name, buffer in self.buffers.items() if buffer.seen})
+
+
+def iter_chunks(cursor: Iterable[dict], chunk_size: int) -> Iterable[List[dict]]:
+    iterator = iter(cursor)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _read_into_builder(collection,
+                       column_types: Dict[str, str],
+                       query: Optional[dict],
+                       batch_size: int,
+                       max_time_ms: int,
+                       limit: int,
+                       capacity: int) -> ColumnarFrameBuilder:
+    projection = {name: 1 for name in column_types}
+    projection["_id"] = 0
+
+    cursor = collection.find(query or {}, projection)
+    cursor.batch_size(batch_size)
+    if max_time_ms:
+        cursor.max_time_ms(max_time_ms)
+    if limit:
+        cursor.limit(limit)
+
+    builder = ColumnarFrameBuilder(column_types, max(1, capacity))
+    for chunk in iter_chunks(cursor, batch_size):
+        builder.append_documents(chunk)
+    return builder
+
+
+def compute_split_points(collection,
+                         key: str,
+                         partitions: int,
+                         method: str = DATA_INGESTION_EXPORT_SPLIT_METHOD,
+                         sample_size: int = DATA_INGESTION_EXPORT_SPLIT_SAMPLE_SIZE,
+                         query: Optional[dict] = None) -> List[Any]:
+    """
+    Returns up to partitions - 1 increasing boundaries of the partition key over the documents
+    matching `query` (the whole collection by default).
+
+    "sample" takes quantiles of a random $sample of the key, so skewed key distributions still
+    give partitions of similar size; "minmax" divides the range between the smallest and largest
+    key evenly and needs a numeric key. Fewer points are returned when the key has too few
+    distinct values.
+    """
+    if partitions < 2:
+        return []
+    present = {key: {"$ne": None}}
+    if query:
+        # Boundaries over the filtered documents only, e.g. the rows past an incremental watermark
+        present = {"$and": [query, present]}
+
+    if method == "sample":
+        sampled = sorted(
+            document[key] for document in collection.aggregate([
+                {"$match": present},
+                {"$sample": {"size": sample_size}},
+                {"$project": {key: 1, "_id": 0}},
+            ]) if key in document
+        )
+        if not sampled:
+            return []
+        points = [sampled[len(sampled) * index // partitions] for index in range(1, partitions)]
+    elif method == "minmax":
+        lowest = list(collection.find(present, {key: 1}).sort(key, 1).limit(1))
+        highest = list(collection.find(present, {key: 1}).sort(key, -1).limit(1))
+        if not lowest or not highest:
+            return []
+        low, high = lowest[0][key], highest[0][key]
+        points = [low + (high - low) * index / partitions for index in range(1, partitions)]
+        if isinstance(low, int) and isinstance(high, int):
+            points = [int(point) for point in points]
+    else:
+        raise ValueError(f"Unknown split method '{method}', expected 'sample' or 'minmax'")
+
+    # Duplicate boundaries would produce empty partitions
+    return sorted(set(points))
+
+
+def partition_queries(key: str, split_points: List[Any]) -> List[dict]:
+    """
+    Turns split points into range filters that together match every document exactly once,
+    including documents without the key.
+    """
+    bounds = [None] + list(split_points) + [None]
+    queries = []
+    for low, high in zip(bounds[:-1], bounds[1:]):
+        condition = {}
+        if low is not None:
+            condition["$gte"] = low
+        if high is not None:
+            condition["$lt"] = high
+        queries.append({key: condition} if condition else {key: {"$ne": None}})
+    # $gte/$lt never match null or a missing field
+    queries.append({key: None})
+    return queries
+
+
+def export_collection_columnar(collection,
+                               column_types: Optional[Dict[str, str]] = None,
+                               query: Optional[dict] = None,
+                               batch_size: int = DATA_INGESTION_EXPORT_BATCH_SIZE,
+                               max_time_ms: int = DATA_INGESTION_EXPORT_MAX_TIME_MS,
+                               limit: int = DATA_INGESTION_EXPORT_LIMIT,
+                               partitions: int = DATA_INGESTION_EXPORT_PARTITIONS,
+                               partition_key: str = DATA_INGESTION_EXPORT_PARTITION_KEY,
+                               split_method: str = DATA_INGESTION_EXPORT_SPLIT_METHOD) -> pd.DataFrame:
+    """
+    Streams a MongoDB collection into a typed DataFrame.
+
+    Parameters:
+    ----------
+    collection : Collection
+        pymongo (or API-compatible) collection to read.
+    column_types : Optional[Dict[str, str]]
+        Columns to export and their schema types; defaults to the `columns` section of schema.yaml.
+        Only these fields are requested from the server, `_id` is excluded.
+    query : Optional[dict]
+        Filter applied on the server, everything by default.
+    batch_size : int
+        Documents per server round trip and per conversion chunk.
+    max_time_ms : int
+        Server-side time limit of the whole query, 0 for none.
+    limit : int
+        Maximum number of documents, 0 for the whole collection. A limit disables partitioning.
+    partitions : int
+        Number of `partition_key` ranges read concurrently, each on its own thread and cursor
+        of the shared client's connection pool. 1 reads the collection with a single cursor.
+    partition_key : str
+        Field the ranges are taken over, e.g. "id" or "_id"; it should be indexed.
+    split_method : str
+        How the range boundaries are chosen, see compute_split_points.
+
+    Returns:
+    -------
+    pd.DataFrame
+        One typed column per exported field: int64/float64 for numbers, category for strings.
+    """
+    column_types = column_types or read_schema_column_types()
+
+    capacity = batch_size
+    if not query:
+        # Collection metadata, not a scan: sizes the buffers so they rarely grow
+        capacity = max(capacity, collection.estimated_document_count())
+    if limit:
+        capacity = min(capacity, limit)
+
+    split_points = []
+    if partitions > 1 and not limit:
+        split_points = compute_split_points(collection, partition_key, partitions, method=split_method, query=query)
+    if not split_points:
+        builder = _read_into_builder(collection, column_types, query, batch_size, max_time_ms, limit, capacity)
+        logging.info(f"Exported {builder.rows} documents from {collection.name} in chunks of {batch_size}")
+        return builder.to_dataframe()
+
+    queries = partition_queries(partition_key, split_points)
+    if query:
+        queries = [{"$and": [query, partition_query]} for partition_query in queries]
+    range_capacity = capacity // (len(split_points) + 1) + 1
+    # The last query only collects documents without the key, usually none
+    capacities = [range_capacity] * (len(queries) - 1) + [1]
+    with ThreadPoolExecutor(max_workers=len(queries), thread_name_prefix="mongo-export") as executor:
+        futures = [
+            executor.submit(_read_into_builder, collection, column_types, partition_query,
+                            batch_size, max_time_ms, 0, partition_capacity)
+            for partition_query, partition_capacity in zip(queries, capacities)
+        ]
+        builders = [future.result() for future in futures]
+
+    # Partial buffers are merged in key order
+    builder = builders[0]
+    for partial in builders[1:]:
+        builder.merge(partial)
+    logging.info(f"Exported {builder.rows} documents from {collection.name} in {len(queries)} "
+                 f"{partition_key} ranges, rows per range: {[partial.rows for partial in builders]}")
+    return builder.to_dataframe()
@@ -0,0 +1,174 @@
+import json
+import os
+import sys
+from typing import Dict, List, Optional
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from src.constants import DATA_INGESTION_CACHE_COMPACT_AFTER, DATA_INGESTION_WATERMARK_FIELD
+from src.data_access.columnar import export_collection_columnar, read_schema_column_types
+from src.exception import MyException
+from src.logger import logging
+from src.utils.main_utils import read_dataframe, write_dataframe
+
+STATE_FILE_NAME = "state.json"
+PARTITION_SUFFIX = ".parquet"
+
+
+def concat_typed(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenates frames with the same columns, keeping category columns categorical even
+    when the frames saw different categories.
+    """
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0].reset_index(drop=True)
+
+    columns = {}
+    for name in frames[0].columns:
+        if isinstance(frames[0][name].dtype, pd.CategoricalDtype):
+            columns[name] = union_categoricals([frame[name] for frame in frames])
+        else:
+            columns[name] = pd.concat([frame[name] for frame in frames], ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+class FeatureStoreCache:
+    """
+    Local, append-only store of the rows already exported from a MongoDB collection.
+
+    Every update fetches only the documents whose watermark field is above the persisted
+    high-watermark and appends them as a new partition file; the full frame is rebuilt from
+    the partitions. The watermark field must be a numeric schema column that only grows for
+    new documents, like the `id` of Insurance-Data; updates to documents already exported are
+    not picked up. A change of the schema columns discards the store.
+
+    Layout of `cache_dir`:
+        state.json              watermark, columns, partition file names and row counts
+        part-00001.parquet ...  one typed partition per update that brought new rows
+    """
+
+    def __init__(self,
+                 cache_dir: str,
+                 watermark_field: str = DATA_INGESTION_WATERMARK_FIELD,
+                 column_types: Optional[Dict[str, str]] = None,
+                 compact_after: int = DATA_INGESTION_CACHE_COMPACT_AFTER):
+        """
+        :param cache_dir: Directory of this collection's store, kept across pipeline runs
+        :param watermark_field: Field compared against the watermark
+        :param column_types: Exported columns and schema types, schema.yaml `columns` by default
+        :param compact_after: Merge all partitions into one once there are more than this many
+        """
+        self.cache_dir = cache_dir
+        self.watermark_field = watermark_field
+        self.column_types = column_types or read_schema_column_types()
+        if self.column_types.get(watermark_field) not in ("int", "float"):
+            raise ValueError(f"Watermark field '{watermark_field}' must be an int or float schema column")
+        self.compact_after = compact_after
+        self.state = self._read_state()
+
+    @property
+    def state_file_path(self) -> str:
+        return os.path.join(self.cache_dir, STATE_FILE_NAME)
+
+    @property
+    def watermark(self):
+        return self.state["watermark"]
+
+    @property
+    def rows(self) -> int:
+        return sum(partition["rows"] for partition in self.state["partitions"])
+
+    def _empty_state(self) -> dict:
+        return {"watermark_field": self.watermark_field, "columns": self.column_types,
+                "watermark": None, "next_partition": 1, "partitions": []}
+
+    def _read_state(self) -> dict:
+        if not os.path.exists(self.state_file_path):
+            return self._empty_state()
+        with open(self.state_file_path) as file:
+            state = json.load(file)
+        if state.get("columns") != self.column_types or state.get("watermark_field") != self.watermark_field \
+                or any(not partition["file"].endswith(PARTITION_SUFFIX) for partition in state["partitions"]):
+            logging.warning(f"Feature store cache {self.cache_dir} was built for other columns or formats, rebuilding it")
+            self.clear()
+            return self._empty_state()
+        return state
+
+    def _write_state(self) -> None:
+        # Written after the partition file and swapped in atomically: a crash never leaves
+        # a watermark that points past rows which were not saved
+        temp_path = f"{self.state_file_path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.state, file, indent=2)
+        os.replace(temp_path, self.state_file_path)
+
+    def _partition_path(self, file_name: str) -> str:
+        return os.path.join(self.cache_dir, file_name)
+
+    def _write_partition(self, dataframe: pd.DataFrame) -> dict:
+        file_name = f"part-{self.state['next_partition']:05d}{PARTITION_SUFFIX}"
+        write_dataframe(self._partition_path(file_name), dataframe)
+        self.state["next_partition"] += 1
+        return {"file": file_name, "rows": len(dataframe)}
+
+    def clear(self) -> None:
+        if os.path.isdir(self.cache_dir):
+            for file_name in os.listdir(self.cache_dir):
+                os.remove(os.path.join(self.cache_dir, file_name))
+        self.state = self._empty_state()
+
+    def update(self, collection, **export_kwargs) -> int:
+        """
+        Appends the documents past the watermark.
+        :param collection: pymongo collection to read
+        :param export_kwargs: Passed on to export_collection_columnar (batch_size, partitions, ...)
+        Returns: number of new rows
+        """
+        try:
+            query = None
+            if self.watermark is not None:
+                query = {self.watermark_field: {"$gt": self.watermark}}
+            new_rows = export_collection_columnar(collection, self.column_types, query=query, **export_kwargs)
+            logging.info(f"Fetched {len(new_rows)} documents past watermark {self.watermark_field} > {self.watermark}")
+            if len(new_rows) == 0:
+                return 0
+            if self.watermark_field not in new_rows.columns or new_rows[self.watermark_field].isna().any():
+                raise ValueError(f"Every document needs a '{self.watermark_field}' value for incremental export")
+
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self.state["partitions"].append(self._write_partition(new_rows))
+            watermark = new_rows[self.watermark_field].max()
+            self.state["watermark"] = watermark.item() if hasattr(watermark, "item") else watermark
+            self._write_state()
+
+            if len(self.state["partitions"]) > self.compact_after:
+                self.compact()
+            return len(new_rows)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def load(self) -> pd.DataFrame:
+        """
+        Rebuilds the full frame from the stored partitions.
+        """
+        try:
+            return concat_typed([read_dataframe(self._partition_path(partition["file"]))
+                                 for partition in self.state["partitions"]])
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+    def compact(self) -> None:
+        """
+        Rewrites all partitions as one.
+        """
+        old_partitions = self.state["partitions"]
+        dataframe = self.load()
+        self.state["partitions"] = [self._write_partition(dataframe)]
+        self._write_state()
+        for partition in old_partitions:
+            os.remove(self._partition_path(partition["file"]))
+        logging.info(f"Compacted {len(old_partitions)} feature store partitions into one of {len(dataframe)} rows")
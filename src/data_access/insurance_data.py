@@ -6,6 +6,8 @@ from typing import Optional
 import logging
 
 from src.configuration.mongo_db_connection import MongoDBClient
+from src.data_access.columnar import apply_compact_dtypes, export_collection_columnar
+from src.data_access.feature_store_cache import FeatureStoreCache
 from src.constants import DATABASE_NAME, COLLECTION_NAME
 from src.exception import MyException
 from src.utils.sample_data import get_sample_data
@@ -31,7 +33,10 @@ class InsuranceData:
             logging.warning("MongoDB connection failed. Will use sample data instead.")
 
     def export_collection_as_dataframe(
-        self, collection_name: str, database_name: Optional[str] = None
+        self,
+        collection_name: str,
+        database_name: Optional[str] = None,
+        feature_store_cache_dir: Optional[str] = None,
     ) -> pd.DataFrame:
         """
         Exports an entire MongoDB collection as a pandas DataFrame.
@@ -43,11 +48,14 @@ class InsuranceData:
             The name of the MongoDB collection to export.
         database_name : Optional[str]
             Name of the database (optional). Defaults to DATABASE_NAME.
+        feature_store_cache_dir : Optional[str]
+            Directory of the incremental feature store cache. When given, only documents past
+            the stored watermark are fetched and the frame is rebuilt from the cache.
 
         Returns:
         -------
         pd.DataFrame
-            DataFrame containing the collection data, with '_id' column removed and 'na' values replaced with NaN.
+            DataFrame containing the schema columns of the collection in the schema's compact dtypes, with 'na' values as NaN.
         """
         try:
             if self.use_mongodb:
@@ -70,22 +78,23 @@ class InsuranceData:
                     test_doc = collection.find_one()
                     if test_doc:
                         logging.info("Successfully connected to MongoDB and found data")
-                        # Now fetch a limited number of documents with a timeout
-                        # Limit to 1000 documents to avoid timeout issues
-                        cursor = collection.find().limit(1000)
-                        cursor.max_time_ms(10000)  # 10 second timeout
-                        logging.info(
-                            "Fetching documents from MongoDB (limited to 1000)..."
-                        )
-                        data = list(cursor)
-                        df = pd.DataFrame(data)
+                        # Stream the whole collection: schema columns only, converted
+                        # chunk by chunk into typed column buffers
+                        logging.info("Fetching documents from MongoDB...")
+                        if feature_store_cache_dir:
+                            cache = FeatureStoreCache(os.path.join(
+                                feature_store_cache_dir, f"{collection.database.name}.{collection_name}"
+                            ))
+                            new_rows = cache.update(collection)
+                            logging.info(f"Fetched {new_rows} new documents, {cache.rows} cached in total")
+                            df = cache.load()
+                        else:
+                            df = export_collection_columnar(collection)
 
                         if len(df) > 0:
                             logging.info(
                                 f"Successfully fetched {len(df)} records from MongoDB"
                             )
-                            if "_id" in df.columns.to_list():
-                                df = df.drop(columns=["_id"], axis=1)
                         else:
                             logging.warning(
                                 f"No data found in MongoDB collection: {collection_name}. Using sample data instead."
@@ -106,7 +115,7 @@ class InsuranceData:
 
             # Common preprocessing
             df.replace({"na": np.nan}, inplace=True)
-            return df
+            return apply_compact_dtypes(df)
 
         except Exception as e:
             logging.error(f"Error in export_collection_as_dataframe: {str(e)}")
@@ -114,7 +123,7 @@ class InsuranceData:
             # Fall back to sample data in case of any error
             df = self._create_sample_data()
             df.replace({"na": np.nan}, inplace=True)
-            return df
+            return apply_compact_dtypes(df)
 
     def _create_sample_data(self) -> pd.DataFrame:
         """
@@ -124,32 +133,12 @@ class InsuranceData:
         Returns:
         -------
         pd.DataFrame
-            Sample DataFrame with insurance data.
+            Sample DataFrame with insurance data, converted to the schema dtypes by the caller.
         """
         logging.info("Using sample data utility for testing/development")
 
         # Get sample data from utility
         df = get_sample_data()
 
-        # Ensure proper data types
-        if not df.empty:
-            try:
-                # Convert categorical columns
-                for col in ['Gender', 'Vehicle_Age', 'Vehicle_Damage']:
-                    if col in df.columns:
-                        df[col] = df[col].astype('category')
-
-                # Convert integer columns
-                for col in ['id', 'Age', 'Driving_License', 'Previously_Insured', 'Vintage', 'Response']:
-                    if col in df.columns:
-                        df[col] = df[col].astype('int')
-
-                # Convert float columns
-                for col in ['Region_Code', 'Annual_Premium', 'Policy_Sales_Channel']:
-                    if col in df.columns:
-                        df[col] = df[col].astype('float')
-            except Exception as e:
-                logging.warning(f"Error converting data types: {str(e)}")
-
         logging.info(f"Using sample data with {len(df)} records and columns: {df.columns.tolist()}")
         return df
@@ -0,0 +1,165 @@
+import threading
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+
+from src.logger import logging
+
+
+def _column_indices(columns: Any, feature_names: List[str]) -> List[int]:
+    """
+    Resolves a ColumnTransformer column selection to positions in feature_names.
+    """
+    if isinstance(columns, slice):
+        return list(range(len(feature_names)))[columns]
+    if isinstance(columns, (str, int, np.integer)):
+        columns = [columns]
+    columns = list(columns)
+    if columns and isinstance(columns[0], (bool, np.bool_)):
+        return [index for index, selected in enumerate(columns) if selected]
+    return [feature_names.index(column) if isinstance(column, str) else int(column) for column in columns]
+
+
+class CompiledPreprocessor:
+    """
+    Flat, pandas-free form of the fitted preprocessing Pipeline built by
+    DataTransformation.get_data_transformer_object.
+
+    Every output column j is computed from input column input_index[j] as
+        ((x - center[j]) / scale[j]) * multiplier[j] + offset[j]
+    clipped to [clip_low[j], clip_high[j]]. StandardScaler fills center/scale,
+    MinMaxScaler fills multiplier/offset, passthrough columns keep the identity
+    values, so the result matches the sklearn transform bit for bit.
+    """
+
+    def __init__(self,
+                 feature_names: Sequence[str],
+                 input_index: np.ndarray,
+                 center: np.ndarray,
+                 scale: np.ndarray,
+                 multiplier: np.ndarray,
+                 offset: np.ndarray,
+                 clip_low: np.ndarray,
+                 clip_high: np.ndarray):
+        self.feature_names = list(feature_names)
+        self.input_index = np.asarray(input_index, dtype=np.intp)
+        self.center = np.asarray(center, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.multiplier = np.asarray(multiplier, dtype=np.float64)
+        self.offset = np.asarray(offset, dtype=np.float64)
+        self.clip_low = np.asarray(clip_low, dtype=np.float64)
+        self.clip_high = np.asarray(clip_high, dtype=np.float64)
+        self._needs_clip = bool(np.isfinite(self.clip_low).any() or np.isfinite(self.clip_high).any())
+        self._local = threading.local()
+
+    @classmethod
+    def from_pipeline(cls, preprocessing_object: Any) -> Optional["CompiledPreprocessor"]:
+        """
+        Builds the flat form of a fitted Pipeline/ColumnTransformer.
+        Returns None when it contains a step that cannot be expressed as scale/offset vectors.
+        """
+        from sklearn.compose import ColumnTransformer
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+        transformer = preprocessing_object
+        while isinstance(transformer, Pipeline):
+            if len(transformer.steps) != 1:
+                return None
+            transformer = transformer.steps[0][1]
+
+        if not isinstance(transformer, ColumnTransformer) or not hasattr(transformer, "transformers_"):
+            return None
+        if not hasattr(transformer, "feature_names_in_"):
+            return None
+
+        feature_names = [str(name) for name in transformer.feature_names_in_]
+        input_index, center, scale, multiplier, offset, clip_low, clip_high = ([] for _ in range(7))
+
+        for _, fitted, columns in transformer.transformers_:
+            indices = _column_indices(columns, feature_names)
+            if fitted == "drop" or len(indices) == 0:
+                continue
+
+            n_columns = len(indices)
+            column_center, column_scale = np.zeros(n_columns), np.ones(n_columns)
+            column_multiplier, column_offset = np.ones(n_columns), np.zeros(n_columns)
+            column_low, column_high = np.full(n_columns, -np.inf), np.full(n_columns, np.inf)
+
+            if fitted == "passthrough":
+                pass
+            elif isinstance(fitted, StandardScaler):
+                if fitted.with_mean:
+                    column_center = np.asarray(fitted.mean_, dtype=np.float64)
+                if fitted.with_std:
+                    column_scale = np.asarray(fitted.scale_, dtype=np.float64)
+            elif isinstance(fitted, MinMaxScaler):
+                column_multiplier = np.asarray(fitted.scale_, dtype=np.float64)
+                column_offset = np.asarray(fitted.min_, dtype=np.float64)
+                if fitted.clip:
+                    column_low = np.full(n_columns, fitted.feature_range[0], dtype=np.float64)
+                    column_high = np.full(n_columns, fitted.feature_range[1], dtype=np.float64)
+            else:
+                logging.info(f"Cannot compile preprocessing step {type(fitted).__name__}, using sklearn path")
+                return None
+
+            input_index.extend(indices)
+            center.append(column_center)
+            scale.append(column_scale)
+            multiplier.append(column_multiplier)
+            offset.append(column_offset)
+            clip_low.append(column_low)
+            clip_high.append(column_high)
+
+        return cls(
+            feature_names=feature_names,
+            input_index=np.asarray(input_index),
+            center=np.concatenate(center),
+            scale=np.concatenate(scale),
+            multiplier=np.concatenate(multiplier),
+            offset=np.concatenate(offset),
+            clip_low=np.concatenate(clip_low),
+            clip_high=np.concatenate(clip_high),
+        )
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_local", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    def transform(self, features: np.ndarray) -> np.ndarray:
+        """
+        Applies the compiled preprocessing to rows laid out in feature_names order.
+        """
+        transformed = features[:, self.input_index].astype(np.float64, copy=False)
+        transformed -= self.center
+        transformed /= self.scale
+        transformed *= self.multiplier
+        transformed += self.offset
+        if self._needs_clip:
+            np.clip(transformed, self.clip_low, self.clip_high, out=transformed)
+        return transformed
+
+    def records_to_array(self, records: Sequence[Any]) -> np.ndarray:
+        """
+        Lays out record attributes (e.g. VehicleData) in feature_names order.
+        Features a record does not carry, like the dummy 'id', are filled with 0.
+        A single record reuses a preallocated per-thread row.
+        """
+        if len(records) == 1:
+            row = getattr(self._local, "row", None)
+            if row is None:
+                row = self._local.row = np.empty((1, len(self.feature_names)), dtype=np.float64)
+            record = records[0]
+            for position, name in enumerate(self.feature_names):
+                row[0, position] = getattr(record, name, 0)
+            return row
+
+        features = np.empty((len(records), len(self.feature_names)), dtype=np.float64)
+        for position, name in enumerate(self.feature_names):
+            features[:, position] = [getattr(record, name, 0) for record in records]
+        return features
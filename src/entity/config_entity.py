@@ -30,8 +30,17 @@ class DataIngestionConfig:
     testing_file_path: str = os.path.join(
         data_ingestion_dir, DATA_INGESTION_INGESTED_DIR, TEST_FILE_NAME
     )
+    # Optional CSV copy of the feature store for people and tools outside the pipeline
+    feature_store_csv_file_path: str = (
+        os.path.join(data_ingestion_dir, DATA_INGESTION_FEATURE_STORE_DIR, CSV_EXPORT_FILE_NAME)
+        if DATA_INGESTION_EXPORT_CSV else None
+    )
     train_test_split_ratio: float = DATA_INGESTION_TRAIN_TEST_SPLIT_RATIO
     collection_name: str = DATA_INGESTION_COLLECTION_NAME
+    # Outside the timestamped run directory: the exported rows are reused by the next run
+    feature_store_cache_dir: str = (
+        os.path.join(ARTIFACT_DIR, DATA_INGESTION_FEATURE_STORE_CACHE_DIR) if DATA_INGESTION_INCREMENTAL else None
+    )
 
 
 @dataclass
@@ -52,12 +61,12 @@ class DataTransformationConfig:
     transformed_train_file_path: str = os.path.join(
         data_transformation_dir,
         DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
-        TRAIN_FILE_NAME.replace("csv", "npy"),
+        os.path.splitext(TRAIN_FILE_NAME)[0] + ".npy",
     )
     transformed_test_file_path: str = os.path.join(
         data_transformation_dir,
         DATA_TRANSFORMATION_TRANSFORMED_DATA_DIR,
-        TEST_FILE_NAME.replace("csv", "npy"),
+        os.path.splitext(TEST_FILE_NAME)[0] + ".npy",
     )
     transformed_object_file_path: str = os.path.join(
         data_transformation_dir,
@@ -1,11 +1,19 @@
 import sys
+from typing import TYPE_CHECKING, Any, Optional, Sequence
 
-import pandas as pd
-from pandas import DataFrame
-from sklearn.pipeline import Pipeline
+import numpy as np
 
+from src.entity.compiled_model import CompiledPreprocessor
+from src.entity.flat_forest import FlatForest, flatten_forest
 from src.exception import MyException
 from src.logger import logging
+from src.utils.metrics import time_stage
+
+if TYPE_CHECKING:
+    # pandas and sklearn load with the pickled model, never just by importing this module
+    import pandas as pd
+    from pandas import DataFrame
+    from sklearn.pipeline import Pipeline
 
 
 class TargetValueMapping:
@@ -22,15 +30,91 @@ class TargetValueMapping:
 
 
 class MyModel:
-    def __init__(self, preprocessing_object: Pipeline, trained_model_object: object):
+    def __init__(self, preprocessing_object: "Pipeline", trained_model_object: object):
         """
         :param preprocessing_object: Input Object of preprocesser
         :param trained_model_object: Input Object of trained model
         """
         self.preprocessing_object = preprocessing_object
         self.trained_model_object = trained_model_object
+        self._compiled_preprocessor: Optional[CompiledPreprocessor] = None
+        self._flat_forest: Optional[FlatForest] = None
+
+    def compile(self) -> bool:
+        """
+        Builds the pandas-free inference path from the fitted preprocessing object and
+        flattens the trained forest into contiguous arrays.
+        Called once at model load time; models unpickled from older artifacts compile lazily.
 
-    def predict(self, dataframe: pd.DataFrame) -> DataFrame:
+        Returns: True when the compiled preprocessing path is available
+        """
+        if self.preprocessing_object is None:
+            # Built from a memory-mapped artifact: the compiled state is all there is
+            self._compile_attempted = True
+            return self._compiled_preprocessor is not None
+
+        try:
+            self._compiled_preprocessor = CompiledPreprocessor.from_pipeline(self.preprocessing_object)
+        except Exception as e:
+            logging.warning(f"Could not compile preprocessing object: {str(e)}")
+            self._compiled_preprocessor = None
+        self._flat_forest = flatten_forest(self.trained_model_object)
+        self._compile_attempted = True
+        return self._compiled_preprocessor is not None
+
+    @classmethod
+    def from_compiled(cls, compiled_preprocessor: CompiledPreprocessor, flat_forest: FlatForest) -> "MyModel":
+        """
+        Builds a model that serves from compiled arrays only, without the sklearn objects.
+        """
+        model = cls(preprocessing_object=None, trained_model_object=None)
+        model._compiled_preprocessor = compiled_preprocessor
+        model._flat_forest = flat_forest
+        model._compile_attempted = True
+        return model
+
+    def _get_compiled_preprocessor(self) -> Optional[CompiledPreprocessor]:
+        if not getattr(self, "_compile_attempted", False):
+            self.compile()
+        return self._compiled_preprocessor
+
+    def _predict_transformed(self, transformed_feature: np.ndarray) -> np.ndarray:
+        """
+        Runs the forest on preprocessed features, through the flattened forest when available.
+        """
+        if not getattr(self, "_compile_attempted", False):
+            self.compile()
+        with time_stage("forest_predict"):
+            if self._flat_forest is not None:
+                return self._flat_forest.predict(transformed_feature)
+            return self.trained_model_object.predict(transformed_feature)
+
+    def predict_records(self, records: Sequence[Any]) -> np.ndarray:
+        """
+        Predicts record objects (e.g. VehicleData) without building a DataFrame.
+        Falls back to the DataFrame path when the preprocessing object cannot be compiled.
+        """
+        try:
+            compiled = self._get_compiled_preprocessor()
+            if compiled is None:
+                from pandas import DataFrame
+
+                feature_names = list(getattr(self.preprocessing_object, "feature_names_in_", []))
+                dataframe = DataFrame({name: [getattr(record, name, 0) for record in records]
+                                       for name in feature_names})
+                return self.predict(dataframe)
+
+            with time_stage("feature_array"):
+                features = compiled.records_to_array(records)
+            with time_stage("transform"):
+                transformed_feature = compiled.transform(features)
+            return self._predict_transformed(transformed_feature)
+
+        except Exception as e:
+            logging.error("Error occurred in predict_records method", exc_info=True)
+            raise MyException(e, sys) from e
+
+    def predict(self, dataframe: "pd.DataFrame") -> "DataFrame":
         """
         Function accepts preprocessed inputs (with all custom transformations already applied),
         applies scaling using preprocessing_object, and performs prediction on transformed features.
@@ -50,11 +134,18 @@ class MyModel:
                 logging.info(f"Added missing columns with default values: {missing_columns}")
 
             # Step 1: Apply scaling transformations using the pre-trained preprocessing object
-            transformed_feature = self.preprocessing_object.transform(dataframe)
+            with time_stage("transform"):
+                if self.preprocessing_object is None:
+                    compiled = self._compiled_preprocessor
+                    transformed_feature = compiled.transform(
+                        dataframe[compiled.feature_names].to_numpy(dtype=np.float64)
+                    )
+                else:
+                    transformed_feature = self.preprocessing_object.transform(dataframe)
 
             # Step 2: Perform prediction using the trained model
             logging.info("Using the trained model to get predictions")
-            predictions = self.trained_model_object.predict(transformed_feature)
+            predictions = self._predict_transformed(transformed_feature)
 
             return predictions
 
@@ -62,8 +153,19 @@ class MyModel:
             logging.error("Error occurred in predict method", exc_info=True)
             raise MyException(e, sys) from e
 
+    def __getstate__(self):
+        # The compiled path is rebuilt after loading rather than pickled with the model,
+        # unless it is all the model has
+        state = self.__dict__.copy()
+        if self.preprocessing_object is None:
+            return state
+        state.pop("_compiled_preprocessor", None)
+        state.pop("_flat_forest", None)
+        state.pop("_compile_attempted", None)
+        return state
+
     def __repr__(self):
-        return f"{type(self.trained_model_object).__name__}()"
+        return f"{type(self.trained_model_object or self._flat_forest).__name__}()"
 
     def __str__(self):
-        return f"{type(self.trained_model_object).__name__}()"
+        return f"{type(self.trained_model_object or self._flat_forest).__name__}()"
@@ -0,0 +1,196 @@
+from typing import Any, Optional
+
+import numpy as np
+
+from src.logger import logging
+
+
+def _float32_at_or_below(threshold: np.ndarray) -> np.ndarray:
+    """
+    Rounds float64 thresholds down to float32. For a float32 input x,
+    x <= threshold holds exactly when x <= the rounded threshold.
+    """
+    rounded = threshold.astype(np.float32)
+    too_high = rounded.astype(np.float64) > threshold
+    rounded[too_high] = np.nextafter(rounded[too_high], np.float32(-np.inf))
+    return rounded
+
+
+class FlatForest:
+    """
+    Array-backed evaluator for a fitted RandomForestClassifier.
+
+    All trees are concatenated into contiguous node tables (feature, threshold,
+    left child, normalized leaf value). Nodes are renumbered so that the right
+    child always directly follows the left one, which makes a traversal step
+        node = left[node] + (x[feature[node]] > threshold[node])
+    Leaves point to themselves with an infinite threshold, so every cursor can be
+    stepped max_depth times without branching. Small batches step the cursors of
+    all trees together, large batches go tree by tree to stay cache resident.
+
+    Inputs are cast to float32 and probabilities are accumulated in estimator
+    order exactly like sklearn does, so predictions match
+    RandomForestClassifier.predict exactly.
+    """
+
+    # Batches up to this many rows evaluate all trees level by level at once
+    ALL_TREES_MAX_ROWS = 2048
+    # Rows per block in tree-by-tree evaluation
+    TREE_MAJOR_CHUNK_ROWS = 16384
+
+    def __init__(self,
+                 feature: np.ndarray,
+                 threshold: np.ndarray,
+                 left: np.ndarray,
+                 value: np.ndarray,
+                 tree_offsets: np.ndarray,
+                 tree_depths: np.ndarray,
+                 classes: np.ndarray,
+                 n_features: int):
+        """
+        :param feature: split feature per node (0 for leaves)
+        :param threshold: float32 split threshold per node (+inf for leaves)
+        :param left: left child per node, the right child is left + 1; leaves point to themselves
+        :param value: class probabilities per node, shape (n_nodes, n_classes)
+        :param tree_offsets: first node of every tree plus the total node count, shape (n_trees + 1,)
+        :param tree_depths: depth of every tree
+        :param classes: class labels, as in RandomForestClassifier.classes_
+        :param n_features: number of input features
+        """
+        self.feature = np.asarray(feature, dtype=np.intp)
+        self.threshold = np.asarray(threshold, dtype=np.float32)
+        self.left = np.asarray(left, dtype=np.intp)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.tree_offsets = np.asarray(tree_offsets, dtype=np.intp)
+        self.tree_depths = np.asarray(tree_depths, dtype=np.intp)
+        self.classes = np.asarray(classes)
+        self.n_features = int(n_features)
+
+    @classmethod
+    def from_estimator(cls, estimator: Any) -> Optional["FlatForest"]:
+        """
+        Flattens a fitted single-output RandomForestClassifier.
+        Returns None for any other estimator.
+        """
+        from sklearn.ensemble import RandomForestClassifier
+
+        if not isinstance(estimator, RandomForestClassifier) or not hasattr(estimator, "estimators_"):
+            return None
+        if getattr(estimator, "n_outputs_", 1) != 1:
+            return None
+
+        features, thresholds, lefts, values = [], [], [], []
+        tree_offsets, tree_depths = [0], []
+        for tree_estimator in estimator.estimators_:
+            tree = tree_estimator.tree_
+            children_left, children_right = tree.children_left, tree.children_right
+
+            # Breadth-first renumbering that gives siblings consecutive ids
+            order = [0]
+            new_id = np.zeros(tree.node_count, dtype=np.intp)
+            for node in order:
+                if children_left[node] != -1:
+                    new_id[children_left[node]] = len(order)
+                    new_id[children_right[node]] = len(order) + 1
+                    order.extend((children_left[node], children_right[node]))
+            order = np.asarray(order, dtype=np.intp)
+
+            is_leaf = children_left[order] == -1
+            node_ids = np.arange(tree.node_count, dtype=np.intp)
+            features.append(np.where(is_leaf, 0, tree.feature[order]))
+            thresholds.append(np.where(is_leaf, np.inf, _float32_at_or_below(tree.threshold[order])))
+            lefts.append(np.where(is_leaf, node_ids, new_id[np.maximum(children_left[order], 0)]) + tree_offsets[-1])
+
+            # Same normalization as DecisionTreeClassifier.predict_proba
+            leaf_value = tree.value[order, 0, :estimator.n_classes_].astype(np.float64)
+            normalizer = leaf_value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            values.append(leaf_value / normalizer)
+
+            tree_offsets.append(tree_offsets[-1] + tree.node_count)
+            tree_depths.append(tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            value=np.concatenate(values),
+            tree_offsets=np.asarray(tree_offsets),
+            tree_depths=np.asarray(tree_depths),
+            classes=estimator.classes_,
+            n_features=estimator.n_features_in_,
+        )
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.tree_depths)
+
+    @property
+    def max_depth(self) -> int:
+        return int(self.tree_depths.max()) if self.n_trees else 0
+
+    def _proba_all_trees(self, features: np.ndarray) -> np.ndarray:
+        """
+        Steps the cursors of every tree together, one level per iteration.
+        """
+        flat_features = features.ravel()
+        row_base = (np.arange(features.shape[0], dtype=np.intp) * self.n_features)[:, np.newaxis]
+        nodes = np.broadcast_to(self.tree_offsets[:-1], (features.shape[0], self.n_trees)).copy()
+        for _ in range(self.max_depth):
+            values = flat_features[row_base + self.feature[nodes]]
+            nodes = self.left[nodes] + (values > self.threshold[nodes])
+        # Reducing over the leading (tree) axis adds trees one after another, in order
+        return np.add.reduce(self.value[nodes.T], axis=0)
+
+    def _proba_tree_major(self, features: np.ndarray) -> np.ndarray:
+        """
+        Evaluates one tree at a time over a block of rows.
+        """
+        proba = np.zeros((features.shape[0], self.value.shape[1]), dtype=np.float64)
+        for start in range(0, features.shape[0], self.TREE_MAJOR_CHUNK_ROWS):
+            block = features[start:start + self.TREE_MAJOR_CHUNK_ROWS]
+            flat_block = block.ravel()
+            row_base = np.arange(block.shape[0], dtype=np.intp) * self.n_features
+            block_proba = proba[start:start + self.TREE_MAJOR_CHUNK_ROWS]
+            for tree_index in range(self.n_trees):
+                first, last = self.tree_offsets[tree_index], self.tree_offsets[tree_index + 1]
+                feature, threshold = self.feature[first:last], self.threshold[first:last]
+                left = self.left[first:last] - first
+                nodes = np.zeros(block.shape[0], dtype=np.intp)
+                for _ in range(self.tree_depths[tree_index]):
+                    nodes = left[nodes] + (flat_block[row_base + feature[nodes]] > threshold[nodes])
+                block_proba += self.value[first:last][nodes]
+        return proba
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        features = np.asarray(features)
+        if features.ndim != 2 or features.shape[1] != self.n_features:
+            raise ValueError(f"Expected input of shape (n, {self.n_features}), got {features.shape}")
+        # sklearn evaluates trees on float32 inputs and rejects non-finite values
+        features = np.ascontiguousarray(features, dtype=np.float32)
+        if not np.isfinite(features).all():
+            raise ValueError("Input contains NaN, infinity or a value too large for dtype('float32').")
+
+        if features.shape[0] <= self.ALL_TREES_MAX_ROWS:
+            proba = self._proba_all_trees(features)
+        else:
+            proba = self._proba_tree_major(features)
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return self.classes.take(np.argmax(self.predict_proba(features), axis=1), axis=0)
+
+
+def flatten_forest(estimator: Any) -> Optional[FlatForest]:
+    """
+    Returns the flattened forest, or None (with a log line) when the estimator is not supported.
+    """
+    try:
+        forest = FlatForest.from_estimator(estimator)
+    except Exception as e:
+        logging.warning(f"Could not flatten {type(estimator).__name__}: {str(e)}")
+        return None
+    if forest is None:
+        logging.info(f"{type(estimator).__name__} is not a flattenable forest, using sklearn predict")
+    return forest
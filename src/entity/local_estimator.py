@@ -1,6 +1,7 @@
 from src.exception import MyException
 from src.entity.estimator import MyModel
 from src.utils.main_utils import load_object
+from src.utils.single_flight import SingleFlight
 import sys
 import os
 from pandas import DataFrame
@@ -19,6 +20,7 @@ class LocalInsuranceEstimator:
         """
         self.model_path = model_path
         self.loaded_model: MyModel = None
+        self._loads = SingleFlight()
 
     def is_model_present(self, model_path=None) -> bool:
         """
@@ -55,7 +57,8 @@ class LocalInsuranceEstimator:
                 logging.info("Added dummy 'id' column to dataframe for prediction")
 
             if self.loaded_model is None:
-                self.loaded_model = self.load_model()
+                # Concurrent first predictions share one load
+                self.loaded_model = self._loads.do("load", self.load_model)
                 if self.loaded_model is None:
                     logging.warning("No model available for prediction")
                     return None
@@ -1,5 +1,6 @@
 import os
 import shutil
+from src.entity.model_artifact import mmap_artifact_dir
 from src.exception import MyException
 from src.logger import logging
 import sys
@@ -36,6 +37,14 @@ class LocalModelPusher:
             # Copy the model file
             shutil.copy2(from_file, self.production_model_path)
             logging.info(f"Model copied from {from_file} to {self.production_model_path}")
+
+            # Copy the memory-mapped form along with it; copy2 keeps the mtime it was stamped with
+            mmap_dir = mmap_artifact_dir(from_file)
+            production_mmap_dir = mmap_artifact_dir(self.production_model_path)
+            shutil.rmtree(production_mmap_dir, ignore_errors=True)
+            if os.path.isdir(mmap_dir):
+                shutil.copytree(mmap_dir, production_mmap_dir)
+                logging.info(f"Memory-mapped model copied to {production_mmap_dir}")
             
             # Remove the source file if requested
             if remove and os.path.exists(from_file):
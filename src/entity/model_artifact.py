@@ -0,0 +1,116 @@
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from src.constants import MODEL_MMAP_DIR_NAME
+from src.entity.compiled_model import CompiledPreprocessor
+from src.entity.estimator import MyModel
+from src.entity.flat_forest import FlatForest
+from src.logger import logging
+
+MMAP_FORMAT_VERSION = 1
+MMAP_METADATA_FILE_NAME = "metadata.json"
+
+# Arrays stored per component, file name is "<prefix>_<attribute>.npy"
+PREPROCESSOR_ARRAYS = ("input_index", "center", "scale", "multiplier", "offset", "clip_low", "clip_high")
+FOREST_ARRAYS = ("feature", "threshold", "left", "value", "tree_offsets", "tree_depths", "classes")
+
+
+def mmap_artifact_dir(model_file_path: str) -> str:
+    """
+    Returns the directory holding the memory-mappable form of the pickled model at model_file_path.
+    """
+    return os.path.join(os.path.dirname(model_file_path), MODEL_MMAP_DIR_NAME)
+
+
+def _file_signature(file_path: str) -> dict:
+    stat = os.stat(file_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def save_mmap_artifact(model: MyModel, model_file_path: str) -> Optional[str]:
+    """
+    Writes the compiled preprocessor and flattened forest of model as raw .npy arrays plus a
+    small JSON header next to the already saved pickle at model_file_path.
+    The header records the pickle's size and mtime so a stale directory is never served.
+
+    Returns: the artifact directory, or None when the model cannot be compiled to arrays
+    """
+    model.compile()
+    compiled = model._compiled_preprocessor
+    forest = model._flat_forest
+    if compiled is None or forest is None:
+        logging.info("Model cannot be expressed as arrays, skipping the memory-mapped artifact")
+        return None
+
+    artifact_dir = mmap_artifact_dir(model_file_path)
+    staging_dir = f"{artifact_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    os.makedirs(staging_dir)
+
+    arrays = {}
+    for prefix, component, names in (("preprocessor", compiled, PREPROCESSOR_ARRAYS),
+                                     ("forest", forest, FOREST_ARRAYS)):
+        for name in names:
+            array = np.ascontiguousarray(getattr(component, name))
+            file_name = f"{prefix}_{name}.npy"
+            np.save(os.path.join(staging_dir, file_name), array, allow_pickle=False)
+            arrays[file_name] = {"dtype": str(array.dtype), "shape": list(array.shape)}
+
+    metadata = {
+        "format_version": MMAP_FORMAT_VERSION,
+        "created_at": str(datetime.now()),
+        "source_model": _file_signature(model_file_path),
+        "feature_names": compiled.feature_names,
+        "n_features": forest.n_features,
+        "arrays": arrays,
+    }
+    with open(os.path.join(staging_dir, MMAP_METADATA_FILE_NAME), "w") as file:
+        json.dump(metadata, file, indent=2)
+
+    # Processes still mapping the old files keep them alive after the directory is replaced
+    shutil.rmtree(artifact_dir, ignore_errors=True)
+    os.rename(staging_dir, artifact_dir)
+    logging.info(f"Saved memory-mapped model artifact to {artifact_dir}")
+    return artifact_dir
+
+
+def load_mmap_artifact(model_file_path: str) -> Optional[MyModel]:
+    """
+    Loads the memory-mapped form of the pickled model at model_file_path.
+    Arrays are mapped read-only, so loading reads only the header and the pages are shared
+    through the page cache by every process serving the same file.
+
+    Returns: the model, or None when no up-to-date artifact exists
+    """
+    artifact_dir = mmap_artifact_dir(model_file_path)
+    metadata_path = os.path.join(artifact_dir, MMAP_METADATA_FILE_NAME)
+    if not os.path.exists(metadata_path):
+        return None
+
+    with open(metadata_path) as file:
+        metadata = json.load(file)
+    if metadata.get("format_version") != MMAP_FORMAT_VERSION:
+        logging.warning(f"Unsupported memory-mapped model format in {artifact_dir}, ignoring it")
+        return None
+    if os.path.exists(model_file_path) and metadata.get("source_model") != _file_signature(model_file_path):
+        logging.warning(f"Memory-mapped model in {artifact_dir} is older than {model_file_path}, ignoring it")
+        return None
+
+    def load(prefix: str, name: str) -> np.ndarray:
+        return np.load(os.path.join(artifact_dir, f"{prefix}_{name}.npy"), mmap_mode="r", allow_pickle=False)
+
+    compiled = CompiledPreprocessor(
+        feature_names=metadata["feature_names"],
+        **{name: load("preprocessor", name) for name in PREPROCESSOR_ARRAYS},
+    )
+    forest = FlatForest(
+        n_features=metadata["n_features"],
+        **{name: load("forest", name) for name in FOREST_ARRAYS},
+    )
+    logging.info(f"Loaded memory-mapped model from {artifact_dir}")
+    return MyModel.from_compiled(compiled, forest)
@@ -0,0 +1,327 @@
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.constants import (
+    ARTIFACT_DIR,
+    MODEL_BUCKET_NAME,
+    MODEL_FILE_NAME,
+    MODEL_SERVING_RELOAD_INTERVAL_SECONDS,
+    MODEL_SERVING_S3_RETRY_BACKOFF_MAX_SECONDS,
+    MODEL_SERVING_S3_RETRY_BACKOFF_SECONDS,
+    PRODUCTION_MODEL_DIR_NAME,
+)
+from src.entity.estimator import MyModel
+from src.entity.model_artifact import load_mmap_artifact
+from src.exception import MyException
+from src.logger import logging
+from src.utils.main_utils import load_object
+from src.utils.metrics import record_model_load
+from src.utils.single_flight import SingleFlight
+
+
+class ProductionModelHolder:
+    """
+    Process-wide holder for the production model.
+
+    The model is loaded once (from S3, falling back to the local production model)
+    and served from memory. A daemon thread polls the S3 object's ETag/LastModified
+    or the local file's mtime and swaps in a new model when it changes. Requests only
+    ever read the current reference, so a reload never blocks them.
+
+    Concurrent cold callers share a single load and its outcome. After an S3 load fails, S3
+    is skipped in favour of the local model for an exponentially growing backoff period;
+    failed version checks do not start a backoff.
+    """
+
+    _instances: Dict[Tuple[str, str], "ProductionModelHolder"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self,
+                 bucket_name: str = MODEL_BUCKET_NAME,
+                 model_path: str = MODEL_FILE_NAME,
+                 local_model_path: Optional[str] = None,
+                 reload_interval: float = MODEL_SERVING_RELOAD_INTERVAL_SECONDS,
+                 use_s3: bool = True,
+                 s3_retry_backoff: float = MODEL_SERVING_S3_RETRY_BACKOFF_SECONDS,
+                 s3_retry_backoff_max: float = MODEL_SERVING_S3_RETRY_BACKOFF_MAX_SECONDS):
+        """
+        :param bucket_name: Name of the model bucket
+        :param model_path: Location of the model in the bucket
+        :param local_model_path: Local production model used when S3 is not reachable
+        :param reload_interval: Seconds between version checks, 0 disables the watcher
+        :param use_s3: Set to False to serve the local model only
+        :param s3_retry_backoff: Seconds S3 is skipped after its first failure, doubled on every further one
+        :param s3_retry_backoff_max: Upper bound of the S3 backoff
+        """
+        self.bucket_name = bucket_name
+        self.model_path = model_path
+        self.local_model_path = local_model_path or os.path.join(
+            ARTIFACT_DIR, PRODUCTION_MODEL_DIR_NAME, MODEL_FILE_NAME
+        )
+        self.reload_interval = reload_interval
+        self.use_s3 = use_s3
+        self.s3_retry_backoff = s3_retry_backoff
+        self.s3_retry_backoff_max = s3_retry_backoff_max
+
+        self._model: Optional[MyModel] = None
+        self._source: Optional[str] = None
+        self._version: Optional[str] = None
+        self._generation = 0
+        self._s3 = None
+        self._swap_listeners: List[Callable[["ProductionModelHolder"], None]] = []
+        # Written by the watcher thread and by request threads loading the model
+        self._s3_failures = 0
+        self._s3_retry_at = 0.0
+        self._s3_state_lock = threading.Lock()
+        self._loads = SingleFlight()
+
+        self._load_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+    @classmethod
+    def get_instance(cls,
+                     bucket_name: str = MODEL_BUCKET_NAME,
+                     model_path: str = MODEL_FILE_NAME) -> "ProductionModelHolder":
+        """
+        Returns the shared holder for the given bucket/key, creating it on first use.
+        """
+        key = (bucket_name, model_path)
+        holder = cls._instances.get(key)
+        if holder is None:
+            with cls._instances_lock:
+                holder = cls._instances.get(key)
+                if holder is None:
+                    holder = cls(bucket_name=bucket_name, model_path=model_path)
+                    cls._instances[key] = holder
+        return holder
+
+    @classmethod
+    def set_instance(cls, holder: "ProductionModelHolder") -> None:
+        """
+        Registers a pre-configured holder as the shared instance for its bucket/key.
+        """
+        with cls._instances_lock:
+            previous = cls._instances.get((holder.bucket_name, holder.model_path))
+            if previous is not None and previous is not holder:
+                previous.stop_watcher()
+            cls._instances[(holder.bucket_name, holder.model_path)] = holder
+
+    @property
+    def source(self) -> Optional[str]:
+        return self._source
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._version
+
+    @property
+    def generation(self) -> int:
+        """Number of models swapped in so far; changes every time the model does."""
+        return self._generation
+
+    def add_swap_listener(self, listener: Callable[["ProductionModelHolder"], None]) -> None:
+        """
+        Registers a callback run with this holder every time a new model starts serving.
+        """
+        self._swap_listeners.append(listener)
+
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def get_model(self) -> MyModel:
+        """
+        Returns the in-memory model, loading it on first use.
+        """
+        model = self._model
+        if model is not None:
+            return model
+
+        try:
+            # Callers arriving during a load wait for it and share its model or its error
+            self._loads.do("initial", self._load_initial)
+        except Exception as e:
+            raise MyException(e, sys) from e
+        self.start_watcher()
+        return self._model
+
+    def _load_initial(self) -> None:
+        with self._load_lock:
+            if self._model is None:
+                source, version = self._probe_version()
+                model, source, version = self._load(source, version)
+                self._swap(model, source, version)
+
+    def stats(self) -> dict:
+        with self._s3_state_lock:
+            s3_failures, s3_retry_at = self._s3_failures, self._s3_retry_at
+        return {
+            "loaded": self.is_loaded(),
+            "source": self._source,
+            "version": self._version,
+            "generation": self._generation,
+            "loads": self._loads.stats(),
+            "s3_failures": s3_failures,
+            "s3_retry_in_seconds": round(max(0.0, s3_retry_at - time.monotonic()), 3),
+        }
+
+    def start_watcher(self) -> None:
+        """
+        Starts the background version watcher if it is enabled and not yet running.
+        """
+        if self.reload_interval <= 0:
+            return
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        with self._load_lock:
+            if self._watcher is not None and self._watcher.is_alive():
+                return
+            self._stop_event.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, name="model-watcher", daemon=True
+            )
+            self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        self._stop_event.set()
+        watcher = self._watcher
+        if watcher is not None and watcher is not threading.current_thread():
+            watcher.join(timeout=5)
+        self._watcher = None
+
+    def check_for_update(self) -> bool:
+        """
+        Compares the version of the preferred model source with the loaded one and
+        swaps in the new model when it differs.
+
+        Returns: True if a new model was swapped in
+        """
+        try:
+            source, version = self._probe_version()
+        except Exception as e:
+            logging.warning(f"Model version check failed: {str(e)}")
+            return False
+
+        if (source, version) == (self._source, self._version):
+            return False
+
+        try:
+            model, source, version = self._load(source, version)
+        except Exception as e:
+            logging.warning(f"Reloading model from {source} failed, keeping current model: {str(e)}")
+            return False
+
+        with self._load_lock:
+            self._swap(model, source, version)
+        return True
+
+    def _watch(self) -> None:
+        while not self._stop_event.wait(self.reload_interval):
+            self.check_for_update()
+
+    def _swap(self, model: MyModel, source: str, version: Optional[str]) -> None:
+        # Build the pandas-free inference path before the model starts serving
+        model.compile()
+        self._model = model
+        self._source = source
+        self._version = version
+        self._generation += 1
+        record_model_load(source)
+        logging.info(f"Serving model from {source} (version: {version}, generation: {self._generation})")
+        for listener in self._swap_listeners:
+            try:
+                listener(self)
+            except Exception as e:
+                logging.warning(f"Model swap listener failed: {str(e)}")
+
+    def _get_s3(self):
+        if self._s3 is None:
+            from src.cloud_storage.aws_storage import SimpleStorageService
+            self._s3 = SimpleStorageService()
+        return self._s3
+
+    def _probe_local_version(self) -> Optional[str]:
+        try:
+            return str(os.stat(self.local_model_path).st_mtime_ns)
+        except OSError:
+            return None
+
+    def _s3_allowed(self) -> bool:
+        if not self.use_s3:
+            return False
+        with self._s3_state_lock:
+            return time.monotonic() >= self._s3_retry_at
+
+    def _record_s3_failure(self, error: Exception) -> None:
+        """
+        Remembers that loading from S3 failed so the next calls go straight to the local model
+        until the backoff expires.
+        """
+        with self._s3_state_lock:
+            self._s3_failures += 1
+            failures = self._s3_failures
+            delay = min(self.s3_retry_backoff_max, self.s3_retry_backoff * 2 ** (failures - 1))
+            self._s3_retry_at = time.monotonic() + delay
+        logging.warning(f"Loading the model from S3 failed ({failures} in a row), "
+                        f"using the local model for {delay:.0f}s: {str(error)}")
+
+    def _record_s3_success(self) -> None:
+        with self._s3_state_lock:
+            self._s3_failures = 0
+            self._s3_retry_at = 0.0
+
+    def _probe_version(self) -> Tuple[str, Optional[str]]:
+        """
+        Returns the preferred source ("s3" or "local") and its current version token.
+        The local model is only offered when no S3 model is serving; a failing S3 version
+        check while one is raises instead.
+        """
+        if self._s3_allowed():
+            try:
+                return "s3", self._get_s3().get_object_version(self.model_path, self.bucket_name)
+            except Exception as e:
+                if self._source == "s3":
+                    # A failed version check says nothing about the S3 model being served: keep it
+                    # rather than swapping in a local file that may be stale or the placeholder
+                    raise
+                # Only failed loads back off: the next check asks S3 again
+                logging.warning(f"S3 model version check failed, using the local model: {str(e)}")
+
+        version = self._probe_local_version()
+        if version is None:
+            raise FileNotFoundError(
+                f"Neither S3 nor local model is available (local path: {self.local_model_path})"
+            )
+        return "local", version
+
+    def _load(self, source: str, version: Optional[str]) -> Tuple[MyModel, str, Optional[str]]:
+        """
+        Loads the model from the given source, falling back from S3 to the local file.
+        """
+        if source == "s3":
+            try:
+                logging.info("Loading production model from S3")
+                model = self._get_s3().load_model(self.model_path, bucket_name=self.bucket_name)
+                self._record_s3_success()
+                return model, "s3", version
+            except Exception as e:
+                logging.warning(f"Loading model from S3 failed: {str(e)}. Trying local model.")
+                self._record_s3_failure(e)
+                version = self._probe_local_version()
+                if version is None:
+                    raise MyException("Neither S3 nor local model is available for prediction", sys)
+
+        # The memory-mapped form is preferred: it loads in milliseconds and shares pages across processes
+        try:
+            model = load_mmap_artifact(self.local_model_path)
+        except Exception as e:
+            logging.warning(f"Loading memory-mapped model failed: {str(e)}. Loading the pickle instead.")
+            model = None
+        if model is not None:
+            return model, "local", version
+
+        logging.info(f"Loading production model from {self.local_model_path}")
+        return load_object(self.local_model_path), "local", version
@@ -0,0 +1,53 @@
+import sys
+from functools import lru_cache
+from typing import Dict, List
+
+from pydantic import ConfigDict, TypeAdapter
+from typing_extensions import TypedDict
+
+from src.constants import SCHEMA_FILE_PATH
+from src.exception import MyException
+from src.utils.main_utils import read_yaml_file
+
+# schema.yaml type names allowed in prediction_columns
+PREDICTION_COLUMN_TYPES = {"int": int, "float": float}
+
+
+def read_prediction_columns(schema_file_path: str = SCHEMA_FILE_PATH) -> Dict[str, type]:
+    """
+    Returns the prediction_columns section of schema.yaml as an ordered {name: python type} dict.
+    """
+    try:
+        columns = {}
+        for column in read_yaml_file(file_path=schema_file_path)["prediction_columns"]:
+            (name, type_name), = column.items()
+            if type_name not in PREDICTION_COLUMN_TYPES:
+                raise ValueError(f"Unsupported type '{type_name}' for prediction column {name}")
+            columns[name] = PREDICTION_COLUMN_TYPES[type_name]
+        return columns
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+@lru_cache(maxsize=None)
+def get_vehicle_record_adapter(schema_file_path: str = SCHEMA_FILE_PATH) -> TypeAdapter:
+    """
+    Builds the validator for one JSON prediction record from schema.yaml, once per schema file.
+    Validation is a single compiled pass from raw JSON bytes to a dict of typed values: every field
+    is required, ints accept integral numbers and numeric strings, floats must be finite and
+    unknown keys are ignored.
+    """
+    columns = read_prediction_columns(schema_file_path)
+    record_type = TypedDict("VehicleRecord", columns)
+    record_type.__pydantic_config__ = ConfigDict(allow_inf_nan=False)
+    return TypeAdapter(record_type)
+
+
+def format_validation_errors(errors: List[dict]) -> List[dict]:
+    """
+    Reduces pydantic error dicts to the fields returned to API clients.
+    """
+    return [
+        {"field": ".".join(str(part) for part in error["loc"]), "message": error["msg"], "type": error["type"]}
+        for error in errors
+    ]
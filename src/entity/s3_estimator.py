@@ -1,6 +1,7 @@
 from src.cloud_storage.aws_storage import SimpleStorageService
 from src.exception import MyException
 from src.entity.estimator import MyModel
+from src.utils.single_flight import SingleFlight
 import sys
 from pandas import DataFrame
 
@@ -19,6 +20,7 @@ class InsuranceEstimator:
         self.s3 = SimpleStorageService()
         self.model_path = model_path
         self.loaded_model:MyModel=None
+        self._loads = SingleFlight()
 
 
     def is_model_present(self,model_path):
@@ -64,7 +66,8 @@ class InsuranceEstimator:
                 dataframe['id'] = 0  # Add a dummy id column
 
             if self.loaded_model is None:
-                self.loaded_model = self.load_model()
+                # Concurrent first predictions share one load
+                self.loaded_model = self._loads.do("load", self.load_model)
 
             return self.loaded_model.predict(dataframe=dataframe)
         except Exception as e:
@@ -1,6 +1,10 @@
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from from_root import from_root
 from datetime import datetime
 
@@ -10,28 +14,104 @@ LOG_FILE = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
 MAX_LOG_SIZE = 5 * 1024 * 1024  # 5 MB
 BACKUP_COUNT = 3  # Number of backup log files to keep
 
+# Records waiting for the writer thread; further records are dropped, never waited for
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+# Records per second each call site may log below WARNING before sampling starts
+LOG_RATE_LIMIT_PER_SECOND = float(os.getenv("LOG_RATE_LIMIT_PER_SECOND", 20))
+LOG_RATE_LIMIT_BURST = int(os.getenv("LOG_RATE_LIMIT_BURST", 100))
+# Over the rate limit, 1 in LOG_SAMPLE_EVERY records is still written
+LOG_SAMPLE_EVERY = int(os.getenv("LOG_SAMPLE_EVERY", 100))
+
 # Construct log file path
 log_dir_path = os.path.join(from_root(), LOG_DIR)
-os.makedirs(log_dir_path, exist_ok=True)
 log_file_path = os.path.join(log_dir_path, LOG_FILE)
 
 
-def configure_logger():
+class RateLimitFilter(logging.Filter):
     """
-    Configures logging with a rotating file handler and a console handler.
+    Bounds the volume of DEBUG/INFO records per logger and call site with a token bucket.
+    Once a call site runs out of tokens only every sample_every-th record passes.
+    WARNING and above always pass.
     """
-    # Create a custom logger
-    logger = logging.getLogger()
-    logger.setLevel(logging.DEBUG)
 
+    def __init__(self,
+                 rate_per_second: float = LOG_RATE_LIMIT_PER_SECOND,
+                 burst: int = LOG_RATE_LIMIT_BURST,
+                 sample_every: int = LOG_SAMPLE_EVERY):
+        super().__init__()
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.sample_every = max(1, sample_every)
+        self._buckets = {}  # (logger, path, line) -> [tokens, last refill, records over the limit]
+        self._lock = threading.Lock()
+        self.rate_limited = 0
+        self.sampled = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate_per_second <= 0:
+            return True
+
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate_per_second)
+            bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True
+
+            bucket[2] += 1
+            if bucket[2] % self.sample_every == 0:
+                self.sampled += 1
+                return True
+            self.rate_limited += 1
+            return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler for a bounded queue that drops records instead of blocking the caller when full.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_queue_handler = None
+_listener = None
+_rate_limit_filter = None
+_current_log_file_path = None
+
+
+def process_log_file_path(pid: int) -> str:
+    """
+    Log file of a forked process (e.g. a prefork worker): the parent's file name plus the pid.
+    RotatingFileHandler is not safe across processes, so each process writes and rotates its own file.
+    """
+    root, extension = os.path.splitext(log_file_path)
+    return f"{root}.{pid}{extension}"
+
+
+def _build_output_handlers(file_path: str):
     # Define formatter
     formatter = logging.Formatter(
         "[ %(asctime)s ] %(name)s - %(levelname)s - %(message)s"
     )
 
-    # File handler with rotation
+    # File handler with rotation; the file is only opened when the first record is written
+    os.makedirs(log_dir_path, exist_ok=True)
     file_handler = RotatingFileHandler(
-        log_file_path, maxBytes=MAX_LOG_SIZE, backupCount=BACKUP_COUNT
+        file_path, maxBytes=MAX_LOG_SIZE, backupCount=BACKUP_COUNT, delay=True
     )
     file_handler.setFormatter(formatter)
     file_handler.setLevel(logging.DEBUG)
@@ -41,9 +121,74 @@ def configure_logger():
     console_handler.setFormatter(formatter)
     console_handler.setLevel(logging.INFO)
 
+    return file_handler, console_handler
+
+
+def _start_listener(file_path: str = log_file_path):
+    """
+    Starts the writer thread on a fresh queue, writing to file_path and the console.
+    """
+    global _listener, _current_log_file_path
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _queue_handler.queue = log_queue
+    _current_log_file_path = file_path
+    _listener = QueueListener(log_queue, *_build_output_handlers(file_path), respect_handler_level=True)
+    _listener.start()
+
+
+def _start_listener_after_fork():
+    # Forked children do not inherit the parent's writer thread; each gets its own file
+    _start_listener(process_log_file_path(os.getpid()))
+
+
+def stop_log_listener():
+    """
+    Flushes queued records and stops the writer thread.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_logging_stats() -> dict:
+    """
+    Returns queue depth and the number of records dropped or rate limited so far.
+    """
+    if _queue_handler is None:
+        return {}
+    return {
+        "queued": _queue_handler.queue.qsize(),
+        "queue_size": LOG_QUEUE_SIZE,
+        "dropped": _queue_handler.dropped,
+        "rate_limited": _rate_limit_filter.rate_limited,
+        "sampled": _rate_limit_filter.sampled,
+        "file": _current_log_file_path,
+    }
+
+
+def configure_logger():
+    """
+    Configures logging through a bounded queue: callers only enqueue the record and a background
+    listener thread writes it to the rotating log file and the console.
+    """
+    global _queue_handler, _rate_limit_filter
+
+    # Create a custom logger
+    logger = logging.getLogger()
+    logger.setLevel(logging.DEBUG)
+
+    _rate_limit_filter = RateLimitFilter()
+    _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+    _queue_handler.addFilter(_rate_limit_filter)
+    _start_listener()
+
     # Add handlers to the logger
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    logger.addHandler(_queue_handler)
+
+    atexit.register(stop_log_listener)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_start_listener_after_fork)
 
 
 # Configure the logger
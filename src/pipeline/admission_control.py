@@ -0,0 +1,208 @@
+import asyncio
+import math
+from contextlib import asynccontextmanager
+from typing import Dict, Tuple
+
+from starlette.responses import JSONResponse
+
+from src.constants import ADMISSION_QUEUE_TIMEOUT_SECONDS, ADMISSION_RETRY_AFTER_SECONDS
+from src.logger import logging
+from src.utils.metrics import admission_gauges, record_admission_rejection
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request cannot be admitted; the caller should answer 503 with Retry-After.
+    """
+
+    def __init__(self, route: str, reason: str, retry_after: float):
+        super().__init__(f"{route} is overloaded ({reason})")
+        self.route = route
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def worker_share(limit: int, workers: int, minimum: int = 0) -> int:
+    """
+    Splits a server-wide limit evenly across pre-forked workers, each of which admits on its own.
+    Returns: the per-worker limit, never below `minimum`
+    """
+    return max(minimum, limit // max(1, workers))
+
+
+class AdmissionController:
+    """
+    Bounds the work one route accepts: at most `max_concurrency` requests run at once and
+    at most `max_queue` more wait for a slot, each for no longer than `queue_timeout`.
+    Everything beyond that is rejected immediately instead of adding to the latency of
+    the requests already admitted.
+    """
+
+    def __init__(self,
+                 route: str,
+                 max_concurrency: int,
+                 max_queue: int,
+                 queue_timeout: float = ADMISSION_QUEUE_TIMEOUT_SECONDS,
+                 retry_after: float = ADMISSION_RETRY_AFTER_SECONDS):
+        """
+        :param route: Name used in metrics, logs and rejection messages
+        :param max_concurrency: Requests allowed to run at the same time
+        :param max_queue: Requests allowed to wait for a slot, 0 rejects as soon as all slots are taken
+        :param queue_timeout: Seconds a queued request waits before it is rejected
+        :param retry_after: Seconds suggested to rejected clients through the Retry-After header
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.route = route
+        self.max_concurrency = max_concurrency
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+
+        # Created lazily so the semaphore binds to the serving event loop
+        self._semaphore = None
+        self._in_flight_gauge, self._queued_gauge = admission_gauges(route)
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @in_flight.setter
+    def in_flight(self, value: int) -> None:
+        # Pushed on every change: multiprocess metrics can only sum values written to their files
+        self._in_flight = value
+        self._in_flight_gauge.set(value)
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    @queued.setter
+    def queued(self, value: int) -> None:
+        self._queued = value
+        self._queued_gauge.set(value)
+
+    @asynccontextmanager
+    async def admit(self):
+        """
+        Holds one slot of the route for the duration of the block and yields a function
+        that hands the slot back earlier; calling it more than once has no effect.
+        Raises AdmissionRejected when the queue is full or the wait times out.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        if self._semaphore.locked():
+            if self.queued >= self.max_queue:
+                self._reject("queue_full")
+            self.queued += 1
+            try:
+                acquired = await self._acquire_within(self.queue_timeout)
+            finally:
+                self.queued -= 1
+            if not acquired:
+                self._reject("queue_timeout")
+        else:
+            await self._semaphore.acquire()
+
+        self.in_flight += 1
+        self.admitted += 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            if not released:
+                released = True
+                self.in_flight -= 1
+                self._semaphore.release()
+
+        try:
+            yield release
+        finally:
+            release()
+
+    async def _acquire_within(self, timeout: float) -> bool:
+        """
+        Waits up to `timeout` seconds for a slot. Returns False on timeout.
+
+        The acquire runs as its own task so a permit granted just as the timeout fires
+        (or as the caller is cancelled) is handed back instead of leaking.
+        """
+        acquire = asyncio.ensure_future(self._semaphore.acquire())
+        try:
+            done, _ = await asyncio.wait({acquire}, timeout=timeout)
+        except asyncio.CancelledError:
+            await self._abandon(acquire)
+            raise
+        if done:
+            return True
+        await self._abandon(acquire)
+        return False
+
+    async def _abandon(self, acquire: asyncio.Future) -> None:
+        acquire.cancel()
+        await asyncio.gather(acquire, return_exceptions=True)
+        if not acquire.cancelled() and acquire.exception() is None:
+            self._semaphore.release()
+
+    def _reject(self, reason: str) -> None:
+        self.rejected += 1
+        record_admission_rejection(self.route, reason)
+        logging.warning(f"Rejected request to {self.route}: {reason} "
+                        f"({self.in_flight} running, {self.queued} queued)")
+        raise AdmissionRejected(self.route, reason, self.retry_after)
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying an AdmissionController to the (method, path) pairs it is given.
+    Rejections are answered before the request body is read; other routes pass straight through.
+    The slot is handed back once the last body chunk is sent, so background tasks Starlette
+    runs after the response (shadow scoring) do not hold request capacity.
+    """
+
+    def __init__(self, app, routes: Dict[Tuple[str, str], AdmissionController]):
+        """
+        :param app: Wrapped ASGI application
+        :param routes: (HTTP method, path) -> controller; several routes may share one controller
+        """
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send):
+        controller = None
+        if scope["type"] == "http":
+            controller = self.routes.get((scope["method"], scope["path"]))
+        if controller is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            async with controller.admit() as release:
+                async def send_and_release(message):
+                    await send(message)
+                    if message["type"] == "http.response.body" and not message.get("more_body", False):
+                        release()
+
+                await self.app(scope, receive, send_and_release)
+        except AdmissionRejected as rejected:
+            response = JSONResponse(
+                status_code=503,
+                content={"status": False, "error": str(rejected)},
+                headers={"Retry-After": str(math.ceil(rejected.retry_after))},
+            )
+            await response(scope, receive, send)
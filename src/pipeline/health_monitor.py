@@ -0,0 +1,128 @@
+import asyncio
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from src.constants import HEALTH_PROBE_INTERVAL_SECONDS, HEALTH_PROBE_TIMEOUT_SECONDS
+from src.entity.model_holder import ProductionModelHolder
+from src.logger import logging
+
+
+def probe_mongodb() -> str:
+    """
+    Pings MongoDB through the shared MongoDBClient connection, creating it once if needed.
+    """
+    from src.configuration.mongo_db_connection import MongoDBClient
+
+    client = MongoDBClient.client
+    if client is None:
+        client = MongoDBClient().client
+        if client is None:
+            raise ConnectionError("MongoDB client is not available")
+    client.admin.command("ping")
+    return "OK"
+
+
+def probe_model(holder: Optional[ProductionModelHolder] = None) -> str:
+    """
+    Reports the in-memory production model; never touches S3 or the filesystem.
+    """
+    holder = holder or ProductionModelHolder.get_instance()
+    if not holder.is_loaded():
+        return "Not loaded"
+    return f"OK ({holder.source}, generation {holder.generation})"
+
+
+class HealthMonitor:
+    """
+    Keeps a health snapshot current from a background asyncio task so the /health
+    endpoint only returns the last result instead of probing dependencies itself.
+
+    Every probe is a blocking callable run on a dedicated thread with a timeout;
+    a probe that is still hanging from an earlier round is reported, not restarted.
+    """
+
+    def __init__(self,
+                 probes: Dict[str, Callable[[], str]],
+                 interval: float = HEALTH_PROBE_INTERVAL_SECONDS,
+                 timeout: float = HEALTH_PROBE_TIMEOUT_SECONDS):
+        """
+        :param probes: dependency name -> callable returning a status string, raising on failure
+        :param interval: Seconds between probe rounds
+        :param timeout: Seconds a single probe may take before it is reported as timed out
+        """
+        self.probes = probes
+        self.interval = interval
+        self.timeout = timeout
+
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(probes)), thread_name_prefix="health")
+        self._pending: Dict[str, Future] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._services: Dict[str, dict] = {}
+        self._checked_at: Optional[datetime] = None
+        self._checked_monotonic: Optional[float] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self) -> None:
+        while True:
+            await self.probe_once()
+            await asyncio.sleep(self.interval)
+
+    async def probe_once(self) -> dict:
+        """
+        Runs every probe concurrently and stores the resulting snapshot.
+        """
+        names = list(self.probes)
+        results = await asyncio.gather(*(self._probe(name) for name in names))
+        self._services = dict(zip(names, results))
+        self._checked_at = datetime.now()
+        self._checked_monotonic = time.monotonic()
+        return self.snapshot()
+
+    async def _probe(self, name: str) -> dict:
+        pending = self._pending.get(name)
+        if pending is not None and not pending.done():
+            return {"status": "Error: previous probe still running", "latency_ms": None}
+
+        start = time.perf_counter()
+        future = self._executor.submit(self.probes[name])
+        self._pending[name] = future
+        try:
+            status = await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            status = f"Error: timed out after {self.timeout}s"
+        except Exception as e:
+            status = f"Error: {str(e)}"
+        latency_ms = (time.perf_counter() - start) * 1000
+        if status.startswith("Error"):
+            logging.warning(f"Health probe {name} failed: {status}")
+        return {"status": status, "latency_ms": round(latency_ms, 3)}
+
+    def snapshot(self) -> dict:
+        """
+        Returns the last probe results without doing any I/O.
+        """
+        if self._checked_at is None:
+            return {"status": "starting", "checked_at": None, "probe_age_seconds": None, "services": {}}
+
+        healthy = all(not service["status"].startswith("Error") for service in self._services.values())
+        return {
+            "status": "healthy" if healthy else "degraded",
+            "checked_at": str(self._checked_at),
+            "probe_age_seconds": round(time.monotonic() - self._checked_monotonic, 3),
+            "services": self._services,
+        }
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.constants import INFERENCE_EXECUTOR_KIND, INFERENCE_EXECUTOR_WORKERS
+from src.logger import logging
+
+
+class InferenceExecutor:
+    """
+    Runs CPU-bound prediction work off the event loop in a bounded worker pool.
+
+    kind="thread" shares the process-wide model with the request handlers;
+    kind="process" gives every worker its own model copy and its own GIL, so the
+    callables passed to `run` must then be picklable module-level functions.
+    """
+
+    def __init__(self, max_workers: int = INFERENCE_EXECUTOR_WORKERS, kind: str = INFERENCE_EXECUTOR_KIND):
+        """
+        :param max_workers: Number of pool workers, extra submissions wait in the pool queue
+        :param kind: "thread" or "process"
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown inference executor kind: {kind}")
+        self.max_workers = max(1, max_workers)
+        self.kind = kind
+
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers, thread_name_prefix="inference"
+                        )
+                    logging.info(f"Started {self.kind} inference pool with {self.max_workers} workers")
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs fn(*args) in the pool and awaits its result without blocking the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            result = await loop.run_in_executor(self._get_executor(), fn, *args)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        self.completed += 1
+        return result
+
+    def stats(self) -> dict:
+        """
+        Returns queue-depth metrics; work beyond max_workers waits in the pool queue.
+        """
+        return {
+            "kind": self.kind,
+            "workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "running": min(self.in_flight, self.max_workers),
+            "queued": max(0, self.in_flight - self.max_workers),
+            "max_in_flight": self.max_in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from src.constants import WARMUP_PREDICTIONS, WARMUP_RETRY_INTERVAL_SECONDS
+from src.logger import logging
+from src.pipeline.prediction_pipeline import VehicleData, VehicleDataBatch
+from src.utils.synthetic_data import synthetic_vehicle_records
+
+
+class ModelWarmup:
+    """
+    Startup phase that loads the production model and sends synthetic predictions through
+    the same single-record and batch paths the routes use, so the first real request does not
+    pay for the download, unpickling and first-call allocations. The replica only reports
+    ready once a warm-up round has completed; a failed round is retried until it succeeds.
+    """
+
+    def __init__(self,
+                 load_model: Callable[[], Awaitable[Any]],
+                 predict_one: Callable[[VehicleData], Awaitable[Any]],
+                 predict_batch: Callable[[VehicleDataBatch], Awaitable[Any]],
+                 predictions: int = WARMUP_PREDICTIONS,
+                 retry_interval: float = WARMUP_RETRY_INTERVAL_SECONDS):
+        """
+        :param load_model: Loads the production model
+        :param predict_one: Scores one record through the single-record serving path
+        :param predict_batch: Scores a batch through the batch serving path
+        :param predictions: Number of synthetic single-record predictions per round
+        :param retry_interval: Seconds to wait before retrying a failed round
+        """
+        self.load_model = load_model
+        self.predict_one = predict_one
+        self.predict_batch = predict_batch
+        self.predictions = predictions
+        self.retry_interval = retry_interval
+
+        self.status = "pending"
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self.timings_ms: dict = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.status == "ready"
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while not await self.run_once():
+            await asyncio.sleep(self.retry_interval)
+
+    async def run_once(self) -> bool:
+        """
+        Runs one warm-up round.
+        Returns: True once the replica is ready
+        """
+        self.status = "warming"
+        self.attempts += 1
+        timings_ms = {}
+        try:
+            start = time.perf_counter()
+            await self.load_model()
+            timings_ms["model_load"] = round((time.perf_counter() - start) * 1000, 3)
+
+            records = synthetic_vehicle_records(max(1, self.predictions), seed=self.attempts)
+            start = time.perf_counter()
+            for record in records[:self.predictions]:
+                await self.predict_one(VehicleData(**record))
+            timings_ms["single_predictions"] = round((time.perf_counter() - start) * 1000, 3)
+
+            start = time.perf_counter()
+            await self.predict_batch(VehicleDataBatch(records))
+            timings_ms["batch_prediction"] = round((time.perf_counter() - start) * 1000, 3)
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+            self.timings_ms = timings_ms
+            logging.warning(f"Model warm-up attempt {self.attempts} failed, /ready stays 503; "
+                            f"retrying in {self.retry_interval}s: {e}")
+            return False
+
+        self.status = "ready"
+        self.error = None
+        self.timings_ms = timings_ms
+        logging.info(f"Model warm-up finished after {self.attempts} attempt(s): {timings_ms}")
+        return True
+
+    def snapshot(self) -> dict:
+        return {
+            "status": self.status,
+            "ready": self.is_ready,
+            "attempts": self.attempts,
+            "predictions": self.predictions,
+            "timings_ms": self.timings_ms,
+            "error": self.error,
+        }
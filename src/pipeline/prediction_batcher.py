@@ -0,0 +1,128 @@
+import asyncio
+from typing import Any, Callable, List, Optional, Sequence, Set, Tuple
+
+from src.constants import MICRO_BATCH_CLOSE_TIMEOUT_SECONDS, MICRO_BATCH_MAX_SIZE, MICRO_BATCH_MAX_WAIT_MS
+from src.logger import logging
+from src.pipeline.inference_executor import InferenceExecutor
+
+
+class PredictionBatcher:
+    """
+    Coalesces concurrent single-record predictions into one vectorized call.
+
+    Each request awaits its own future while records are collected for up to
+    `max_wait_ms` milliseconds or until `max_batch_size` records are waiting.
+    The batch is then scored with a single `predict_fn` call (in `executor` when
+    one is given) and every future receives the prediction for its own record.
+    """
+
+    def __init__(self,
+                 predict_fn: Callable[[Sequence[Any]], Sequence[Any]],
+                 max_batch_size: int = MICRO_BATCH_MAX_SIZE,
+                 max_wait_ms: float = MICRO_BATCH_MAX_WAIT_MS,
+                 executor: Optional[InferenceExecutor] = None):
+        """
+        :param predict_fn: Scores a list of records and returns one prediction per record
+        :param max_batch_size: Flush as soon as this many records are waiting
+        :param max_wait_ms: Longest time the first record of a batch waits for company
+        :param executor: Pool that runs predict_fn off the event loop
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = executor
+
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # The loop only keeps weak references to tasks: hold running batches until they finish
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.batches = 0
+        self.records = 0
+        self.largest_batch = 0
+
+    async def predict(self, record: Any) -> Any:
+        """
+        Queues one record for the next batch and returns its prediction.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((record, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "records": self.records,
+            "largest_batch": self.largest_batch,
+            "mean_batch_size": self.records / self.batches if self.batches else 0.0,
+            "pending": len(self._pending),
+            "running": len(self._tasks),
+        }
+
+    async def close(self, timeout: Optional[float] = MICRO_BATCH_CLOSE_TIMEOUT_SECONDS) -> None:
+        """
+        Flushes the records still waiting and waits for the running batches.
+        Batches not finished within `timeout` seconds are cancelled.
+        """
+        self._flush()
+        if not self._tasks:
+            return
+        done, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logging.warning(f"Cancelled {len(pending)} micro-batches still running at shutdown")
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        self.batches += 1
+        self.records += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        try:
+            await self._score_batch(batch)
+        except asyncio.CancelledError:
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+            raise
+
+    async def _score_batch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        try:
+            records = [record for record, _ in batch]
+            if self.executor is not None:
+                predictions = await self.executor.run(self.predict_fn, records)
+            else:
+                predictions = self.predict_fn(records)
+            if len(predictions) != len(batch):
+                raise ValueError(f"predict_fn returned {len(predictions)} predictions for {len(batch)} records")
+        except Exception as e:
+            logging.error(f"Micro-batch of {len(batch)} records failed: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), prediction in zip(batch, predictions):
+            if not future.done():
+                future.set_result(prediction)
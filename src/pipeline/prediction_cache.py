@@ -0,0 +1,121 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+from src.constants import PREDICTION_CACHE_MAX_SIZE, PREDICTION_CACHE_TTL_SECONDS
+from src.entity.model_holder import ProductionModelHolder
+from src.logger import logging
+from src.utils.metrics import record_cache_lookup
+
+_MISSING = object()
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of predictions with a per-entry time to live.
+
+    Keys are (model generation, feature tuple) so a result is only ever served for
+    the model that produced it; the cache also empties itself whenever its model
+    holder swaps in a new model.
+    """
+
+    _instances: "weakref.WeakKeyDictionary[ProductionModelHolder, PredictionCache]" = weakref.WeakKeyDictionary()
+    _instances_lock = threading.Lock()
+
+    def __init__(self,
+                 max_size: int = PREDICTION_CACHE_MAX_SIZE,
+                 ttl_seconds: float = PREDICTION_CACHE_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        :param max_size: Maximum number of cached predictions, 0 disables the cache
+        :param ttl_seconds: Seconds an entry stays valid, 0 keeps entries until evicted
+        :param clock: Time source, injectable for tests
+        """
+        self.max_size = max(0, max_size)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.flushes = 0
+
+    @classmethod
+    def for_holder(cls, holder: ProductionModelHolder) -> "PredictionCache":
+        """
+        Returns the cache attached to a model holder, creating it on first use.
+        """
+        cache = cls._instances.get(holder)
+        if cache is None:
+            with cls._instances_lock:
+                cache = cls._instances.get(holder)
+                if cache is None:
+                    cache = cls()
+                    holder.add_swap_listener(lambda _: cache.clear())
+                    cls._instances[holder] = cache
+        return cache
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the cached prediction for key, or default on a miss or an expired entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                record_cache_lookup(hit=False)
+                return default
+            stored_at, value = entry
+            if self.ttl_seconds > 0 and self._clock() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                record_cache_lookup(hit=False)
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            record_cache_lookup(hit=True)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            size = len(self._entries)
+            self._entries.clear()
+            self.flushes += 1
+        logging.info(f"Prediction cache flushed ({size} entries)")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "flushes": self.flushes,
+        }
@@ -1,10 +1,17 @@
 import sys
-import os
+from typing import TYPE_CHECKING, List
 from src.entity.config_entity import VehiclePredictorConfig
-from src.entity.s3_estimator import InsuranceEstimator
+from src.entity.model_holder import ProductionModelHolder
+from src.entity.prediction_schema import read_prediction_columns
+from src.pipeline.prediction_cache import PredictionCache
 from src.exception import MyException
 from src.logger import logging
-from pandas import DataFrame
+from src.utils.metrics import time_stage
+import numpy as np
+
+if TYPE_CHECKING:
+    # pandas is only imported when a DataFrame is actually built
+    from pandas import DataFrame
 
 
 class VehicleData:
@@ -55,14 +62,29 @@ class VehicleData:
             logging.error(f"Error in VehicleData initialization: {str(e)}")
             raise MyException(e, sys) from e
 
-    def get_vehicle_input_data_frame(self)-> DataFrame:
+    @classmethod
+    def from_validated(cls, record: dict) -> "VehicleData":
+        """
+        Fast constructor for a record already validated and typed by the JSON prediction schema.
+        Skips the per-field conversion and logging of __init__; only the Vintage clip is applied.
+        """
+        vehicle_data = cls.__new__(cls)
+        vehicle_data.__dict__.update(record)
+        if vehicle_data.Vintage < 0:
+            vehicle_data.Vintage = 0
+        return vehicle_data
+
+    def get_vehicle_input_data_frame(self)-> "DataFrame":
         """
         This function returns a DataFrame from USvisaData class input
         """
         try:
 
-            vehicle_input_dict = self.get_vehicle_data_as_dict()
-            return DataFrame(vehicle_input_dict)
+            from pandas import DataFrame
+
+            with time_stage("dataframe"):
+                vehicle_input_dict = self.get_vehicle_data_as_dict()
+                return DataFrame(vehicle_input_dict)
 
         except Exception as e:
             raise MyException(e, sys) from e
@@ -97,6 +119,76 @@ class VehicleData:
         except Exception as e:
             raise MyException(e, sys) from e
 
+class VehicleDataBatch:
+    """
+    Column-wise validation of many prediction records at once.
+    Builds a single DataFrame so the whole batch goes through one transform + predict call.
+    """
+
+    # Model input features and the type each one is converted to, in model column order,
+    # from the same schema.yaml prediction_columns as the JSON record validator
+    FEATURE_TYPES = read_prediction_columns()
+
+    def __init__(self, records: list):
+        """
+        :param records: list of dicts, one per vehicle, keyed by feature name
+        Raises ValueError describing every invalid column when validation fails.
+        """
+        if not isinstance(records, list) or len(records) == 0:
+            raise ValueError("'records' must be a non-empty list")
+        if not all(isinstance(record, dict) for record in records):
+            raise ValueError("every record must be a JSON object")
+
+        self.size = len(records)
+        self.columns = {}
+        errors = []
+        for feature, feature_type in self.FEATURE_TYPES.items():
+            try:
+                self.columns[feature] = self._convert_column(
+                    [record.get(feature) for record in records], feature_type
+                )
+            except ValueError as ve:
+                errors.append(f"{feature}: {ve}")
+
+        if errors:
+            raise ValueError("; ".join(errors))
+
+        # Ensure Vintage is not negative, same rule as VehicleData
+        np.maximum(self.columns["Vintage"], 0, out=self.columns["Vintage"])
+
+    @staticmethod
+    def _convert_column(values: list, feature_type: type) -> np.ndarray:
+        missing = [index for index, value in enumerate(values) if value is None or value == ""]
+        if missing:
+            raise ValueError(f"missing in records {missing[:10]}")
+        try:
+            column = np.asarray(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            raise ValueError("contains non-numeric values") from None
+        if not np.isfinite(column).all():
+            raise ValueError("contains non-finite values")
+        if feature_type is int:
+            if not np.array_equal(column, np.floor(column)):
+                raise ValueError("contains non-integer values")
+            # The int64 cast would silently wrap anything outside [-2**63, 2**63)
+            if ((column < -2.0 ** 63) | (column >= 2.0 ** 63)).any():
+                raise ValueError("contains values out of the integer range")
+            return column.astype(np.int64)
+        return column
+
+    def get_vehicle_input_data_frame(self) -> "DataFrame":
+        """
+        This function returns one DataFrame holding every record of the batch
+        """
+        try:
+            from pandas import DataFrame
+
+            with time_stage("dataframe"):
+                return DataFrame({"id": np.zeros(self.size, dtype=np.int64), **self.columns})
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+
 class VehicleDataClassifier:
     def __init__(self, prediction_pipeline_config: VehiclePredictorConfig = VehiclePredictorConfig(),) -> None:
         """
@@ -105,10 +197,13 @@ class VehicleDataClassifier:
         try:
             self.prediction_pipeline_config = prediction_pipeline_config
 
-            # Set up paths for local model fallback
-            import os
-            from src.constants import ARTIFACT_DIR
-            self.local_model_path = os.path.join(ARTIFACT_DIR, "production_model", "model.pkl")
+            # The model lives in a process-wide holder so it is loaded once, not per request
+            self.model_holder = ProductionModelHolder.get_instance(
+                bucket_name=self.prediction_pipeline_config.model_bucket_name,
+                model_path=self.prediction_pipeline_config.model_file_path,
+            )
+            self.local_model_path = self.model_holder.local_model_path
+            self.prediction_cache = PredictionCache.for_holder(self.model_holder)
 
         except Exception as e:
             raise MyException(e, sys)
@@ -121,32 +216,67 @@ class VehicleDataClassifier:
         try:
             logging.info("Entered predict method of VehicleDataClassifier class")
 
-            # Try to use S3 model first
-            try:
-                logging.info("Attempting to use S3 model for prediction")
-                model = InsuranceEstimator(
-                    bucket_name=self.prediction_pipeline_config.model_bucket_name,
-                    model_path=self.prediction_pipeline_config.model_file_path,
-                )
-                result = model.predict(dataframe)
-                logging.info("Successfully used S3 model for prediction")
-                return result
-
-            except Exception as s3_error:
-                # If S3 model fails, try local model
-                logging.warning(f"S3 model prediction failed: {str(s3_error)}. Trying local model.")
-                from src.entity.local_estimator import LocalInsuranceEstimator
-
-                if os.path.exists(self.local_model_path):
-                    logging.info(f"Using local model at {self.local_model_path}")
-                    local_model = LocalInsuranceEstimator(model_path=self.local_model_path)
-                    result = local_model.predict(dataframe)
-                    logging.info("Successfully used local model for prediction")
-                    return result
-                else:
-                    logging.error(f"Local model not found at {self.local_model_path}")
-                    raise MyException(f"Neither S3 nor local model is available for prediction", sys)
+            # Add an 'id' column if it doesn't exist
+            if 'id' not in dataframe.columns:
+                dataframe['id'] = 0
+
+            model = self.model_holder.get_model()
+            result = model.predict(dataframe=dataframe)
+            logging.info(f"Prediction done with {self.model_holder.source} model")
+            return result
 
         except Exception as e:
             logging.error(f"Error in prediction: {str(e)}")
-            raise MyException(e, sys)
\ No newline at end of file
+            raise MyException(e, sys)
+
+    def predict_records(self, records: List[VehicleData]) -> np.ndarray:
+        """
+        Scores many validated VehicleData records with a single predict call.
+        Repeated feature tuples are answered from the prediction cache; the rest go
+        through the model's compiled pandas-free path.
+        Returns: one prediction per record, in input order
+        """
+        try:
+            cache = self.prediction_cache
+            if not cache.enabled:
+                return self.model_holder.get_model().predict_records(records)
+
+            # Read before get_model: a concurrent swap can only make these keys stale, never wrong
+            generation = self.model_holder.generation
+            keys = [
+                (generation, tuple(getattr(record, feature) for feature in VehicleDataBatch.FEATURE_TYPES))
+                for record in records
+            ]
+            cached = [cache.get(key) for key in keys]
+            missing = [index for index, value in enumerate(cached) if value is None]
+            if not missing:
+                return np.asarray(cached)
+
+            predictions = self.model_holder.get_model().predict_records([records[index] for index in missing])
+            for index, prediction in zip(missing, predictions):
+                cache.put(keys[index], prediction)
+                cached[index] = prediction
+            return np.asarray(cached)
+        except Exception as e:
+            raise MyException(e, sys) from e
+
+
+def predict_vehicle_records(records: List[VehicleData]) -> np.ndarray:
+    """
+    Module-level entry point for executor workers (picklable for process pools).
+    """
+    return VehicleDataClassifier().predict_records(records)
+
+
+def load_vehicle_model() -> None:
+    """
+    Module-level entry point for executor workers: loads the production model without predicting.
+    """
+    VehicleDataClassifier().model_holder.get_model()
+
+
+def predict_vehicle_dataframe(dataframe: "DataFrame") -> np.ndarray:
+    """
+    Module-level entry point for executor workers (picklable for process pools).
+    """
+    return VehicleDataClassifier().predict(dataframe=dataframe)
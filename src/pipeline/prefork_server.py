@@ -0,0 +1,210 @@
+import gc
+import os
+import signal
+import socket
+import time
+from typing import Any, Callable, Dict, Optional
+
+from src.constants import PREFORK_MEMORY_REPORT_INTERVAL_SECONDS
+from src.logger import logging, stop_log_listener
+
+# smaps_rollup fields reported per process, in kB
+_SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def read_process_memory(pid: int) -> Dict[str, float]:
+    """
+    Reads the memory footprint of a process from /proc/<pid>/smaps_rollup.
+    Returns: rss/pss/shared/private sizes in MB, or an empty dict where /proc is not available
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as file:
+            lines = file.readlines()
+    except OSError:
+        return {}
+
+    values = {}
+    for line in lines:
+        name, _, rest = line.partition(":")
+        if name in _SMAPS_FIELDS:
+            values[name] = int(rest.split()[0]) / 1024
+    return {
+        "rss_mb": round(values.get("Rss", 0.0), 1),
+        "pss_mb": round(values.get("Pss", 0.0), 1),
+        "shared_mb": round(values.get("Shared_Clean", 0.0) + values.get("Shared_Dirty", 0.0), 1),
+        "private_mb": round(values.get("Private_Clean", 0.0) + values.get("Private_Dirty", 0.0), 1),
+    }
+
+
+class PreforkServer:
+    """
+    Pre-fork server: loads the model once in the master, freezes the heap, then forks
+    uvicorn workers that accept on one shared listening socket.
+
+    Workers inherit the master's memory copy-on-write. gc.freeze() moves every object
+    alive at fork time out of the collector's reach, so collections in the workers do
+    not write to (and thereby copy) the pages holding the model. The numpy buffers of
+    the flattened forest are never written and stay shared.
+
+    Each worker logs to its own file, logs/<timestamp>.<pid>.log, next to the master's
+    log; see src.logger.process_log_file_path.
+    """
+
+    def __init__(self,
+                 app: Any,
+                 host: str,
+                 port: int,
+                 workers: int,
+                 preload: Optional[Callable[[], None]] = None,
+                 post_fork: Optional[Callable[[], None]] = None,
+                 worker_exit: Optional[Callable[[int], None]] = None,
+                 memory_report_interval: float = PREFORK_MEMORY_REPORT_INTERVAL_SECONDS):
+        """
+        :param app: ASGI application served by every worker
+        :param host: Address to bind
+        :param port: Port to bind
+        :param workers: Number of worker processes
+        :param preload: Called in the master before forking, e.g. to load the model
+        :param post_fork: Called in each worker right after the fork, e.g. to restart background threads
+        :param worker_exit: Called in the master with the pid of every worker that exited, e.g. to drop its live metrics
+        :param memory_report_interval: Seconds between per-worker memory reports, 0 disables them
+        """
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.preload = preload
+        self.post_fork = post_fork
+        self.worker_exit = worker_exit
+        self.memory_report_interval = memory_report_interval
+
+        self._children: Dict[int, int] = {}  # pid -> worker index
+        self._stopping = False
+        self._socket: Optional[socket.socket] = None
+
+    def run(self) -> None:
+        if self.preload is not None:
+            self.preload()
+
+        # Everything allocated so far is shared with the workers; keep the GC off it
+        gc.collect()
+        gc.freeze()
+
+        self._socket = self._bind()
+        for index in range(self.workers):
+            self._spawn(index)
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+        logging.info(f"Pre-fork master {os.getpid()} serving http://{self.host}:{self.port} "
+                     f"with {self.workers} workers")
+        self.report_memory()
+
+        next_report = time.monotonic() + self.memory_report_interval
+        while not self._stopping:
+            self._reap(respawn=True)
+            if self.memory_report_interval > 0 and time.monotonic() >= next_report:
+                self.report_memory()
+                next_report = time.monotonic() + self.memory_report_interval
+            time.sleep(0.5)
+
+        self._shutdown()
+
+    def report_memory(self) -> Dict[int, Dict[str, float]]:
+        """
+        Logs RSS against shared and private memory for the master and every worker.
+        """
+        report = {os.getpid(): read_process_memory(os.getpid())}
+        for pid in list(self._children):
+            report[pid] = read_process_memory(pid)
+
+        for pid, memory in report.items():
+            if memory:
+                role = "master" if pid == os.getpid() else f"worker {self._children.get(pid)}"
+                logging.info(f"Memory {role} (pid {pid}): rss {memory['rss_mb']} MB, "
+                             f"shared {memory['shared_mb']} MB, private {memory['private_mb']} MB, "
+                             f"pss {memory['pss_mb']} MB")
+        workers = [memory for pid, memory in report.items() if pid != os.getpid() and memory]
+        if workers:
+            logging.info(f"Memory workers total: rss {sum(m['rss_mb'] for m in workers):.1f} MB, "
+                         f"pss {sum(m['pss_mb'] for m in workers):.1f} MB")
+        return report
+
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _spawn(self, index: int) -> None:
+        pid = os.fork()
+        if pid:
+            self._children[pid] = index
+            return
+
+        # Worker process: never returns into the master's code
+        exit_code = 0
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            if self.post_fork is not None:
+                self.post_fork()
+
+            import uvicorn
+
+            config = uvicorn.Config(self.app, host=self.host, port=self.port)
+            uvicorn.Server(config).run(sockets=[self._socket])
+        except BaseException:
+            logging.exception(f"Worker {index} (pid {os.getpid()}) crashed")
+            exit_code = 1
+        finally:
+            # os._exit skips atexit, so flush the log queue here
+            stop_log_listener()
+            os._exit(exit_code)
+
+    def _reap(self, respawn: bool) -> None:
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self._children.clear()
+                return
+            if pid == 0:
+                return
+            index = self._children.pop(pid, None)
+            if index is None:
+                continue
+            if self.worker_exit is not None:
+                try:
+                    self.worker_exit(pid)
+                except Exception as e:
+                    logging.warning(f"Worker exit hook failed for pid {pid}: {str(e)}")
+            if respawn and not self._stopping:
+                logging.warning(f"Worker {index} (pid {pid}) exited with status {status}, restarting it")
+                self._spawn(index)
+            else:
+                logging.info(f"Worker {index} (pid {pid}) exited with status {status}")
+
+    def _handle_stop(self, signum, frame) -> None:
+        self._stopping = True
+
+    def _shutdown(self, timeout: float = 30) -> None:
+        logging.info("Stopping pre-fork workers")
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        deadline = time.monotonic() + timeout
+        while self._children and time.monotonic() < deadline:
+            self._reap(respawn=False)
+            time.sleep(0.1)
+        for pid in list(self._children):
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+        self._children.clear()
+        if self._socket is not None:
+            self._socket.close()
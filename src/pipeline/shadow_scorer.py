@@ -0,0 +1,208 @@
+import asyncio
+import random
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Sequence
+
+import numpy as np
+
+from src.constants import (
+    MODEL_SERVING_RELOAD_INTERVAL_SECONDS,
+    SHADOW_LATENCY_WINDOW,
+    SHADOW_MODEL_PATH,
+    SHADOW_SAMPLE_RATE,
+    SHADOW_TIME_BUDGET_MS,
+)
+from src.entity.estimator import MyModel
+from src.entity.model_holder import ProductionModelHolder
+from src.logger import logging
+from src.utils.metrics import disable_stage_timing, record_shadow_request, record_shadow_result
+
+
+def predict_with(model: MyModel, inputs: Any) -> np.ndarray:
+    """
+    Scores a list of VehicleData records or a DataFrame, the two input forms of the routes.
+    """
+    if isinstance(inputs, list):
+        return np.asarray(model.predict_records(inputs))
+    return np.asarray(model.predict(dataframe=inputs.copy()))
+
+
+class ShadowScorer:
+    """
+    Scores a sample of live requests with a candidate model next to production, after the
+    response has been sent, and records how often the candidate agrees with the served
+    prediction and how its latency compares.
+
+    Shadow work runs on its own single thread, never in the inference pool, and at most one
+    shadow job is in flight: a sampled request that finds the shadow thread busy is skipped,
+    and a job that overruns the time budget is abandoned, so shadow scoring cannot queue up
+    behind or in front of production traffic.
+    """
+
+    def __init__(self,
+                 candidate_holder: Optional[ProductionModelHolder],
+                 production_model: Callable[[], MyModel],
+                 sample_rate: float = SHADOW_SAMPLE_RATE,
+                 time_budget_ms: float = SHADOW_TIME_BUDGET_MS,
+                 latency_window: int = SHADOW_LATENCY_WINDOW):
+        """
+        :param candidate_holder: Holder serving the candidate model, None disables shadow scoring
+        :param production_model: Returns the current production model
+        :param sample_rate: Fraction of requests scored by the candidate
+        :param time_budget_ms: Longest a shadow job may take, both models included
+        :param latency_window: Number of recent shadow jobs the latency percentiles are computed over
+        """
+        self.candidate_holder = candidate_holder
+        self.production_model = production_model
+        self.sample_rate = sample_rate
+        self.time_budget = time_budget_ms / 1000.0
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._busy = False
+        self._production_ms = deque(maxlen=latency_window)
+        self._candidate_ms = deque(maxlen=latency_window)
+
+        self.sampled = 0
+        self.scored = 0
+        self.skipped_busy = 0
+        self.timed_out = 0
+        self.failed = 0
+        self.records = 0
+        self.agreements = 0
+
+    @classmethod
+    def from_path(cls,
+                  model_path: str = SHADOW_MODEL_PATH,
+                  production_model: Optional[Callable[[], MyModel]] = None,
+                  **kwargs) -> "ShadowScorer":
+        """
+        Builds a scorer for the candidate model file at model_path; an empty path disables it.
+        """
+        holder = None
+        if model_path:
+            holder = ProductionModelHolder(
+                bucket_name="shadow",
+                model_path=model_path,
+                local_model_path=model_path,
+                reload_interval=MODEL_SERVING_RELOAD_INTERVAL_SECONDS,
+                use_s3=False,
+            )
+        if production_model is None:
+            production_model = lambda: ProductionModelHolder.get_instance().get_model()
+        return cls(candidate_holder=holder, production_model=production_model, **kwargs)
+
+    @property
+    def enabled(self) -> bool:
+        return self.candidate_holder is not None and self.sample_rate > 0
+
+    def maybe_schedule(self, background_tasks, inputs: Any, predictions: Sequence[Any]) -> None:
+        """
+        Samples the request and, when selected, adds a shadow job to the response's background tasks.
+        :param background_tasks: starlette/FastAPI BackgroundTasks of the request
+        :param inputs: What production scored: a list of VehicleData records or a DataFrame
+        :param predictions: What production returned for them
+        """
+        if not self.enabled or random.random() >= self.sample_rate:
+            return
+        self.sampled += 1
+        background_tasks.add_task(self.score, inputs, predictions)
+
+    async def score(self, inputs: Any, predictions: Sequence[Any]) -> Optional[float]:
+        """
+        Runs one shadow job.
+        Returns: the agreement rate of this job, or None when it was skipped, timed out or failed
+        """
+        if self._busy:
+            self.skipped_busy += 1
+            record_shadow_request("skipped_busy")
+            return None
+
+        self._busy = True
+        future = self._get_executor().submit(self._compare, inputs, np.asarray(predictions))
+        # The slot is only released once the thread is really done, also after a timeout
+        future.add_done_callback(self._release)
+        try:
+            agreed, total, production_ms, candidate_ms = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=self.time_budget
+            )
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            record_shadow_request("timed_out")
+            return None
+        except Exception as e:
+            self.failed += 1
+            record_shadow_request("failed")
+            logging.warning(f"Shadow scoring failed: {str(e)}")
+            return None
+
+        self.scored += 1
+        self.records += total
+        self.agreements += agreed
+        self._production_ms.append(production_ms)
+        self._candidate_ms.append(candidate_ms)
+        record_shadow_request("scored")
+        record_shadow_result(production_ms / 1000, candidate_ms / 1000, agreed, total - agreed)
+        return agreed / total
+
+    def _release(self, _future) -> None:
+        self._busy = False
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="shadow", initializer=disable_stage_timing
+            )
+        return self._executor
+
+    def _compare(self, inputs: Any, served: np.ndarray) -> tuple:
+        # Both models score the same inputs on the same thread, so their latencies are comparable
+        candidate = self.candidate_holder.get_model()
+        production = self.production_model()
+
+        start = time.perf_counter()
+        predict_with(production, inputs)
+        production_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        candidate_predictions = predict_with(candidate, inputs)
+        candidate_ms = (time.perf_counter() - start) * 1000
+
+        if len(candidate_predictions) != len(served):
+            raise ValueError(f"Candidate returned {len(candidate_predictions)} predictions for {len(served)} records")
+        agreed = int(np.count_nonzero(candidate_predictions == served))
+        return agreed, len(served), production_ms, candidate_ms
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self.candidate_holder is not None:
+            self.candidate_holder.stop_watcher()
+
+    def stats(self) -> dict:
+        def percentiles(window: deque) -> dict:
+            if not window:
+                return {"p50_ms": None, "p99_ms": None}
+            values = np.fromiter(window, dtype=np.float64)
+            return {"p50_ms": round(float(np.percentile(values, 50)), 3),
+                    "p99_ms": round(float(np.percentile(values, 99)), 3)}
+
+        return {
+            "enabled": self.enabled,
+            "candidate": None if self.candidate_holder is None else self.candidate_holder.local_model_path,
+            "sample_rate": self.sample_rate,
+            "time_budget_ms": self.time_budget * 1000,
+            "sampled": self.sampled,
+            "scored": self.scored,
+            "skipped_busy": self.skipped_busy,
+            "timed_out": self.timed_out,
+            "failed": self.failed,
+            "records": self.records,
+            "agreement_rate": self.agreements / self.records if self.records else None,
+            "latency": {
+                "production": percentiles(self._production_ms),
+                "candidate": percentiles(self._candidate_ms),
+            },
+        }
@@ -0,0 +1,258 @@
+import glob
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+from src.constants import TRAINING_JOB_HISTORY_SIZE, TRAINING_JOB_START_METHOD
+from src.logger import logging
+from src.utils.main_utils import process_is_alive
+
+TRAINING_STAGES = (
+    "data_ingestion",
+    "data_validation",
+    "data_transformation",
+    "model_trainer",
+    "model_evaluation",
+    "model_pusher",
+)
+
+# Artifacts reported back to the serving process once a run has finished
+RESULT_ARTIFACTS = (
+    "data_ingestion_artifact",
+    "data_validation_artifact",
+    "data_transformation_artifact",
+    "model_trainer_artifact",
+    "model_evaluation_artifact",
+    "model_pusher_artifact",
+)
+
+
+@dataclass
+class TrainingJob:
+    job_id: str
+    status: str = "queued"  # queued -> running -> succeeded | failed
+    submitted_at: str = field(default_factory=lambda: str(datetime.now()))
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    stages: Dict[str, str] = field(default_factory=lambda: {stage: "pending" for stage in TRAINING_STAGES})
+    result: Optional[dict] = None
+    error: Optional[str] = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def to_dict(self, include_result: bool = False) -> dict:
+        job = asdict(self)
+        if not include_result:
+            job.pop("result")
+        return job
+
+
+def run_training_job(job_id: str, events) -> None:
+    """
+    Entry point of the training worker process.
+    Runs the full TrainPipeline and streams (job_id, kind, payload) events back to the parent.
+    """
+    events.put((job_id, "running", None))
+    try:
+        # Imported here so the serving process never pays for the training stack
+        from src.pipeline.training_pipeline import TrainPipeline
+
+        pipeline = TrainPipeline()
+        pipeline.run_pipeline(
+            progress_callback=lambda stage, state: events.put((job_id, "stage", (stage, state)))
+        )
+        result = {
+            name: asdict(getattr(pipeline, name))
+            for name in RESULT_ARTIFACTS
+            if getattr(pipeline, name) is not None
+        }
+        events.put((job_id, "succeeded", result))
+    except Exception as e:
+        events.put((job_id, "failed", str(e)))
+
+
+class TrainingJobRunner:
+    """
+    Runs TrainPipeline in a separate worker process so training never competes with
+    serving for the GIL. Submissions made while a run is in flight join that run.
+
+    With a `state_dir`, every job is also written there as <job_id>.json, so pre-forked
+    app workers see each other's jobs: any worker answers the status endpoints, and a
+    submission joins a run started by another worker. A run whose owning worker is gone
+    is reported as failed.
+    """
+
+    def __init__(self,
+                 target: Callable[[str, object], None] = run_training_job,
+                 start_method: str = TRAINING_JOB_START_METHOD,
+                 history_size: int = TRAINING_JOB_HISTORY_SIZE,
+                 state_dir: Optional[str] = None):
+        """
+        :param target: Worker process entry point, called as target(job_id, events)
+        :param start_method: multiprocessing start method of the worker process
+        :param history_size: Number of finished jobs kept for the status endpoints
+        :param state_dir: Directory shared by all app workers for job state, None keeps jobs in this process only
+        """
+        self.target = target
+        self.history_size = history_size
+        self.state_dir = state_dir
+        self._context = multiprocessing.get_context(start_method)
+        self._jobs: "OrderedDict[str, TrainingJob]" = OrderedDict()
+        self._active_job_id: Optional[str] = None
+        self._lock = threading.Lock()
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+
+    def submit(self) -> Tuple[TrainingJob, bool]:
+        """
+        Starts a training run, or returns the run already in flight.
+        Returns: (job, created) where created is False for a merged submission
+        """
+        with self._lock, self._shared_lock():
+            active = self.active_job()
+            if active is not None:
+                logging.info(f"Training job {active.job_id} already in flight, merging submission")
+                return active, False
+
+            job = TrainingJob(job_id=uuid.uuid4().hex)
+            self._jobs[job.job_id] = job
+            self._active_job_id = job.job_id
+            self._trim_history()
+            self._save(job)
+
+            events = self._context.Queue()
+            process = self._context.Process(
+                target=self.target, args=(job.job_id, events), name=f"training-{job.job_id[:8]}"
+            )
+            process.start()
+            threading.Thread(
+                target=self._monitor, args=(job, process, events), name="training-monitor", daemon=True
+            ).start()
+
+        logging.info(f"Submitted training job {job.job_id} (pid {process.pid})")
+        return job, True
+
+    def get(self, job_id: str) -> Optional[TrainingJob]:
+        job = self._jobs.get(job_id)
+        if job is None and self.state_dir and job_id.isalnum():
+            job = self._load(os.path.join(self.state_dir, f"{job_id}.json"))
+        return job
+
+    def active_job(self) -> Optional[TrainingJob]:
+        job = self._jobs.get(self._active_job_id) if self._active_job_id else None
+        if job is not None and job.is_active:
+            return job
+        if self.state_dir:
+            for path in glob.glob(os.path.join(self.state_dir, "*.json")):
+                job = self._load(path)
+                if job is not None and job.is_active:
+                    return job
+        return None
+
+    def _trim_history(self) -> None:
+        while len(self._jobs) > self.history_size:
+            oldest_id, oldest = next(iter(self._jobs.items()))
+            if oldest.is_active:
+                break
+            del self._jobs[oldest_id]
+
+        if self.state_dir:
+            paths = sorted(glob.glob(os.path.join(self.state_dir, "*.json")), key=os.path.getmtime)
+            for path in paths[:max(0, len(paths) - self.history_size)]:
+                job = self._load(path)
+                if job is None or not job.is_active:
+                    os.remove(path)
+
+    @contextmanager
+    def _shared_lock(self):
+        """
+        Serializes submissions across the app workers sharing `state_dir`.
+        """
+        if not self.state_dir:
+            yield
+            return
+
+        import fcntl
+
+        with open(os.path.join(self.state_dir, ".lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _save(self, job: TrainingJob) -> None:
+        if not self.state_dir:
+            return
+        path = os.path.join(self.state_dir, f"{job.job_id}.json")
+        state = dict(job.to_dict(include_result=True), owner_pid=os.getpid())
+        try:
+            # Written whole and renamed so readers in other workers never see a partial file
+            with open(f"{path}.{os.getpid()}.tmp", "w") as file:
+                json.dump(state, file, default=str)
+            os.replace(f"{path}.{os.getpid()}.tmp", path)
+        except OSError as e:
+            logging.warning(f"Could not share the state of training job {job.job_id}: {str(e)}")
+
+    def _load(self, path: str) -> Optional[TrainingJob]:
+        try:
+            with open(path) as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        owner_pid = state.pop("owner_pid", None)
+        job = TrainingJob(**{item.name: state[item.name] for item in fields(TrainingJob) if item.name in state})
+        if job.is_active and owner_pid != os.getpid() and not process_is_alive(owner_pid):
+            job.status = "failed"
+            job.error = f"App worker {owner_pid} running the job exited"
+        return job
+
+    def _monitor(self, job: TrainingJob, process, events) -> None:
+        """
+        Applies worker events to the job record until the worker reports an outcome or dies.
+        """
+        while job.is_active:
+            try:
+                _, kind, payload = events.get(timeout=1)
+            except queue.Empty:
+                if not process.is_alive():
+                    self._finish(job, "failed", error=f"Training process exited with code {process.exitcode}")
+                continue
+
+            if kind == "running":
+                job.status = "running"
+                job.started_at = str(datetime.now())
+                self._save(job)
+            elif kind == "stage":
+                stage, state = payload
+                job.stages[stage] = state
+                self._save(job)
+            elif kind == "succeeded":
+                self._finish(job, "succeeded", result=payload)
+            elif kind == "failed":
+                self._finish(job, "failed", error=payload)
+
+        process.join()
+        events.close()
+
+    def _finish(self, job: TrainingJob, status: str, result: Optional[dict] = None, error: Optional[str] = None) -> None:
+        for stage, state in job.stages.items():
+            if state == "started":
+                job.stages[stage] = "failed"
+        job.result = result
+        job.error = error
+        job.finished_at = str(datetime.now())
+        job.status = status
+        self._save(job)
+        logging.info(f"Training job {job.job_id} {status}" + (f": {error}" if error else ""))
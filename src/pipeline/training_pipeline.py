@@ -1,4 +1,6 @@
 import sys
+from typing import Callable, Optional
+
 from src.exception import MyException
 from src.logger import logging
 
@@ -35,6 +37,14 @@ class TrainPipeline:
         self.model_evaluation_config = ModelEvaluationConfig()
         self.model_pusher_config = ModelPusherConfig()
 
+        # Artifacts of the last run, filled in stage by stage
+        self.data_ingestion_artifact: Optional[DataIngestionArtifact] = None
+        self.data_validation_artifact: Optional[DataValidationArtifact] = None
+        self.data_transformation_artifact: Optional[DataTransformationArtifact] = None
+        self.model_trainer_artifact: Optional[ModelTrainerArtifact] = None
+        self.model_evaluation_artifact: Optional[ModelEvaluationArtifact] = None
+        self.model_pusher_artifact: Optional[ModelPusherArtifact] = None
+
     def start_data_ingestion(self) -> DataIngestionArtifact:
         """
         This method of TrainPipeline class is responsible for starting data ingestion component
@@ -147,29 +157,52 @@ class TrainPipeline:
             raise MyException(e, sys)
 
     def run_pipeline(
-        self,
+        self, progress_callback: Optional[Callable[[str, str], None]] = None
     ) -> None:
         """
         This method of TrainPipeline class is responsible for running complete pipeline
+        :param progress_callback: optional callable(stage, state) told when each stage starts and completes
         """
+        def report(stage: str, state: str) -> None:
+            if progress_callback is not None:
+                progress_callback(stage, state)
+
         try:
-            data_ingestion_artifact = self.start_data_ingestion()
-            data_validation_artifact = self.start_data_validation(
-                data_ingestion_artifact=data_ingestion_artifact
+            report("data_ingestion", "started")
+            self.data_ingestion_artifact = self.start_data_ingestion()
+            report("data_ingestion", "completed")
+
+            report("data_validation", "started")
+            self.data_validation_artifact = self.start_data_validation(
+                data_ingestion_artifact=self.data_ingestion_artifact
             )
-            data_transformation_artifact = self.start_data_transformation(
-                data_ingestion_artifact=data_ingestion_artifact,
-                data_validation_artifact=data_validation_artifact,
+            report("data_validation", "completed")
+
+            report("data_transformation", "started")
+            self.data_transformation_artifact = self.start_data_transformation(
+                data_ingestion_artifact=self.data_ingestion_artifact,
+                data_validation_artifact=self.data_validation_artifact,
             )
-            model_trainer_artifact = self.start_model_trainer(
-                data_transformation_artifact=data_transformation_artifact
+            report("data_transformation", "completed")
+
+            report("model_trainer", "started")
+            self.model_trainer_artifact = self.start_model_trainer(
+                data_transformation_artifact=self.data_transformation_artifact
             )
-            model_evaluation_artifact = self.start_model_evaluation(data_ingestion_artifact=data_ingestion_artifact,
-                                                                    model_trainer_artifact=model_trainer_artifact)
-            if not model_evaluation_artifact.is_model_accepted:
+            report("model_trainer", "completed")
+
+            report("model_evaluation", "started")
+            self.model_evaluation_artifact = self.start_model_evaluation(data_ingestion_artifact=self.data_ingestion_artifact,
+                                                                         model_trainer_artifact=self.model_trainer_artifact)
+            report("model_evaluation", "completed")
+            if not self.model_evaluation_artifact.is_model_accepted:
                 logging.info(f"Model not accepted.")
+                report("model_pusher", "skipped")
                 return None
-            model_pusher_artifact = self.start_model_pusher(model_evaluation_artifact=model_evaluation_artifact)
+
+            report("model_pusher", "started")
+            self.model_pusher_artifact = self.start_model_pusher(model_evaluation_artifact=self.model_evaluation_artifact)
+            report("model_pusher", "completed")
 
         except Exception as e:
             raise MyException(e, sys)
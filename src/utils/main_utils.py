@@ -3,8 +3,8 @@ import sys
 import numpy as np
 import dill
 import yaml
-from pandas import DataFrame
 
+from src.constants import DATA_INGESTION_PARQUET_COMPRESSION
 from src.exception import MyException
 from src.logger import logging
 
@@ -71,6 +71,104 @@ def load_numpy_array_data(file_path: str) -> np.array:
         raise MyException(e, sys) from e
 
 
+def _sort_categories(dataframe):
+    # Categories keep the order values were first seen in; sorting them makes one-hot
+    # encoding drop the same level it drops for plain string columns
+    for column in dataframe.columns:
+        if dataframe[column].dtype.name == "category":
+            dataframe[column] = dataframe[column].cat.reorder_categories(sorted(dataframe[column].cat.categories))
+    return dataframe
+
+
+def write_dataframe(file_path: str, dataframe, compression: str = DATA_INGESTION_PARQUET_COMPRESSION) -> None:
+    """
+    Save a DataFrame with its dtypes as compressed Parquet, or as CSV when file_path ends with .csv
+    file_path: str location of file to save
+    dataframe: pd.DataFrame data to save
+    compression: Parquet codec (zstd, snappy, gzip, none)
+    """
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        if file_path.endswith(".csv"):
+            dataframe.to_csv(file_path, index=False, header=True)
+            return
+        dataframe = _sort_categories(dataframe.copy(deep=False))
+        dataframe.to_parquet(file_path, engine="pyarrow", compression=compression, index=False)
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def read_dataframe(file_path: str, columns: list = None, dtypes: dict = None):
+    """
+    Load a DataFrame written by write_dataframe
+    file_path: str location of file to load
+    columns: list of columns to read, all columns when None; Parquet skips the others on disk
+    dtypes: {column: compact dtype name} to convert the loaded columns to, see apply_compact_dtypes
+    return: pd.DataFrame
+    """
+    try:
+        import pandas as pd
+
+        if file_path.endswith(".csv"):
+            dataframe = pd.read_csv(file_path, usecols=columns)
+        else:
+            dataframe = pd.read_parquet(file_path, engine="pyarrow", columns=columns)
+        if dtypes:
+            from src.data_access.columnar import apply_compact_dtypes
+
+            apply_compact_dtypes(dataframe, dtypes)
+        return dataframe
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def read_dataframe_schema(file_path: str, dtypes: dict = None):
+    """
+    Returns an empty DataFrame with the columns and dtypes of the file, without reading its rows
+    file_path: str location of file to inspect
+    dtypes: {column: compact dtype name} to convert the columns to, see apply_compact_dtypes
+    return: pd.DataFrame with no rows
+    """
+    try:
+        import pandas as pd
+
+        if file_path.endswith(".csv"):
+            dataframe = pd.read_csv(file_path, nrows=0)
+        else:
+            import pyarrow.parquet as pq
+
+            dataframe = pq.read_schema(file_path).empty_table().to_pandas()
+        if dtypes:
+            from src.data_access.columnar import apply_compact_dtypes
+
+            apply_compact_dtypes(dataframe, dtypes)
+        return dataframe
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
+def log_memory_usage(stage: str, **frames) -> dict:
+    """
+    Logs the in-memory size of each DataFrame of a pipeline stage, in total and per column
+    stage: str name of the stage, used in the log line
+    frames: DataFrames by name
+    return: {frame name: {"total_bytes": int, "columns": {column: bytes}}}
+    """
+    try:
+        report = {}
+        for name, dataframe in frames.items():
+            usage = dataframe.memory_usage(deep=True, index=False)
+            report[name] = {"total_bytes": int(usage.sum()),
+                            "columns": {column: int(size) for column, size in usage.items()}}
+            largest = ", ".join(f"{column}={size / 2 ** 20:.1f}MB"
+                                for column, size in usage.sort_values(ascending=False).head(5).items())
+            logging.info(f"[{stage}] {name}: {len(dataframe)} rows, {usage.sum() / 2 ** 20:.1f}MB in memory "
+                         f"(largest: {largest})")
+        return report
+    except Exception as e:
+        raise MyException(e, sys) from e
+
+
 def save_object(file_path: str, obj: object) -> None:
     logging.info("Entered the save_object method of utils")
 
@@ -85,6 +183,21 @@ def save_object(file_path: str, obj: object) -> None:
         raise MyException(e, sys) from e
 
 
+def process_is_alive(pid: int) -> bool:
+    """
+    Returns: True if a process with the given pid exists (it may belong to another user)
+    """
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
 # def drop_columns(df: DataFrame, cols: list)-> DataFrame:
 
 #     """
@@ -0,0 +1,224 @@
+"""
+In-process Prometheus metrics for the serving path, exposed by the app at /metrics.
+
+With PROMETHEUS_MULTIPROC_DIR set (before this module is first imported), every process
+writes its samples to files in that directory and /metrics sums them, so a scrape of any
+pre-forked worker reports the whole server.
+"""
+
+import glob
+import os
+import threading
+from contextlib import nullcontext
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from src.constants import PROMETHEUS_MULTIPROC_DIR
+from src.logger import get_logging_stats
+from src.utils.main_utils import process_is_alive
+
+if PROMETHEUS_MULTIPROC_DIR:
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+# Prediction stages timed by PREDICTION_STAGE_SECONDS
+PREDICTION_STAGES = (
+    "form_parsing",
+    "validation",
+    "dataframe",
+    "feature_array",
+    "transform",
+    "forest_predict",
+    "template_render",
+)
+
+# Sub-millisecond buckets: most stages of a single prediction take microseconds
+STAGE_LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+PREDICTION_STAGE_SECONDS = Histogram(
+    "prediction_stage_seconds",
+    "Latency of each stage of the prediction path in seconds",
+    ["stage"],
+    buckets=STAGE_LATENCY_BUCKETS,
+)
+MODEL_LOADS_TOTAL = Counter(
+    "model_loads_total",
+    "Models swapped into serving, by the source they were loaded from",
+    ["source"],
+)
+PREDICTION_CACHE_LOOKUPS_TOTAL = Counter(
+    "prediction_cache_lookups_total",
+    "Prediction cache lookups by result",
+    ["result"],
+)
+SHADOW_MODEL_SECONDS = Histogram(
+    "shadow_model_seconds",
+    "Model call latency of shadow-scored requests, for the production and the candidate model",
+    ["model"],
+    buckets=STAGE_LATENCY_BUCKETS,
+)
+SHADOW_PREDICTIONS_TOTAL = Counter(
+    "shadow_predictions_total",
+    "Shadow-scored records by whether the candidate agreed with the served prediction",
+    ["result"],
+)
+SHADOW_REQUESTS_TOTAL = Counter(
+    "shadow_requests_total",
+    "Sampled requests by shadow scoring outcome",
+    ["outcome"],
+)
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight_requests",
+    "Requests currently running per admission-controlled route",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "admission_queued_requests",
+    "Requests waiting for a slot per admission-controlled route",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_REJECTIONS_TOTAL = Counter(
+    "admission_rejections_total",
+    "Requests rejected with 503 by admission control",
+    ["route", "reason"],
+)
+
+
+class LoggingStatsCollector:
+    """
+    Exports the log queue counters of src.logger at scrape time, so the logging hot path
+    only bumps plain integers. Every process has its own log queue; in multiprocess mode
+    the series carry the pid of the worker answering the scrape.
+    """
+
+    def __init__(self, label_pid: bool = False):
+        self.label_pid = label_pid
+
+    def collect(self):
+        stats = get_logging_stats()
+        if not stats:
+            return
+        labels = {"pid": str(os.getpid())} if self.label_pid else {}
+        families = (
+            (GaugeMetricFamily, "log_queue_records", "Log records waiting for the writer thread", "queued"),
+            (GaugeMetricFamily, "log_queue_capacity", "Maximum number of queued log records", "queue_size"),
+            (CounterMetricFamily, "log_records_dropped", "Log records dropped because the queue was full", "dropped"),
+            (CounterMetricFamily, "log_records_rate_limited",
+             "Log records suppressed by the per call site rate limit", "rate_limited"),
+            (CounterMetricFamily, "log_records_sampled", "Log records over the rate limit kept by sampling", "sampled"),
+        )
+        for family_type, name, documentation, key in families:
+            family = family_type(name, documentation, labels=list(labels))
+            family.add_metric(list(labels.values()), stats[key])
+            yield family
+
+
+if PROMETHEUS_MULTIPROC_DIR:
+    # The default registry only holds this process's values; scrapes read every process's files instead
+    _SCRAPE_REGISTRY = CollectorRegistry()
+    multiprocess.MultiProcessCollector(_SCRAPE_REGISTRY, path=PROMETHEUS_MULTIPROC_DIR)
+    _SCRAPE_REGISTRY.register(LoggingStatsCollector(label_pid=True))
+else:
+    _SCRAPE_REGISTRY = REGISTRY
+    REGISTRY.register(LoggingStatsCollector())
+
+# Label children resolved once so timing a stage is a dict lookup
+_STAGE_HISTOGRAMS = {stage: PREDICTION_STAGE_SECONDS.labels(stage=stage) for stage in PREDICTION_STAGES}
+_CACHE_HITS = PREDICTION_CACHE_LOOKUPS_TOTAL.labels(result="hit")
+_CACHE_MISSES = PREDICTION_CACHE_LOOKUPS_TOTAL.labels(result="miss")
+
+# Threads doing work off the request path (e.g. shadow scoring) opt out of the stage histograms
+_thread_state = threading.local()
+
+
+def disable_stage_timing() -> None:
+    """
+    Stops time_stage from recording in the calling thread.
+    """
+    _thread_state.disabled = True
+
+
+def time_stage(stage: str):
+    """
+    Context manager that records the duration of the block under the given stage.
+    Usage:
+        with time_stage("transform"):
+            ...
+    """
+    histogram = _STAGE_HISTOGRAMS[stage]
+    if getattr(_thread_state, "disabled", False):
+        return nullcontext()
+    return histogram.time()
+
+
+def record_model_load(source: str) -> None:
+    MODEL_LOADS_TOTAL.labels(source=source).inc()
+
+
+def record_cache_lookup(hit: bool) -> None:
+    (_CACHE_HITS if hit else _CACHE_MISSES).inc()
+
+
+def record_shadow_result(production_seconds: float, candidate_seconds: float, agreed: int, disagreed: int) -> None:
+    SHADOW_MODEL_SECONDS.labels(model="production").observe(production_seconds)
+    SHADOW_MODEL_SECONDS.labels(model="candidate").observe(candidate_seconds)
+    SHADOW_PREDICTIONS_TOTAL.labels(result="agree").inc(agreed)
+    SHADOW_PREDICTIONS_TOTAL.labels(result="disagree").inc(disagreed)
+
+
+def record_shadow_request(outcome: str) -> None:
+    SHADOW_REQUESTS_TOTAL.labels(outcome=outcome).inc()
+
+
+def admission_gauges(route: str) -> tuple:
+    """
+    Returns: (in-flight gauge, queued gauge) of an admission-controlled route, summed over live workers
+    """
+    return ADMISSION_IN_FLIGHT.labels(route=route), ADMISSION_QUEUE_DEPTH.labels(route=route)
+
+
+def record_admission_rejection(route: str, reason: str) -> None:
+    ADMISSION_REJECTIONS_TOTAL.labels(route=route, reason=reason).inc()
+
+
+def render_metrics() -> tuple:
+    """
+    Returns: (payload, content type) in the Prometheus text exposition format
+    """
+    return generate_latest(_SCRAPE_REGISTRY), CONTENT_TYPE_LATEST
+
+
+def clear_stale_metric_files() -> None:
+    """
+    Removes the multiprocess sample files left by processes that are no longer running,
+    e.g. by the workers of a previous server. Called once when the server starts.
+    """
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return
+    for path in glob.glob(os.path.join(PROMETHEUS_MULTIPROC_DIR, "*.db")):
+        pid = os.path.basename(path)[:-len(".db")].rsplit("_", 1)[-1]
+        if pid.isdigit() and not process_is_alive(int(pid)):
+            os.remove(path)
+
+
+def mark_worker_dead(pid: int) -> None:
+    """
+    Drops the live gauges (in-flight and queued requests) of an exited worker; its counters are kept.
+    """
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid, path=PROMETHEUS_MULTIPROC_DIR)
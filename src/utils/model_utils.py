@@ -12,7 +12,9 @@ from src.entity.estimator import MyModel
 def ensure_production_model_exists():
     """
     Ensures that a production model exists for prediction.
-    If no model is found, creates a dummy model.
+    If no model is found, creates a dummy model. The dummy is not fitted: predictions with it
+    fail, so the warm-up never completes and /ready (the Docker HEALTHCHECK) stays 503 until a
+    trained model is available in S3 or at artifact/production_model/model.pkl.
     """
     # Define the path to the production model
     production_model_dir = os.path.join(ARTIFACT_DIR, "production_model")
@@ -43,6 +45,9 @@ def ensure_production_model_exists():
             pickle.dump(my_model, f)
         
         logging.info(f"Dummy model created and saved at: {production_model_path}")
+        logging.error("The dummy model is not fitted and cannot predict: the app will report unready "
+                      "(/ready 503, container unhealthy) until a trained model is pushed to S3 or "
+                      "written to the production model path, e.g. by running a training job (GET /train)")
         return False
     
     logging.info(f"Production model found at: {production_model_path}")
@@ -0,0 +1,96 @@
+"""
+Synthetic vehicle records and a model fitted on them, shared by the warm-up traffic,
+the test fixtures and the benchmark scripts so they all exercise the same data layout.
+pandas and sklearn are only imported by the helpers that need them.
+"""
+
+from typing import TYPE_CHECKING, List
+
+import numpy as np
+
+from src.constants import (
+    MIN_SAMPLES_SPLIT_CRITERION,
+    MIN_SAMPLES_SPLIT_MAX_DEPTH,
+    MIN_SAMPLES_SPLIT_RANDOM_STATE,
+    MODEL_TRAINER_MIN_SAMPLES_LEAF,
+    MODEL_TRAINER_MIN_SAMPLES_SPLIT,
+    MODEL_TRAINER_N_ESTIMATORS,
+)
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+    from src.entity.estimator import MyModel
+
+
+def synthetic_vehicle_records(count: int, seed: int = 0) -> List[dict]:
+    """
+    Plausible prediction records keyed by the schema.yaml prediction columns.
+    """
+    rng = np.random.default_rng(seed)
+    records = []
+    for _ in range(count):
+        vehicle_age = int(rng.integers(0, 3))  # < 1 year, 1-2 years, > 2 years
+        records.append({
+            "Gender": int(rng.integers(0, 2)),
+            "Age": int(rng.integers(20, 80)),
+            "Driving_License": int(rng.random() < 0.98),
+            "Region_Code": float(rng.integers(0, 50)),
+            "Previously_Insured": int(rng.integers(0, 2)),
+            "Annual_Premium": float(rng.integers(2000, 60000)),
+            "Policy_Sales_Channel": float(rng.integers(1, 160)),
+            "Vintage": int(rng.integers(10, 300)),
+            "Vehicle_Age_lt_1_Year": int(vehicle_age == 0),
+            "Vehicle_Age_gt_2_Years": int(vehicle_age == 2),
+            "Vehicle_Damage_Yes": int(rng.integers(0, 2)),
+        })
+    return records
+
+
+def synthetic_vehicle_frame(count: int, seed: int = 0) -> "DataFrame":
+    """
+    Model input frame (id column first, then the features) built from synthetic_vehicle_records.
+    """
+    from pandas import DataFrame
+
+    return DataFrame({"id": np.arange(count), **DataFrame(synthetic_vehicle_records(count, seed=seed))})
+
+
+def synthetic_vehicle_model(n_rows: int = 5000,
+                            n_estimators: int = MODEL_TRAINER_N_ESTIMATORS,
+                            max_depth: int = MIN_SAMPLES_SPLIT_MAX_DEPTH,
+                            seed: int = 11) -> "MyModel":
+    """
+    Fits a MyModel with the DataTransformation preprocessing layout and the model trainer's
+    forest settings. The target mixes several features with noise, so the trees grow to a
+    realistic depth instead of stopping at a few pure splits.
+    """
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+    from src.entity.estimator import MyModel
+
+    features = synthetic_vehicle_frame(n_rows, seed=seed)
+    noise = np.random.default_rng(seed).normal(scale=0.8, size=n_rows)
+    score = (1.5 * features["Vehicle_Damage_Yes"] - 1.2 * features["Previously_Insured"]
+             - 0.03 * (features["Age"] - 45).abs() + 0.5 * features["Vehicle_Age_gt_2_Years"] + noise)
+    target = (score > 0).astype(int)
+
+    preprocessor = Pipeline(steps=[("Preprocessor", ColumnTransformer(
+        transformers=[
+            ("StandardScaler", StandardScaler(), ["Age", "Vintage"]),
+            ("MinMaxScaler", MinMaxScaler(), ["Annual_Premium"]),
+        ],
+        remainder="passthrough",
+    ))])
+    forest = RandomForestClassifier(
+        n_estimators=n_estimators,
+        min_samples_split=MODEL_TRAINER_MIN_SAMPLES_SPLIT,
+        min_samples_leaf=MODEL_TRAINER_MIN_SAMPLES_LEAF,
+        max_depth=max_depth,
+        criterion=MIN_SAMPLES_SPLIT_CRITERION,
+        random_state=MIN_SAMPLES_SPLIT_RANDOM_STATE,
+    ).fit(preprocessor.fit_transform(features), target)
+    return MyModel(preprocessing_object=preprocessor, trained_model_object=forest)
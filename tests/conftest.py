@@ -59,3 +59,19 @@ def reports_dir():
     path = Path("tests/reports")
     path.mkdir(parents=True, exist_ok=True)
     return path
+
+@pytest.fixture(scope="session")
+def trained_model():
+    """Create a small fitted MyModel with the same preprocessing layout as DataTransformation"""
+    from src.utils.synthetic_data import synthetic_vehicle_model
+
+    return synthetic_vehicle_model(n_rows=300, n_estimators=10, max_depth=6, seed=42)
+
+@pytest.fixture(scope="session")
+def model_features():
+    """Create a DataFrame of model input features for prediction tests"""
+    from src.utils.synthetic_data import synthetic_vehicle_frame
+
+    features = synthetic_vehicle_frame(50, seed=7)
+    features['id'] = 0
+    return features
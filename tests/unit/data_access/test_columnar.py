@@ -0,0 +1,192 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.data_access import columnar
+from src.data_access.columnar import (
+    ColumnarFrameBuilder,
+    apply_compact_dtypes,
+    compute_split_points,
+    export_collection_columnar,
+    partition_queries,
+    read_schema_column_types,
+    read_schema_compact_dtypes,
+)
+
+COLUMN_TYPES = {"id": "int", "Gender": "category", "Age": "int", "Annual_Premium": "float", "Missing": "int"}
+
+
+def make_documents(count, start=0):
+    return [{"_id": index, "id": index, "Gender": "Male" if index % 3 else "Female", "Age": 20 + index % 50,
+             "Annual_Premium": 1000.0 + index, "Extra": "x" * 10} for index in range(start, start + count)]
+
+
+class TestColumnar:
+    """Test class for the streaming columnar Mongo export"""
+
+    def test_schema_column_types(self):
+        """Test that the export columns come from schema.yaml in order"""
+        column_types = read_schema_column_types()
+        assert list(column_types)[:3] == ["id", "Gender", "Age"]
+        assert column_types["Gender"] == "category"
+
+    def test_builder_types_columns_across_chunks(self):
+        """Test that chunks accumulate into typed columns and absent fields are left out"""
+        builder = ColumnarFrameBuilder(COLUMN_TYPES, capacity=2)
+        builder.append_documents(make_documents(3))
+        builder.append_documents(make_documents(4, start=3))
+
+        df = builder.to_dataframe()
+
+        assert list(df.columns) == ["id", "Gender", "Age", "Annual_Premium"]
+        assert df["id"].tolist() == list(range(7))
+        assert df["id"].dtype == np.int64
+        assert df["Annual_Premium"].dtype == np.float64
+        assert isinstance(df["Gender"].dtype, pd.CategoricalDtype)
+        assert df["Gender"].tolist() == ["Female", "Male", "Male", "Female", "Male", "Male", "Female"]
+
+    def test_missing_values(self):
+        """Test that 'na' and None become NaN and an int column with gaps turns float"""
+        builder = ColumnarFrameBuilder({"Age": "int", "Gender": "category", "Premium": "float"})
+        builder.append_documents([{"Age": 30, "Gender": "Male", "Premium": "na"}])
+        builder.append_documents([{"Age": "na", "Gender": None, "Premium": "12.5"}, {"Age": "41", "Gender": "na"}])
+
+        df = builder.to_dataframe()
+
+        assert df["Age"].dtype == np.float64
+        assert df["Age"].tolist()[0] == 30 and np.isnan(df["Age"][1]) and df["Age"][2] == 41
+        assert df["Gender"].isna().tolist() == [False, True, True]
+        assert np.isnan(df["Premium"][0]) and df["Premium"][1] == 12.5
+
+    def test_fractional_values_keep_int_column_exact(self):
+        """Test that fractional values turn an int column float instead of being truncated"""
+        builder = ColumnarFrameBuilder({"Age": "int", "Vintage": "int", "Region": "int"})
+        builder.append_documents([{"Age": 30, "Vintage": 10.0, "Region": "28"}, {"Age": 41, "Vintage": 12.0, "Region": 3}])
+        builder.append_documents([{"Age": 1.5, "Vintage": 11.0, "Region": "2.5"}])
+
+        df = builder.to_dataframe()
+
+        assert df["Age"].dtype == np.float64 and df["Age"].tolist() == [30.0, 41.0, 1.5]
+        assert df["Vintage"].dtype == np.int64 and df["Vintage"].tolist() == [10, 12, 11]
+        assert df["Region"].dtype == np.float64 and df["Region"].tolist() == [28.0, 3.0, 2.5]
+
+    def test_export_streams_whole_collection(self):
+        """Test that the export is not capped and only requests the schema columns"""
+        mongomock = pytest.importorskip("mongomock")
+        collection = mongomock.MongoClient()["vehicle"]["Insurance-Data"]
+        collection.insert_many(make_documents(2500))
+
+        df = export_collection_columnar(collection, COLUMN_TYPES, batch_size=300, partitions=1)
+
+        assert len(df) == 2500
+        assert "_id" not in df.columns and "Extra" not in df.columns
+        assert df["Age"].dtype == np.int64
+
+        limited = export_collection_columnar(collection, COLUMN_TYPES, batch_size=300, limit=1000)
+        assert len(limited) == 1000
+
+    def test_partition_queries_cover_every_document(self):
+        """Test that the ranges plus the missing-key query split the collection exactly"""
+        mongomock = pytest.importorskip("mongomock")
+        collection = mongomock.MongoClient()["vehicle"]["Insurance-Data"]
+        collection.insert_many(make_documents(400) + [{"Gender": "Male", "Age": 30, "Annual_Premium": 1.0}])
+
+        for method in ("sample", "minmax"):
+            split_points = compute_split_points(collection, "id", 4, method=method, sample_size=200)
+            assert len(split_points) == 3 and split_points == sorted(split_points)
+            counts = [collection.count_documents(query) for query in partition_queries("id", split_points)]
+            assert sum(counts) == 401
+            assert counts[-1] == 1
+            assert min(counts[:-1]) > 50
+
+    def test_partitioned_export_matches_single_cursor(self):
+        """Test that merging the per-range buffers gives the same frame as one cursor"""
+        mongomock = pytest.importorskip("mongomock")
+        collection = mongomock.MongoClient()["vehicle"]["Insurance-Data"]
+        documents = make_documents(600)
+        documents[10]["Age"] = "na"
+        collection.insert_many(documents)
+
+        single = export_collection_columnar(collection, COLUMN_TYPES, batch_size=100, partitions=1)
+        partitioned = export_collection_columnar(collection, COLUMN_TYPES, batch_size=100, partitions=3)
+
+        partitioned = partitioned.sort_values("id").reset_index(drop=True)
+        pd.testing.assert_frame_equal(single, partitioned, check_categorical=False)
+        assert partitioned["Age"].dtype == np.float64
+
+    def test_filtered_export_still_splits_across_ranges(self, monkeypatch):
+        """Test that split points follow the query, so a watermark export stays parallel"""
+        mongomock = pytest.importorskip("mongomock")
+        collection = mongomock.MongoClient()["vehicle"]["Insurance-Data"]
+        collection.insert_many(make_documents(800))
+        query = {"id": {"$gt": 600}}
+
+        for method in ("sample", "minmax"):
+            split_points = compute_split_points(collection, "id", 4, method=method, query=query)
+            assert len(split_points) == 3 and min(split_points) > 600
+
+        range_rows = []
+        read_into_builder = columnar._read_into_builder
+
+        def counting_read(*args, **kwargs):
+            builder = read_into_builder(*args, **kwargs)
+            range_rows.append(builder.rows)
+            return builder
+
+        monkeypatch.setattr(columnar, "_read_into_builder", counting_read)
+        exported = export_collection_columnar(collection, COLUMN_TYPES, query=query, batch_size=50, partitions=4)
+
+        assert sorted(exported["id"]) == list(range(601, 800))
+        # Four non-empty ranges plus the (empty) missing-key query, in completion order
+        range_rows.sort()
+        assert len(range_rows) == 5 and range_rows[0] == 0
+        assert min(range_rows[1:]) > 20
+
+    def test_compact_dtypes_follow_schema(self):
+        """Test that the schema's compact dtypes cover every column and shrink the frame"""
+        compact_dtypes = read_schema_compact_dtypes()
+        assert list(compact_dtypes) == list(read_schema_column_types())
+
+        builder = ColumnarFrameBuilder(read_schema_column_types(), capacity=8)
+        builder.append_documents([{"id": index, "Gender": "Male", "Age": 30 + index, "Driving_License": 1,
+                                   "Region_Code": 28.0, "Previously_Insured": 0, "Vehicle_Age": "1-2 Year",
+                                   "Vehicle_Damage": "Yes", "Annual_Premium": 40454.0, "Policy_Sales_Channel": 26.0,
+                                   "Vintage": 217, "Response": 1} for index in range(8)])
+        dataframe = builder.to_dataframe()
+        before = dataframe.memory_usage(deep=True).sum()
+
+        apply_compact_dtypes(dataframe)
+
+        assert dataframe["Age"].dtype == np.int16
+        assert dataframe["Response"].dtype == np.int8
+        assert dataframe["Annual_Premium"].dtype == np.float64
+        assert dataframe["Region_Code"].dtype == np.float32
+        assert dataframe["Gender"].dtype.name == "category"
+        assert dataframe.memory_usage(deep=True).sum() < before
+
+    def test_compact_dtypes_keep_values_that_do_not_fit(self):
+        """Test that out-of-range, fractional and missing values are never corrupted"""
+        dataframe = pd.DataFrame({
+            "Wide": np.array([1, 300], dtype=np.int64),
+            "Fraction": [1.5, 2.0],
+            "Missing": [1.0, np.nan],
+            "Text": ["Yes", "No"],
+            "Premium": [40454.37, 2630.0],
+            "Code": [28.0, np.nan],
+        })
+
+        apply_compact_dtypes(dataframe, {"Wide": "int8", "Fraction": "int8", "Missing": "int8", "Text": "category",
+                                         "Premium": "float32", "Code": "float32"})
+
+        assert dataframe["Wide"].dtype == np.int64 and list(dataframe["Wide"]) == [1, 300]
+        assert dataframe["Fraction"].dtype == np.float64
+        assert dataframe["Missing"].dtype == np.float32 and dataframe["Missing"].isna().sum() == 1
+        assert list(dataframe["Text"].cat.categories) == ["No", "Yes"]
+        # float32 would round the premium that serving sends as float64
+        assert dataframe["Premium"].dtype == np.float64 and dataframe["Premium"][0] == 40454.37
+        assert dataframe["Code"].dtype == np.float32
@@ -0,0 +1,81 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.data_access.feature_store_cache import FeatureStoreCache, concat_typed
+
+COLUMN_TYPES = {"id": "int", "Gender": "category", "Age": "int", "Annual_Premium": "float"}
+
+
+def make_documents(count, start=0, gender="Male"):
+    return [{"id": index, "Gender": gender, "Age": 20 + index % 50, "Annual_Premium": 1000.0 + index}
+            for index in range(start, start + count)]
+
+
+@pytest.fixture
+def collection():
+    mongomock = pytest.importorskip("mongomock")
+    return mongomock.MongoClient()["vehicle"]["Insurance-Data"]
+
+
+class TestFeatureStoreCache:
+    """Test class for the incremental watermark-based feature store cache"""
+
+    def test_only_new_documents_are_fetched(self, tmp_path, collection):
+        """Test that a second run appends only the documents past the watermark"""
+        collection.insert_many(make_documents(300))
+        cache = FeatureStoreCache(str(tmp_path / "cache"), column_types=COLUMN_TYPES)
+        assert cache.update(collection, partitions=1) == 300
+        assert cache.watermark == 299
+
+        collection.insert_many(make_documents(50, start=300, gender="Female"))
+        reopened = FeatureStoreCache(str(tmp_path / "cache"), column_types=COLUMN_TYPES)
+        assert reopened.watermark == 299
+        assert reopened.update(collection, partitions=1) == 50
+        assert reopened.update(collection, partitions=1) == 0
+
+        df = reopened.load()
+        assert df["id"].tolist() == list(range(350))
+        assert isinstance(df["Gender"].dtype, pd.CategoricalDtype)
+        assert set(df["Gender"].cat.categories) == {"Male", "Female"}
+        assert df["Age"].dtype == np.int64
+        assert reopened.rows == 350
+
+    def test_schema_change_discards_the_store(self, tmp_path, collection):
+        """Test that rows cached for other columns are not reused"""
+        collection.insert_many(make_documents(20))
+        FeatureStoreCache(str(tmp_path / "cache"), column_types=COLUMN_TYPES).update(collection, partitions=1)
+
+        changed = FeatureStoreCache(str(tmp_path / "cache"), column_types={"id": "int", "Age": "int"})
+
+        assert changed.watermark is None
+        assert changed.update(collection, partitions=1) == 20
+        assert list(changed.load().columns) == ["id", "Age"]
+
+    def test_compaction_keeps_every_row(self, tmp_path, collection):
+        """Test that partitions are merged once there are too many"""
+        cache = FeatureStoreCache(str(tmp_path / "cache"), column_types=COLUMN_TYPES, compact_after=2)
+        for start in range(0, 40, 10):
+            collection.insert_many(make_documents(10, start=start))
+            cache.update(collection, partitions=1)
+
+        assert len(cache.state["partitions"]) <= 2
+        assert cache.load()["id"].tolist() == list(range(40))
+        parquet_files = [name for name in os.listdir(tmp_path / "cache") if name.endswith(".parquet")]
+        assert len(parquet_files) == len(cache.state["partitions"])
+
+    def test_concat_typed_unions_categories(self):
+        """Test that frames with different categories stay categorical"""
+        first = pd.DataFrame({"Gender": pd.Categorical(["Male"]), "Age": [30]})
+        second = pd.DataFrame({"Gender": pd.Categorical(["Female"]), "Age": [40]})
+
+        df = concat_typed([first, second])
+
+        assert isinstance(df["Gender"].dtype, pd.CategoricalDtype)
+        assert df["Gender"].tolist() == ["Male", "Female"]
+        assert df["Age"].tolist() == [30, 40]
@@ -0,0 +1,51 @@
+import os
+import sys
+import pickle
+import numpy as np
+from types import SimpleNamespace
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.entity.compiled_model import CompiledPreprocessor
+
+
+def as_records(dataframe):
+    return [SimpleNamespace(**row) for row in dataframe.drop(columns=['id']).to_dict(orient="records")]
+
+
+class TestCompiledPreprocessor:
+    """Test class for the pandas-free compiled inference path"""
+
+    def test_transform_matches_sklearn_exactly(self, trained_model, model_features):
+        """Test that compiled preprocessing reproduces the fitted pipeline bit for bit"""
+        compiled = CompiledPreprocessor.from_pipeline(trained_model.preprocessing_object)
+        expected = trained_model.preprocessing_object.transform(model_features)
+
+        features = model_features[compiled.feature_names].to_numpy(dtype=np.float64)
+        assert np.array_equal(compiled.transform(features), expected)
+
+    def test_records_skip_the_dataframe(self, trained_model, model_features):
+        """Test that predict_records agrees with the DataFrame predict path"""
+        records = as_records(model_features)
+        expected = trained_model.predict(model_features.copy())
+
+        assert np.array_equal(trained_model.predict_records(records), expected)
+        for record, prediction in zip(records[:5], expected[:5]):
+            assert trained_model.predict_records([record])[0] == prediction
+
+    def test_unsupported_preprocessing_is_not_compiled(self):
+        """Test that preprocessing objects other than scaler ColumnTransformers fall back"""
+        from sklearn.pipeline import Pipeline
+        from sklearn.preprocessing import PolynomialFeatures
+
+        assert CompiledPreprocessor.from_pipeline(Pipeline([("poly", PolynomialFeatures())])) is None
+
+    def test_compiled_state_is_not_pickled(self, trained_model, model_features):
+        """Test that a pickled model rebuilds its compiled path after loading"""
+        trained_model.compile()
+        restored = pickle.loads(pickle.dumps(trained_model))
+
+        assert "_compiled_preprocessor" not in restored.__dict__
+        records = as_records(model_features)
+        assert np.array_equal(restored.predict_records(records), trained_model.predict_records(records))
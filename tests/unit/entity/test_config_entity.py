@@ -43,9 +43,9 @@ class TestConfigEntity:
         # Verify paths are correctly formed
         assert "artifact" in config.data_ingestion_dir
         assert "data_ingestion" in config.data_ingestion_dir
-        assert config.feature_store_file_path.endswith(".csv")
-        assert config.training_file_path.endswith(".csv")
-        assert config.testing_file_path.endswith(".csv")
+        assert config.feature_store_file_path.endswith(".parquet")
+        assert config.training_file_path.endswith(".parquet")
+        assert config.testing_file_path.endswith(".parquet")
 
         # Verify ratio is in valid range
         assert 0 < config.train_test_split_ratio < 1
@@ -0,0 +1,62 @@
+import os
+import sys
+import pytest
+import numpy as np
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.entity.flat_forest import FlatForest
+
+
+class TestFlatForest:
+    """Test class for the flattened array-backed forest evaluator"""
+
+    def test_matches_sklearn_predictions(self, trained_model, model_features):
+        """Test that flattened predictions and probabilities equal sklearn's exactly"""
+        forest = trained_model.trained_model_object
+        features = trained_model.preprocessing_object.transform(model_features)
+        flat = FlatForest.from_estimator(forest)
+
+        assert flat.n_trees == len(forest.estimators_)
+        assert np.array_equal(flat.predict_proba(features), forest.predict_proba(features))
+        assert np.array_equal(flat.predict(features), forest.predict(features))
+
+    def test_tree_major_evaluation_is_consistent(self, trained_model, model_features):
+        """Test that tree-by-tree evaluation in small blocks equals evaluating all trees at once"""
+        features = trained_model.preprocessing_object.transform(model_features)
+        flat = FlatForest.from_estimator(trained_model.trained_model_object)
+        expected = flat.predict_proba(features)
+
+        flat.ALL_TREES_MAX_ROWS = 0
+        flat.TREE_MAJOR_CHUNK_ROWS = 7
+        assert np.array_equal(flat.predict_proba(features), expected)
+
+    def test_rejects_non_finite_input(self, trained_model):
+        """Test that NaN input raises like sklearn instead of silently taking a branch"""
+        flat = FlatForest.from_estimator(trained_model.trained_model_object)
+        features = np.zeros((2, flat.n_features))
+        features[1, 0] = np.nan
+
+        with pytest.raises(ValueError):
+            flat.predict(features)
+
+    def test_matches_deep_unbounded_trees(self):
+        """Test parity on fully grown trees with multiple classes"""
+        from sklearn.ensemble import RandomForestClassifier
+
+        rng = np.random.default_rng(0)
+        features = rng.normal(size=(400, 6))
+        target = rng.integers(0, 3, 400)
+        forest = RandomForestClassifier(n_estimators=15, random_state=0).fit(features, target)
+        flat = FlatForest.from_estimator(forest)
+
+        test_features = rng.normal(size=(1000, 6))
+        assert np.array_equal(flat.predict(test_features), forest.predict(test_features))
+        assert np.array_equal(flat.predict_proba(test_features), forest.predict_proba(test_features))
+
+    def test_other_estimators_are_not_flattened(self):
+        """Test that non-forest estimators are left to sklearn"""
+        from sklearn.linear_model import LogisticRegression
+
+        assert FlatForest.from_estimator(LogisticRegression()) is None
@@ -0,0 +1,53 @@
+import os
+import sys
+import numpy as np
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.entity.local_pusher import LocalModelPusher
+from src.entity.model_artifact import load_mmap_artifact, mmap_artifact_dir, save_mmap_artifact
+from src.entity.model_holder import ProductionModelHolder
+from src.utils.main_utils import save_object
+
+
+class TestModelArtifact:
+    """Test class for the memory-mappable model artifact"""
+
+    def test_round_trip_matches_pickled_model(self, tmp_path, trained_model, model_features):
+        """Test that the mapped model predicts exactly like the pickled one"""
+        model_path = str(tmp_path / "model.pkl")
+        save_object(model_path, trained_model)
+        assert save_mmap_artifact(trained_model, model_path) == mmap_artifact_dir(model_path)
+
+        mapped = load_mmap_artifact(model_path)
+
+        assert mapped.preprocessing_object is None
+        assert not mapped._flat_forest.threshold.flags.writeable
+        expected = trained_model.predict(model_features.copy())
+        assert np.array_equal(mapped.predict(model_features.copy()), expected)
+        assert mapped.compile() is True
+
+    def test_stale_artifact_is_ignored(self, tmp_path, trained_model):
+        """Test that a pickle rewritten after the arrays were saved wins over them"""
+        model_path = str(tmp_path / "model.pkl")
+        save_object(model_path, trained_model)
+        save_mmap_artifact(trained_model, model_path)
+
+        os.utime(model_path, ns=(0, os.stat(model_path).st_mtime_ns + 1_000_000_000))
+
+        assert load_mmap_artifact(model_path) is None
+
+    def test_pushed_artifact_is_served_by_holder(self, tmp_path, trained_model, model_features):
+        """Test that the local pusher copies the arrays and the holder serves them"""
+        trained_path = str(tmp_path / "trained" / "model.pkl")
+        production_path = str(tmp_path / "production" / "model.pkl")
+        save_object(trained_path, trained_model)
+        save_mmap_artifact(trained_model, trained_path)
+
+        LocalModelPusher(model_path=trained_path, production_model_path=production_path).save_model(trained_path)
+        holder = ProductionModelHolder(local_model_path=production_path, reload_interval=0, use_s3=False)
+        model = holder.get_model()
+
+        assert model.preprocessing_object is None
+        assert np.array_equal(model.predict(model_features.copy()), trained_model.predict(model_features.copy()))
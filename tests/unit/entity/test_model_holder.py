@@ -0,0 +1,218 @@
+import os
+import sys
+import time
+import threading
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.entity.model_holder import ProductionModelHolder
+from src.exception import MyException
+from src.utils.main_utils import save_object
+
+
+class FailingS3:
+    """S3 stand-in whose version check succeeds and whose downloads fail; both are counted"""
+
+    def __init__(self, head_fails=False):
+        self.head_fails = head_fails
+        self.heads = 0
+        self.calls = 0
+
+    def get_object_version(self, model_path, bucket_name):
+        self.heads += 1
+        if self.head_fails:
+            raise ConnectionError("S3 unreachable")
+        return "etag-1"
+
+    def load_model(self, model_path, bucket_name):
+        self.calls += 1
+        raise ConnectionError("S3 download failed")
+
+
+class ServingS3:
+    """S3 stand-in serving one model; its version check can be switched to fail"""
+
+    def __init__(self, model):
+        self.model = model
+        self.head_fails = False
+        self.loads = 0
+
+    def get_object_version(self, model_path, bucket_name):
+        if self.head_fails:
+            raise ConnectionError("HEAD timed out")
+        return "etag-1"
+
+    def load_model(self, model_path, bucket_name):
+        self.loads += 1
+        return self.model
+
+
+class TestProductionModelHolder:
+    """Test class for the process-wide production model holder"""
+
+    def test_model_is_loaded_once(self, tmp_path, trained_model, model_features):
+        """Test that repeated calls serve the same in-memory model"""
+        model_path = str(tmp_path / "model.pkl")
+        save_object(model_path, trained_model)
+        holder = ProductionModelHolder(local_model_path=model_path, reload_interval=0, use_s3=False)
+
+        first = holder.get_model()
+        second = holder.get_model()
+
+        assert first is second
+        assert holder.source == "local"
+        assert holder.generation == 1
+        assert first.predict(model_features.copy()).shape == (len(model_features),)
+
+    def test_swaps_model_when_file_changes(self, tmp_path, trained_model):
+        """Test that a changed local file is picked up by the version check"""
+        model_path = str(tmp_path / "model.pkl")
+        save_object(model_path, trained_model)
+        holder = ProductionModelHolder(local_model_path=model_path, reload_interval=0, use_s3=False)
+        first = holder.get_model()
+
+        assert holder.check_for_update() is False
+
+        save_object(model_path, trained_model)
+        os.utime(model_path, ns=(0, os.stat(model_path).st_mtime_ns + 1_000_000_000))
+
+        assert holder.check_for_update() is True
+        assert holder.get_model() is not first
+        assert holder.generation == 2
+
+    def test_keeps_model_when_reload_fails(self, tmp_path, trained_model):
+        """Test that a broken replacement file does not evict the serving model"""
+        model_path = str(tmp_path / "model.pkl")
+        save_object(model_path, trained_model)
+        holder = ProductionModelHolder(local_model_path=model_path, reload_interval=0, use_s3=False)
+        first = holder.get_model()
+
+        with open(model_path, "wb") as file_obj:
+            file_obj.write(b"not a model")
+        os.utime(model_path, ns=(0, os.stat(model_path).st_mtime_ns + 1_000_000_000))
+
+        assert holder.check_for_update() is False
+        assert holder.get_model() is first
+
+    def test_missing_model_raises(self, tmp_path):
+        """Test that a missing model surfaces as MyException"""
+        holder = ProductionModelHolder(local_model_path=str(tmp_path / "missing.pkl"),
+                                       reload_interval=0, use_s3=False)
+        with pytest.raises(MyException):
+            holder.get_model()
+
+    def test_concurrent_cold_callers_share_one_load(self, tmp_path, trained_model):
+        """Test that a burst of cold requests loads the model once"""
+        model_path = str(tmp_path / "model.pkl")
+        save_object(model_path, trained_model)
+        holder = ProductionModelHolder(local_model_path=model_path, reload_interval=0, use_s3=False)
+        loads = []
+        original_load = holder._load
+
+        def slow_load(source, version):
+            loads.append(source)
+            time.sleep(0.2)
+            return original_load(source, version)
+
+        holder._load = slow_load
+        models = []
+        threads = [threading.Thread(target=lambda: models.append(holder.get_model())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert loads == ["local"]
+        assert len(models) == 8 and all(model is models[0] for model in models)
+        assert holder.stats()["loads"]["shared"] >= 1
+
+    def test_concurrent_cold_callers_share_the_error(self, tmp_path):
+        """Test that a failing load is attempted once for all waiting callers"""
+        holder = ProductionModelHolder(local_model_path=str(tmp_path / "missing.pkl"),
+                                       reload_interval=0, use_s3=False)
+        probes = []
+        original_probe = holder._probe_version
+
+        def slow_probe():
+            probes.append(1)
+            time.sleep(0.2)
+            return original_probe()
+
+        holder._probe_version = slow_probe
+        errors = []
+
+        def call():
+            try:
+                holder.get_model()
+            except MyException as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(probes) == 1
+        assert len(errors) == 5
+
+    def test_s3_is_skipped_during_backoff(self, tmp_path, trained_model):
+        """Test that a failed S3 load is remembered instead of retried on every check"""
+        model_path = str(tmp_path / "model.pkl")
+        save_object(model_path, trained_model)
+        holder = ProductionModelHolder(local_model_path=model_path, reload_interval=0,
+                                       s3_retry_backoff=60, s3_retry_backoff_max=600)
+        s3 = FailingS3()
+        holder._s3 = s3
+
+        holder.get_model()
+        for _ in range(5):
+            holder.check_for_update()
+
+        assert holder.source == "local"
+        assert s3.calls == 1
+        assert holder.stats()["s3_failures"] == 1
+        assert 0 < holder.stats()["s3_retry_in_seconds"] <= 60
+
+        # Once the backoff expires S3 is tried again and the next backoff doubles
+        holder._s3_retry_at = 0.0
+        holder.check_for_update()
+        assert s3.calls == 2
+        assert 60 < holder.stats()["s3_retry_in_seconds"] <= 120
+
+    def test_failed_version_check_does_not_back_off(self, tmp_path, trained_model):
+        """Test that failing S3 version checks are retried on the next check instead of pinning the local model"""
+        model_path = str(tmp_path / "model.pkl")
+        save_object(model_path, trained_model)
+        holder = ProductionModelHolder(local_model_path=model_path, reload_interval=0,
+                                       s3_retry_backoff=60, s3_retry_backoff_max=600)
+        s3 = FailingS3(head_fails=True)
+        holder._s3 = s3
+
+        holder.get_model()
+        for _ in range(3):
+            holder.check_for_update()
+
+        assert holder.source == "local"
+        assert s3.heads == 4
+        assert holder.stats()["s3_failures"] == 0
+        assert holder.stats()["s3_retry_in_seconds"] == 0
+
+    def test_failed_version_check_keeps_s3_model(self, tmp_path, trained_model):
+        """Test that one failing S3 version check does not replace the S3 model with the local file"""
+        model_path = str(tmp_path / "model.pkl")
+        save_object(model_path, trained_model)
+        holder = ProductionModelHolder(local_model_path=model_path, reload_interval=0)
+        s3 = ServingS3(trained_model)
+        holder._s3 = s3
+        served = holder.get_model()
+        assert holder.source == "s3"
+
+        s3.head_fails = True
+        assert holder.check_for_update() is False
+
+        assert holder.get_model() is served
+        assert (holder.source, holder.version, holder.generation) == ("s3", "etag-1", 1)
+        assert s3.loads == 1
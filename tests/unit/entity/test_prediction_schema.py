@@ -0,0 +1,64 @@
+import os
+import sys
+import json
+import pytest
+from pydantic import ValidationError
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.entity.prediction_schema import (
+    format_validation_errors,
+    get_vehicle_record_adapter,
+    read_prediction_columns,
+)
+from src.exception import MyException
+from src.pipeline.prediction_pipeline import VehicleData, VehicleDataBatch
+
+RECORD = {
+    "Gender": 1, "Age": 35, "Driving_License": 1, "Region_Code": 28.0, "Previously_Insured": 0,
+    "Annual_Premium": 30000.0, "Policy_Sales_Channel": 152.0, "Vintage": 100,
+    "Vehicle_Age_lt_1_Year": 1, "Vehicle_Age_gt_2_Years": 0, "Vehicle_Damage_Yes": 1,
+}
+
+
+class TestPredictionSchema:
+    """Test class for the schema-compiled JSON prediction validator"""
+
+    def test_schema_columns_match_model_features(self):
+        """Test that schema.yaml lists the model input features in model order"""
+        model_columns = [name for name in VehicleData(**RECORD).get_vehicle_data_as_dict() if name != "id"]
+        assert list(read_prediction_columns()) == model_columns
+        assert VehicleDataBatch.FEATURE_TYPES == read_prediction_columns()
+
+    def test_valid_record_is_typed(self):
+        """Test that numeric strings and integral floats are coerced to the schema types"""
+        record = get_vehicle_record_adapter().validate_json(
+            json.dumps(dict(RECORD, Age="35", Gender=1.0, Vintage=-5, id=7))
+        )
+        vehicle_data = VehicleData.from_validated(record)
+
+        assert record["Age"] == 35 and isinstance(record["Age"], int)
+        assert isinstance(record["Region_Code"], float)
+        assert "id" not in record
+        assert vehicle_data.Vintage == 0
+        assert vars(vehicle_data) == vars(VehicleData(**dict(RECORD, Vintage=-5)))
+
+    def test_errors_are_structured(self):
+        """Test that every invalid or missing field is reported in one pass"""
+        body = dict(RECORD, Age="old", Annual_Premium=None)
+        del body["Vintage"]
+
+        with pytest.raises(ValidationError) as error:
+            get_vehicle_record_adapter().validate_json(json.dumps(body))
+        errors = {item["field"]: item["type"] for item in format_validation_errors(error.value.errors())}
+
+        assert errors == {"Age": "int_parsing", "Annual_Premium": "float_type", "Vintage": "missing"}
+
+    def test_unsupported_schema_type_is_rejected(self, tmp_path):
+        """Test that a typo in schema.yaml fails loudly"""
+        schema_path = tmp_path / "schema.yaml"
+        schema_path.write_text("prediction_columns:\n  - Age: integer\n")
+
+        with pytest.raises(MyException):
+            read_prediction_columns(str(schema_path))
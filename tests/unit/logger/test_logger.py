@@ -0,0 +1,74 @@
+import logging
+import os
+import queue
+import sys
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.logger import DroppingQueueHandler, RateLimitFilter, get_logging_stats, process_log_file_path, stop_log_listener
+
+
+def make_record(level=logging.INFO, lineno=10):
+    return logging.LogRecord("test", level, "module.py", lineno, "message", None, None)
+
+
+class TestLogger:
+    """Test class for the queue-based logging configuration"""
+
+    def test_rate_limit_samples_after_burst(self):
+        """Test that a call site over its budget is sampled while warnings always pass"""
+        rate_filter = RateLimitFilter(rate_per_second=0.001, burst=5, sample_every=10)
+
+        passed = sum(rate_filter.filter(make_record()) for _ in range(105))
+
+        # 5 from the burst, then 1 in 10 of the remaining 100
+        assert passed == 15
+        assert rate_filter.sampled == 10
+        assert rate_filter.rate_limited == 90
+        assert rate_filter.filter(make_record(level=logging.WARNING))
+        # Other call sites have their own budget
+        assert rate_filter.filter(make_record(lineno=11))
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test that records over the queue capacity are counted and dropped"""
+        handler = DroppingQueueHandler(queue.Queue(maxsize=2))
+
+        for _ in range(5):
+            handler.handle(make_record())
+
+        assert handler.queue.qsize() == 2
+        assert handler.dropped == 3
+
+    def test_logging_stats(self):
+        """Test that the configured logger reports its queue counters"""
+        logging.getLogger(__name__).info("queued through the listener")
+
+        stats = get_logging_stats()
+        assert set(stats) == {"queued", "queue_size", "dropped", "rate_limited", "sampled", "file"}
+        assert stats["queued"] <= stats["queue_size"]
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+    def test_forked_process_writes_its_own_file(self):
+        """Test that a forked worker logs to a file named after its pid, not the parent's file"""
+        pid = os.fork()
+        if pid == 0:
+            try:
+                logging.getLogger(__name__).warning("written by the forked worker")
+                file_path = get_logging_stats()["file"]
+                stop_log_listener()
+                os._exit(0 if file_path == process_log_file_path(os.getpid()) else 1)
+            finally:
+                os._exit(2)
+        _, status = os.waitpid(pid, 0)
+
+        worker_file = process_log_file_path(pid)
+        try:
+            assert os.waitstatus_to_exitcode(status) == 0
+            with open(worker_file) as file:
+                assert "written by the forked worker" in file.read()
+            assert get_logging_stats()["file"] != worker_file
+        finally:
+            if os.path.exists(worker_file):
+                os.remove(worker_file)
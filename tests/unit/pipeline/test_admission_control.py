@@ -0,0 +1,167 @@
+import os
+import sys
+import asyncio
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.pipeline.admission_control import AdmissionController, AdmissionMiddleware, AdmissionRejected, worker_share
+
+
+class TestAdmissionControl:
+    """Test class for per-route admission control"""
+
+    def test_queue_full_is_rejected_immediately(self):
+        """Test that requests beyond the slots and the queue fail fast"""
+        controller = AdmissionController("test_queue_full", max_concurrency=2, max_queue=1, queue_timeout=5)
+        release = asyncio.Event()
+
+        async def request():
+            async with controller.admit():
+                await release.wait()
+
+        async def run():
+            running = [asyncio.ensure_future(request()) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            assert controller.in_flight == 2 and controller.queued == 1
+
+            with pytest.raises(AdmissionRejected) as rejected:
+                async with controller.admit():
+                    pass
+            assert rejected.value.reason == "queue_full"
+
+            release.set()
+            await asyncio.gather(*running)
+
+        asyncio.run(run())
+        assert controller.stats()["admitted"] == 3
+        assert controller.stats()["rejected"] == 1
+        assert controller.in_flight == 0 and controller.queued == 0
+        assert REGISTRY.get_sample_value(
+            "admission_rejections_total", {"route": "test_queue_full", "reason": "queue_full"}) == 1
+
+    def test_queued_request_times_out(self):
+        """Test that a queued request gives up after the queue timeout"""
+        controller = AdmissionController("test_queue_timeout", max_concurrency=1, max_queue=5, queue_timeout=0.05)
+
+        async def run():
+            async with controller.admit():
+                with pytest.raises(AdmissionRejected) as rejected:
+                    async with controller.admit():
+                        pass
+                return rejected.value.reason
+
+        assert asyncio.run(run()) == "queue_timeout"
+        assert controller.queued == 0
+
+    def test_middleware_answers_503_with_retry_after(self):
+        """Test that only the configured routes are limited and rejections carry Retry-After"""
+        release = asyncio.Event()
+
+        async def slow(request):
+            await release.wait()
+            return PlainTextResponse("done")
+
+        async def health(request):
+            return PlainTextResponse("ok")
+
+        controller = AdmissionController("test_middleware", max_concurrency=1, max_queue=0, retry_after=2.5)
+        app = AdmissionMiddleware(
+            Starlette(routes=[Route("/slow", slow, methods=["POST"]), Route("/health", health)]),
+            routes={("POST", "/slow"): controller},
+        )
+
+        async def run():
+            async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+                first = asyncio.ensure_future(client.post("/slow"))
+                await asyncio.sleep(0.01)
+                rejected = await client.post("/slow")
+                health = await client.get("/health")
+                release.set()
+                return await first, rejected, health
+
+        first, rejected, health = asyncio.run(run())
+        assert first.status_code == 200
+        assert rejected.status_code == 503
+        assert rejected.headers["Retry-After"] == "3"
+        assert health.status_code == 200
+
+    def test_permit_granted_at_timeout_is_returned(self):
+        """Test that a slot granted just as the queue timeout fires is released, not leaked"""
+        controller = AdmissionController("test_late_grant", max_concurrency=1, max_queue=1, queue_timeout=0.01)
+
+        class LateGrantSemaphore:
+            # The permit is handed over in the same instant the waiter gives up
+            released = 0
+
+            def locked(self):
+                return True
+
+            async def acquire(self):
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    return True
+
+            def release(self):
+                LateGrantSemaphore.released += 1
+
+        controller._semaphore = LateGrantSemaphore()
+
+        async def run():
+            with pytest.raises(AdmissionRejected) as rejected:
+                async with controller.admit():
+                    pass
+            return rejected.value.reason
+
+        assert asyncio.run(run()) == "queue_timeout"
+        assert LateGrantSemaphore.released == 1
+        assert controller.queued == 0 and controller.in_flight == 0
+
+    def test_slot_released_before_background_tasks(self):
+        """Test that background work after the response does not hold the route's slot"""
+        background_done = asyncio.Event()
+        background_release = asyncio.Event()
+
+        async def shadow_work():
+            await background_release.wait()
+            background_done.set()
+
+        async def predict(request):
+            return PlainTextResponse("done", background=BackgroundTask(shadow_work))
+
+        controller = AdmissionController("test_background", max_concurrency=1, max_queue=0)
+        app = AdmissionMiddleware(Starlette(routes=[Route("/predict", predict, methods=["POST"])]),
+                                  routes={("POST", "/predict"): controller})
+
+        async def run():
+            async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+                first = asyncio.ensure_future(client.post("/predict"))
+                await asyncio.sleep(0.05)
+                in_flight_during_background = controller.in_flight
+                second = asyncio.ensure_future(client.post("/predict"))
+                await asyncio.sleep(0.05)
+                background_release.set()
+                return await first, await second, in_flight_during_background
+
+        first, second, in_flight_during_background = asyncio.run(run())
+        assert in_flight_during_background == 0
+        assert first.status_code == 200 and second.status_code == 200
+        assert controller.stats()["rejected"] == 0
+        assert controller.in_flight == 0
+
+    def test_limits_are_split_across_workers(self):
+        """Test that pre-forked workers together admit no more than the configured limit"""
+        assert worker_share(64, 4, minimum=1) == 16
+        assert worker_share(10, 4) == 2
+        assert worker_share(256, 1) == 256
+        # Every worker keeps at least one slot, but a queue may shrink to nothing
+        assert worker_share(2, 4, minimum=1) == 1
+        assert worker_share(2, 4) == 0
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.pipeline.health_monitor import HealthMonitor
+
+
+def failing_probe():
+    raise ConnectionError("connection refused")
+
+
+class TestHealthMonitor:
+    """Test class for the background health monitor"""
+
+    def test_snapshot_before_first_probe(self):
+        """Test that the snapshot reports 'starting' until a probe round has run"""
+        monitor = HealthMonitor(probes={"model": lambda: "OK"})
+        assert monitor.snapshot()["status"] == "starting"
+
+    def test_probe_round_records_status_and_latency(self):
+        """Test that failures degrade the snapshot and every dependency gets a latency"""
+        monitor = HealthMonitor(probes={"model": lambda: "OK", "mongodb": failing_probe}, timeout=1)
+        snapshot = asyncio.run(monitor.probe_once())
+
+        assert snapshot["status"] == "degraded"
+        assert snapshot["services"]["model"]["status"] == "OK"
+        assert snapshot["services"]["mongodb"]["status"] == "Error: connection refused"
+        assert snapshot["services"]["model"]["latency_ms"] >= 0
+        assert snapshot["probe_age_seconds"] >= 0
+
+    def test_hanging_probe_times_out_and_is_not_restarted(self):
+        """Test that a hung dependency neither blocks the round nor piles up probe threads"""
+        release = threading.Event()
+        calls = []
+
+        def hanging_probe():
+            calls.append(1)
+            release.wait(5)
+            return "OK"
+
+        monitor = HealthMonitor(probes={"mongodb": hanging_probe}, timeout=0.05)
+
+        async def two_rounds():
+            start = time.perf_counter()
+            first = await monitor.probe_once()
+            second = await monitor.probe_once()
+            return first, second, time.perf_counter() - start
+
+        first, second, elapsed = asyncio.run(two_rounds())
+        release.set()
+
+        assert first["services"]["mongodb"]["status"].startswith("Error: timed out")
+        assert second["services"]["mongodb"]["status"] == "Error: previous probe still running"
+        assert len(calls) == 1
+        assert elapsed < 1
@@ -0,0 +1,56 @@
+import os
+import sys
+import time
+import asyncio
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.pipeline.inference_executor import InferenceExecutor
+
+
+class TestInferenceExecutor:
+    """Test class for the bounded inference executor"""
+
+    def test_event_loop_stays_responsive(self):
+        """Test that blocking work in the pool does not stall other coroutines"""
+        executor = InferenceExecutor(max_workers=1, kind="thread")
+
+        async def run():
+            work = asyncio.ensure_future(executor.run(time.sleep, 0.3))
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            loop_delay = time.perf_counter() - started
+            await work
+            return loop_delay
+
+        try:
+            assert asyncio.run(run()) < 0.2
+        finally:
+            executor.shutdown(wait=True)
+
+    def test_reports_queue_depth(self):
+        """Test that submissions beyond the worker count are reported as queued"""
+        executor = InferenceExecutor(max_workers=2, kind="thread")
+
+        async def run():
+            work = [asyncio.ensure_future(executor.run(time.sleep, 0.1)) for _ in range(5)]
+            await asyncio.sleep(0.02)
+            stats = executor.stats()
+            await asyncio.gather(*work)
+            return stats
+
+        try:
+            stats = asyncio.run(run())
+            assert stats["running"] == 2
+            assert stats["queued"] == 3
+            assert executor.stats()["completed"] == 5
+            assert executor.stats()["in_flight"] == 0
+        finally:
+            executor.shutdown(wait=True)
+
+    def test_rejects_unknown_kind(self):
+        """Test that an unknown pool kind is rejected"""
+        with pytest.raises(ValueError):
+            InferenceExecutor(kind="fiber")
@@ -0,0 +1,71 @@
+import os
+import sys
+import asyncio
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.pipeline.model_warmup import ModelWarmup
+
+
+class FakeServingPath:
+    """Records the warm-up traffic; the model load fails `failures` times first"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.loads = 0
+        self.single = []
+        self.batches = []
+
+    async def load_model(self):
+        self.loads += 1
+        if self.loads <= self.failures:
+            raise FileNotFoundError("model.pkl not found")
+
+    async def predict_one(self, vehicle_data):
+        self.single.append(vehicle_data)
+        return 0
+
+    async def predict_batch(self, vehicle_batch):
+        self.batches.append(vehicle_batch)
+        return [0] * vehicle_batch.size
+
+
+class TestModelWarmup:
+    """Test class for the startup warm-up and readiness state"""
+
+    def make_warmup(self, path, predictions=5):
+        return ModelWarmup(load_model=path.load_model, predict_one=path.predict_one,
+                           predict_batch=path.predict_batch, predictions=predictions, retry_interval=0)
+
+    def test_round_sends_configured_traffic_and_becomes_ready(self):
+        """Test that a round loads the model, then runs the single-record and batch paths"""
+        path = FakeServingPath()
+        warmup = self.make_warmup(path, predictions=5)
+        assert warmup.snapshot()["ready"] is False
+
+        assert asyncio.run(warmup.run_once()) is True
+
+        assert path.loads == 1
+        assert len(path.single) == 5
+        assert path.batches[0].size == 5
+        snapshot = warmup.snapshot()
+        assert snapshot["status"] == "ready" and snapshot["ready"] is True
+        assert set(snapshot["timings_ms"]) == {"model_load", "single_predictions", "batch_prediction"}
+
+    def test_failed_round_is_retried_until_ready(self):
+        """Test that the replica stays unready while the model cannot be loaded"""
+        path = FakeServingPath(failures=2)
+        warmup = self.make_warmup(path)
+
+        async def run():
+            assert await warmup.run_once() is False
+            assert warmup.snapshot()["error"] == "model.pkl not found"
+            warmup.start()
+            await asyncio.wait_for(warmup._task, timeout=5)
+
+        asyncio.run(run())
+
+        assert warmup.is_ready
+        assert warmup.attempts == 3
+        assert warmup.error is None
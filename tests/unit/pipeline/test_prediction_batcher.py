@@ -0,0 +1,107 @@
+import os
+import sys
+import asyncio
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.pipeline.prediction_batcher import PredictionBatcher
+
+
+class TestPredictionBatcher:
+    """Test class for the async micro-batching coalescer"""
+
+    def test_concurrent_requests_share_one_call(self):
+        """Test that concurrent predictions are scored in a single batch"""
+        calls = []
+
+        def predict_fn(records):
+            calls.append(list(records))
+            return [record * 10 for record in records]
+
+        async def run():
+            batcher = PredictionBatcher(predict_fn, max_batch_size=100, max_wait_ms=20)
+            return await asyncio.gather(*(batcher.predict(i) for i in range(8))), batcher
+
+        results, batcher = asyncio.run(run())
+
+        assert results == [i * 10 for i in range(8)]
+        assert calls == [list(range(8))]
+        assert batcher.stats()["largest_batch"] == 8
+
+    def test_flushes_when_batch_is_full(self):
+        """Test that reaching max_batch_size flushes without waiting for the timer"""
+        sizes = []
+
+        def predict_fn(records):
+            sizes.append(len(records))
+            return list(records)
+
+        async def run():
+            batcher = PredictionBatcher(predict_fn, max_batch_size=3, max_wait_ms=10_000)
+            return await asyncio.wait_for(asyncio.gather(*(batcher.predict(i) for i in range(6))), timeout=1)
+
+        assert asyncio.run(run()) == list(range(6))
+        assert sizes == [3, 3]
+
+    def test_errors_reach_every_waiter(self):
+        """Test that a failing batch raises in every awaiting request"""
+        def predict_fn(records):
+            raise RuntimeError("model unavailable")
+
+        async def run():
+            batcher = PredictionBatcher(predict_fn, max_batch_size=10, max_wait_ms=1)
+            return await asyncio.gather(*(batcher.predict(i) for i in range(3)), return_exceptions=True)
+
+        results = asyncio.run(run())
+
+        assert len(results) == 3
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    def test_running_batches_are_held_until_done(self):
+        """Test that the batcher keeps a strong reference to each running batch"""
+        async def run():
+            release = asyncio.Event()
+            batcher = PredictionBatcher(lambda records: list(records), max_batch_size=2, max_wait_ms=1)
+            # Park the batch on the event loop so it is still running when inspected
+            original = batcher._score_batch
+
+            async def slow_score(batch):
+                await release.wait()
+                await original(batch)
+
+            batcher._score_batch = slow_score
+            waiters = asyncio.gather(batcher.predict(1), batcher.predict(2))
+            await asyncio.sleep(0.01)
+            running = batcher.stats()["running"]
+            release.set()
+            results = await waiters
+            await asyncio.sleep(0)
+            return running, results, batcher.stats()["running"]
+
+        assert asyncio.run(run()) == (1, [1, 2], 0)
+
+    def test_close_flushes_and_cancels_stuck_batches(self):
+        """Test that close scores waiting records and cancels batches past the timeout"""
+        async def run():
+            batcher = PredictionBatcher(lambda records: list(records), max_batch_size=10, max_wait_ms=10_000)
+            waiting = asyncio.ensure_future(batcher.predict(7))
+            await asyncio.sleep(0)
+            await batcher.close()
+            flushed = await waiting
+
+            stuck = PredictionBatcher(lambda records: list(records), max_batch_size=1, max_wait_ms=1)
+
+            async def never_finishes(batch):
+                await asyncio.Event().wait()
+
+            stuck._score_batch = never_finishes
+            request = asyncio.ensure_future(stuck.predict(1))
+            await asyncio.sleep(0)
+            await stuck.close(timeout=0.01)
+            with pytest.raises(asyncio.CancelledError):
+                await request
+            return flushed, stuck.stats()["running"]
+
+        assert asyncio.run(run()) == (7, 0)
@@ -0,0 +1,80 @@
+import os
+import sys
+import numpy as np
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.entity.config_entity import VehiclePredictorConfig
+from src.entity.model_holder import ProductionModelHolder
+from src.pipeline.prediction_cache import PredictionCache
+from src.pipeline.prediction_pipeline import VehicleData, VehicleDataClassifier
+from src.utils.main_utils import save_object
+
+
+def make_vehicle(**overrides):
+    values = dict(Gender=1, Age=35, Driving_License=1, Region_Code=28.0, Previously_Insured=0,
+                  Annual_Premium=40000.0, Policy_Sales_Channel=26.0, Vintage=100,
+                  Vehicle_Age_lt_1_Year=0, Vehicle_Age_gt_2_Years=1, Vehicle_Damage_Yes=1)
+    values.update(overrides)
+    return VehicleData(**values)
+
+
+class TestPredictionCache:
+    """Test class for the LRU/TTL prediction cache"""
+
+    def test_lru_eviction_and_counters(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = PredictionCache(max_size=2, ttl_seconds=0)
+        cache.put("a", 1)
+        cache.put("b", 0)
+        assert cache.get("a") == 1
+        cache.put("c", 1)
+
+        assert cache.get("b") is None
+        assert cache.get("c") == 1
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (2, 1, 1, 2)
+
+    def test_entries_expire_after_ttl(self):
+        """Test that entries older than the TTL are treated as misses"""
+        now = [0.0]
+        cache = PredictionCache(max_size=10, ttl_seconds=5, clock=lambda: now[0])
+        cache.put("a", 1)
+        now[0] = 6.0
+
+        assert cache.get("a") is None
+        assert cache.stats()["expirations"] == 1
+        assert len(cache) == 0
+
+    def test_repeat_quotes_skip_the_model_and_swap_flushes(self, tmp_path, trained_model):
+        """Test that repeated records are served from the cache until a new model is loaded"""
+        model_path = str(tmp_path / "model.pkl")
+        save_object(model_path, trained_model)
+        holder = ProductionModelHolder(bucket_name="cache-test", local_model_path=model_path,
+                                       reload_interval=0, use_s3=False)
+        ProductionModelHolder.set_instance(holder)
+        classifier = VehicleDataClassifier(VehiclePredictorConfig(model_bucket_name="cache-test"))
+        cache = classifier.prediction_cache
+
+        records = [make_vehicle(), make_vehicle(Age=60)]
+        expected = holder.get_model().predict_records(records)
+        assert np.array_equal(classifier.predict_records(records), expected)
+
+        calls = []
+        model = holder.get_model()
+        original = model.predict_records
+        model.predict_records = lambda batch: calls.append(len(batch)) or original(batch)
+
+        assert np.array_equal(classifier.predict_records(records), expected)
+        assert np.array_equal(classifier.predict_records([make_vehicle(Age=45), records[0]]),
+                              original([make_vehicle(Age=45), records[0]]))
+        assert calls == [1]
+        assert cache.stats()["hits"] == 3
+
+        save_object(model_path, trained_model)
+        os.utime(model_path, ns=(0, os.stat(model_path).st_mtime_ns + 1_000_000_000))
+        flushes = cache.stats()["flushes"]
+        assert holder.check_for_update() is True
+        assert len(cache) == 0
+        assert cache.stats()["flushes"] == flushes + 1
@@ -8,7 +8,7 @@ import numpy as np
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
 # Import prediction pipeline
-from src.pipeline.prediction_pipeline import VehicleData, VehicleDataClassifier
+from src.pipeline.prediction_pipeline import VehicleData, VehicleDataBatch, VehicleDataClassifier
 
 class TestPredictionPipeline:
     """Test class for prediction pipeline"""
@@ -109,3 +109,58 @@ class TestPredictionPipeline:
         assert isinstance(prediction, np.ndarray)
         assert prediction.shape == (1,)
         assert prediction[0] in [0, 1]  # Binary classification
+
+    def test_vehicle_data_batch_builds_one_frame(self):
+        """Test VehicleDataBatch converts records column-wise into a single DataFrame"""
+        record = {
+            'Gender': 1, 'Age': '35', 'Driving_License': 1, 'Region_Code': 28,
+            'Previously_Insured': 0, 'Annual_Premium': 30000.5, 'Policy_Sales_Channel': 152,
+            'Vintage': -5, 'Vehicle_Age_lt_1_Year': 1, 'Vehicle_Age_gt_2_Years': 0,
+            'Vehicle_Damage_Yes': 1
+        }
+        batch = VehicleDataBatch([record, dict(record, Age=50)])
+        df = batch.get_vehicle_input_data_frame()
+
+        assert df.shape == (2, 12)
+        assert list(df['Age']) == [35, 50]
+        assert df['Age'].dtype == np.int64
+        assert df['Region_Code'].dtype == np.float64
+        assert list(df['Vintage']) == [0, 0]  # negative Vintage clipped like VehicleData
+        assert list(df['id']) == [0, 0]
+
+    def test_vehicle_data_batch_reports_invalid_columns(self):
+        """Test VehicleDataBatch reports every invalid column at once"""
+        record = {
+            'Gender': 1, 'Age': 35, 'Driving_License': 1, 'Region_Code': 28.0,
+            'Previously_Insured': 0, 'Annual_Premium': 30000.0, 'Policy_Sales_Channel': 152.0,
+            'Vintage': 100, 'Vehicle_Age_lt_1_Year': 1, 'Vehicle_Age_gt_2_Years': 0,
+            'Vehicle_Damage_Yes': 1
+        }
+        bad = dict(record, Age='old', Vintage=1.5)
+        del bad['Gender']
+
+        with pytest.raises(ValueError) as error:
+            VehicleDataBatch([record, bad])
+
+        message = str(error.value)
+        assert "Gender: missing in records [1]" in message
+        assert "Age: contains non-numeric values" in message
+        assert "Vintage: contains non-integer values" in message
+
+    def test_vehicle_data_batch_rejects_values_that_overflow_int(self):
+        """Test VehicleDataBatch rejects integral floats too large for an int column instead of wrapping them"""
+        record = {
+            'Gender': 1, 'Age': 35, 'Driving_License': 1, 'Region_Code': 28.0,
+            'Previously_Insured': 0, 'Annual_Premium': 30000.0, 'Policy_Sales_Channel': 152.0,
+            'Vintage': 100, 'Vehicle_Age_lt_1_Year': 1, 'Vehicle_Age_gt_2_Years': 0,
+            'Vehicle_Damage_Yes': 1
+        }
+
+        with pytest.raises(ValueError) as error:
+            VehicleDataBatch([record, dict(record, Age=1e30, Vintage=-2.0 ** 64)])
+
+        message = str(error.value)
+        assert "Age: contains values out of the integer range" in message
+        assert "Vintage: contains values out of the integer range" in message
+        # Float columns keep accepting any finite value
+        assert VehicleDataBatch([dict(record, Annual_Premium=1e30)]).columns["Annual_Premium"][0] == 1e30
@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+import socket
+import http.client
+import multiprocessing
+import pytest
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.pipeline.prefork_server import PreforkServer, read_process_memory
+
+
+async def pid_app(scope, receive, send):
+    """Minimal ASGI app answering with the pid of the worker that served the request"""
+    if scope["type"] != "http":
+        return
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": str(os.getpid()).encode()})
+
+
+def serve(port):
+    PreforkServer(pid_app, "127.0.0.1", port, workers=2, memory_report_interval=0).run()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="pre-fork serving needs os.fork")
+class TestPreforkServer:
+    """Test class for the pre-fork multi-worker server"""
+
+    def test_read_process_memory(self):
+        """Test that the current process reports RSS split into shared and private memory"""
+        memory = read_process_memory(os.getpid())
+        if not memory:
+            pytest.skip("/proc/<pid>/smaps_rollup is not available")
+        assert memory["rss_mb"] > 0
+        assert memory["rss_mb"] == pytest.approx(memory["shared_mb"] + memory["private_mb"], abs=0.2)
+
+    def test_workers_serve_and_shut_down_cleanly(self):
+        """Test that forked workers answer on the shared socket and stop with the master"""
+        port = free_port()
+        master = multiprocessing.get_context("fork").Process(target=serve, args=(port,))
+        master.start()
+        try:
+            pids = set()
+            deadline = time.monotonic() + 20
+            while not pids and time.monotonic() < deadline:
+                try:
+                    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+                    connection.request("GET", "/")
+                    response = connection.getresponse()
+                    assert response.status == 200
+                    pids.add(int(response.read()))
+                    connection.close()
+                except (ConnectionError, OSError):
+                    time.sleep(0.1)
+
+            assert pids
+            assert master.pid not in pids
+        finally:
+            master.terminate()
+            master.join(timeout=30)
+        assert master.exitcode == 0
@@ -0,0 +1,107 @@
+import os
+import sys
+import time
+import asyncio
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.pipeline.shadow_scorer import ShadowScorer
+
+
+class ConstantModel:
+    """Predicts the same class for every record, optionally after a delay"""
+
+    def __init__(self, value, delay=0.0):
+        self.value = value
+        self.delay = delay
+
+    def predict_records(self, records):
+        time.sleep(self.delay)
+        return [self.value] * len(records)
+
+
+class StaticHolder:
+    """Stands in for the candidate's ProductionModelHolder"""
+
+    local_model_path = "candidate.pkl"
+
+    def __init__(self, model):
+        self.model = model
+
+    def get_model(self):
+        return self.model
+
+    def stop_watcher(self):
+        pass
+
+
+class RecordingTasks:
+    """Collects what a route would hand to BackgroundTasks"""
+
+    def __init__(self):
+        self.tasks = []
+
+    def add_task(self, fn, *args):
+        self.tasks.append((fn, args))
+
+
+class TestShadowScorer:
+    """Test class for shadow scoring of a candidate model"""
+
+    def make_scorer(self, candidate, sample_rate=1.0, time_budget_ms=1000):
+        return ShadowScorer(candidate_holder=StaticHolder(candidate), production_model=lambda: ConstantModel(1),
+                            sample_rate=sample_rate, time_budget_ms=time_budget_ms)
+
+    def test_disabled_without_candidate(self):
+        """Test that nothing is scheduled when no candidate model is configured"""
+        scorer = ShadowScorer(candidate_holder=None, production_model=lambda: ConstantModel(1))
+        tasks = RecordingTasks()
+
+        scorer.maybe_schedule(tasks, ["record"], [1])
+
+        assert scorer.enabled is False
+        assert tasks.tasks == []
+
+    def test_sample_rate_selects_requests(self):
+        """Test that only sampled requests become background tasks"""
+        tasks = RecordingTasks()
+        self.make_scorer(ConstantModel(1), sample_rate=0.0).maybe_schedule(tasks, ["record"], [1])
+        assert tasks.tasks == []
+
+        self.make_scorer(ConstantModel(1), sample_rate=1.0).maybe_schedule(tasks, ["record"], [1])
+        assert len(tasks.tasks) == 1
+
+    def test_agreement_and_latency_are_recorded(self):
+        """Test that candidate predictions are compared with the served ones"""
+        scorer = self.make_scorer(ConstantModel(1))
+
+        agreement = asyncio.run(scorer.score(["a", "b", "c", "d"], [1, 1, 0, 1]))
+
+        stats = scorer.stats()
+        assert agreement == 0.75
+        assert stats["scored"] == 1 and stats["records"] == 4
+        assert stats["agreement_rate"] == 0.75
+        assert stats["latency"]["candidate"]["p99_ms"] >= 0
+        assert stats["latency"]["production"]["p99_ms"] >= 0
+        scorer.shutdown()
+
+    def test_budget_overrun_times_out_and_busy_jobs_are_skipped(self):
+        """Test that a slow candidate is abandoned and never has two jobs in flight"""
+        scorer = self.make_scorer(ConstantModel(1, delay=0.3), time_budget_ms=50)
+
+        async def run():
+            first = scorer.score(["a"], [1])
+            second = scorer.score(["b"], [1])
+            return await asyncio.gather(first, second)
+
+        assert asyncio.run(run()) == [None, None]
+        assert scorer.timed_out == 1
+        assert scorer.skipped_busy == 1
+        assert scorer.records == 0
+
+        # The slot frees up once the abandoned job has actually finished
+        time.sleep(0.4)
+        assert asyncio.run(scorer.score(["c"], [1])) is None
+        assert scorer.timed_out == 2
+        scorer.shutdown()
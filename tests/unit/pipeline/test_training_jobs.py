@@ -0,0 +1,104 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.pipeline.training_jobs import TrainingJobRunner
+
+
+def fake_training_job(job_id, events):
+    """Stand-in for run_training_job that reports two stages and a result"""
+    events.put((job_id, "running", None))
+    events.put((job_id, "stage", ("data_ingestion", "started")))
+    time.sleep(0.3)
+    events.put((job_id, "stage", ("data_ingestion", "completed")))
+    events.put((job_id, "succeeded", {"model_trainer_artifact": {"trained_model_file_path": "model.pkl"}}))
+
+
+def failing_training_job(job_id, events):
+    """Stand-in for run_training_job whose worker process crashes"""
+    os._exit(3)
+
+
+def wait_for(job, timeout=10):
+    deadline = time.time() + timeout
+    while job.is_active and time.time() < deadline:
+        time.sleep(0.05)
+
+
+class TestTrainingJobRunner:
+    """Test class for the background training job runner"""
+
+    def test_job_reports_progress_and_result(self):
+        """Test that a job runs in a worker process and records stages and result"""
+        runner = TrainingJobRunner(target=fake_training_job, start_method="fork")
+        job, created = runner.submit()
+
+        assert created
+        wait_for(job)
+
+        assert job.status == "succeeded"
+        assert job.stages["data_ingestion"] == "completed"
+        assert job.result["model_trainer_artifact"]["trained_model_file_path"] == "model.pkl"
+        assert runner.get(job.job_id) is job
+
+    def test_duplicate_submission_is_merged(self):
+        """Test that submitting while a job is in flight returns the same job"""
+        runner = TrainingJobRunner(target=fake_training_job, start_method="fork")
+        first, _ = runner.submit()
+        second, created = runner.submit()
+
+        assert not created
+        assert second is first
+        wait_for(first)
+
+        third, created = runner.submit()
+        assert created
+        assert third is not first
+        wait_for(third)
+
+    def test_crashed_worker_marks_job_failed(self):
+        """Test that a worker exiting without a result fails the job"""
+        runner = TrainingJobRunner(target=failing_training_job, start_method="fork")
+        job, _ = runner.submit()
+        wait_for(job)
+
+        assert job.status == "failed"
+        assert "exited with code 3" in job.error
+
+    def test_workers_sharing_state_see_one_job(self, tmp_path):
+        """Test that app workers sharing a state directory merge submissions and report each other's jobs"""
+        owner = TrainingJobRunner(target=fake_training_job, start_method="fork", state_dir=str(tmp_path))
+        other = TrainingJobRunner(target=fake_training_job, start_method="fork", state_dir=str(tmp_path))
+        job, _ = owner.submit()
+
+        merged, created = other.submit()
+        assert not created
+        assert merged.job_id == job.job_id and merged.is_active
+
+        wait_for(job)
+        shared = other.get(job.job_id)
+        assert shared.status == "succeeded"
+        assert shared.stages["data_ingestion"] == "completed"
+        assert shared.result == job.result
+        assert other.get("unknown") is None
+
+    def test_job_of_exited_worker_is_failed(self, tmp_path):
+        """Test that a shared job whose app worker is gone neither stays running nor blocks new runs"""
+        exited = subprocess.Popen([sys.executable, "-c", "pass"])
+        exited.wait()
+        with open(tmp_path / "abc123.json", "w") as file:
+            json.dump({"job_id": "abc123", "status": "running", "owner_pid": exited.pid}, file)
+        runner = TrainingJobRunner(target=fake_training_job, start_method="fork", state_dir=str(tmp_path))
+
+        stale = runner.get("abc123")
+        assert stale.status == "failed"
+        assert str(exited.pid) in stale.error
+
+        job, created = runner.submit()
+        assert created and job.job_id != "abc123"
+        wait_for(job)
@@ -0,0 +1,32 @@
+import os
+import sys
+import json
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Add the project root to the path
+sys.path.append(ROOT_DIR)
+
+# Training, S3 and Mongo stacks load on first use, never when a serving replica starts
+HEAVY_MODULES = [
+    "src.pipeline.training_pipeline",
+    "imblearn",
+    "sklearn",
+    "pandas",
+    "boto3",
+    "mypy_boto3_s3",
+    "pymongo",
+]
+
+
+class TestAppImports:
+    """Test class for the import footprint of the serving entry point"""
+
+    def test_app_import_skips_training_and_storage_stacks(self):
+        """Test that importing app loads none of the heavy training-only modules"""
+        code = f"import sys, json, app; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR,
+                                capture_output=True, text=True, check=True)
+
+        assert json.loads(result.stdout.strip().splitlines()[-1]) == []
@@ -12,6 +12,16 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
 # Import utility functions
 from src.utils.main_utils import read_yaml_file, write_yaml_file, save_numpy_array_data, load_numpy_array_data
 from src.utils.main_utils import save_object, load_object
+from src.utils.main_utils import write_dataframe, read_dataframe, read_dataframe_schema, log_memory_usage
+
+
+def sample_frame():
+    return pd.DataFrame({
+        "id": np.arange(4, dtype="int64"),
+        "Vehicle_Age": pd.Categorical(["> 2 Years", "< 1 Year", "1-2 Year", "> 2 Years"],
+                                      categories=["> 2 Years", "< 1 Year", "1-2 Year"]),
+        "Annual_Premium": [2630.0, 40000.5, np.nan, 1200.0],
+    })
 
 class TestMainUtils:
     """Test class for main utility functions"""
@@ -77,3 +87,60 @@ class TestMainUtils:
 
         # Verify data matches
         assert read_data == test_data
+
+    def test_dataframe_parquet_keeps_dtypes(self, tmp_path):
+        """Test that Parquet round-trips keep schema dtypes and sort categories"""
+        test_file = str(tmp_path / "ingested" / "train.parquet")
+        write_dataframe(test_file, sample_frame())
+
+        loaded = read_dataframe(test_file)
+
+        assert loaded["id"].dtype == np.int64
+        assert loaded["Annual_Premium"].dtype == np.float64
+        assert loaded["Vehicle_Age"].dtype.name == "category"
+        assert list(loaded["Vehicle_Age"].cat.categories) == ["1-2 Year", "< 1 Year", "> 2 Years"]
+        assert list(loaded["Vehicle_Age"]) == list(sample_frame()["Vehicle_Age"])
+        # One-hot encoding drops the same level as for the old CSV string column
+        assert list(pd.get_dummies(loaded[["Vehicle_Age"]], drop_first=True).columns) == \
+            list(pd.get_dummies(loaded[["Vehicle_Age"]].astype(str), drop_first=True).columns)
+
+    def test_dataframe_column_projection(self, tmp_path):
+        """Test reading a subset of columns and the schema without rows"""
+        test_file = str(tmp_path / "data.parquet")
+        write_dataframe(test_file, sample_frame())
+
+        assert list(read_dataframe(test_file, columns=["Annual_Premium"]).columns) == ["Annual_Premium"]
+        schema = read_dataframe_schema(test_file)
+        assert len(schema) == 0
+        assert list(schema.columns) == ["id", "Vehicle_Age", "Annual_Premium"]
+        assert schema["Vehicle_Age"].dtype.name == "category"
+
+    def test_dataframe_csv_export(self, tmp_path):
+        """Test that a .csv path is written and read as CSV"""
+        test_file = str(tmp_path / "data.csv")
+        write_dataframe(test_file, sample_frame())
+
+        with open(test_file) as file:
+            assert file.readline().strip() == "id,Vehicle_Age,Annual_Premium"
+        assert list(read_dataframe_schema(test_file).columns) == ["id", "Vehicle_Age", "Annual_Premium"]
+        assert len(read_dataframe(test_file, columns=["id"])) == 4
+
+    def test_read_dataframe_applies_compact_dtypes(self, tmp_path):
+        """Test that reads convert columns to the requested compact dtypes"""
+        test_file = str(tmp_path / "data.csv")
+        write_dataframe(test_file, sample_frame())
+
+        loaded = read_dataframe(test_file, dtypes={"id": "int16", "Vehicle_Age": "category",
+                                                   "Annual_Premium": "float32"})
+
+        assert loaded["id"].dtype == np.int16
+        assert loaded["Vehicle_Age"].dtype.name == "category"
+        assert loaded["Annual_Premium"].dtype == np.float32
+
+    def test_memory_usage_report(self):
+        """Test the per-frame, per-column memory report"""
+        report = log_memory_usage("test_stage", train=sample_frame())
+
+        assert set(report["train"]["columns"]) == {"id", "Vehicle_Age", "Annual_Premium"}
+        assert report["train"]["total_bytes"] == sum(report["train"]["columns"].values())
+        assert report["train"]["columns"]["id"] == 4 * 8
@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import pytest
+from prometheus_client import REGISTRY
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.utils.metrics import disable_stage_timing, record_cache_lookup, record_model_load, render_metrics, time_stage
+
+
+class TestMetrics:
+    """Test class for the in-process serving metrics"""
+
+    def test_time_stage_observes_histogram(self):
+        """Test that a timed block is counted under its stage label"""
+        labels = {"stage": "transform"}
+        before = REGISTRY.get_sample_value("prediction_stage_seconds_count", labels) or 0
+
+        with time_stage("transform"):
+            pass
+
+        assert REGISTRY.get_sample_value("prediction_stage_seconds_count", labels) == before + 1
+
+    def test_counters_and_exposition(self):
+        """Test that model source and cache counters show up in the scrape payload"""
+        record_model_load("local")
+        record_cache_lookup(hit=True)
+
+        payload, content_type = render_metrics()
+        text = payload.decode()
+
+        assert content_type.startswith("text/plain")
+        assert 'model_loads_total{source="local"}' in text
+        assert 'prediction_cache_lookups_total{result="hit"}' in text
+        assert 'prediction_stage_seconds_bucket{le="0.0001",stage="forest_predict"}' in text
+
+    def test_unknown_stage_is_rejected(self):
+        """Test that typos in stage names fail loudly instead of creating new series"""
+        with pytest.raises(KeyError):
+            time_stage("not_a_stage")
+
+    def test_disabled_thread_does_not_record_stages(self):
+        """Test that work off the request path stays out of the stage histograms"""
+        labels = {"stage": "forest_predict"}
+        before = REGISTRY.get_sample_value("prediction_stage_seconds_count", labels) or 0
+
+        def background_work():
+            disable_stage_timing()
+            with time_stage("forest_predict"):
+                pass
+
+        thread = threading.Thread(target=background_work)
+        thread.start()
+        thread.join()
+
+        assert (REGISTRY.get_sample_value("prediction_stage_seconds_count", labels) or 0) == before
+
+    def test_multiprocess_mode_sums_forked_workers(self, tmp_path):
+        """Test that with PROMETHEUS_MULTIPROC_DIR a scrape reports every worker, not just its own"""
+        script = textwrap.dedent("""
+            import os
+            from src.pipeline.admission_control import AdmissionController
+            from src.utils.metrics import mark_worker_dead, record_cache_lookup, render_metrics
+
+            controller = AdmissionController("multiprocess", max_concurrency=4, max_queue=0)
+            pid = os.fork()
+            record_cache_lookup(hit=True)
+            controller.in_flight += 1
+            if pid == 0:
+                os._exit(0)
+            os.waitpid(pid, 0)
+            print(render_metrics()[0].decode())
+            print("--- after the worker exited ---")
+            mark_worker_dead(pid)
+            print(render_metrics()[0].decode())
+        """)
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path / "metrics"))
+        result = subprocess.run([sys.executable, "-c", script], cwd=PROJECT_ROOT, env=env,
+                                capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+
+        both, after_exit = result.stdout.split("--- after the worker exited ---")
+        assert 'prediction_cache_lookups_total{result="hit"} 2.0' in both
+        assert 'admission_in_flight_requests{route="multiprocess"} 2.0' in both
+        # Counters of an exited worker are kept, its live gauges are not
+        assert 'prediction_cache_lookups_total{result="hit"} 2.0' in after_exit
+        assert 'admission_in_flight_requests{route="multiprocess"} 1.0' in after_exit
@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+import threading
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.utils.single_flight import SingleFlight
+
+
+def run_concurrently(count, fn):
+    results = [None] * count
+
+    def call(index):
+        try:
+            results[index] = fn()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestSingleFlight:
+    """Test class for merging concurrent calls"""
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Test that callers during an in-flight call get its result"""
+        flight = SingleFlight()
+        executions = []
+
+        def load():
+            executions.append(1)
+            time.sleep(0.2)
+            return object()
+
+        results = run_concurrently(6, lambda: flight.do("model", load))
+
+        assert len(executions) == 1
+        assert all(result is results[0] for result in results)
+        assert flight.stats() == {"executions": 1, "shared": 5, "in_flight": 0}
+
+    def test_error_is_shared_and_not_cached(self):
+        """Test that every waiter sees the failure and the next call runs again"""
+        flight = SingleFlight()
+        executions = []
+
+        def fail():
+            executions.append(1)
+            time.sleep(0.2)
+            raise ConnectionError("S3 unreachable")
+
+        results = run_concurrently(4, lambda: flight.do("model", fail))
+
+        assert len(executions) == 1
+        assert all(isinstance(result, ConnectionError) for result in results)
+        assert flight.do("model", lambda: "loaded") == "loaded"
+        assert flight.stats()["executions"] == 2
@@ -0,0 +1,38 @@
+import os
+import sys
+import numpy as np
+
+# Add the project root to the path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.entity.prediction_schema import read_prediction_columns
+from src.pipeline.prediction_pipeline import VehicleData, VehicleDataBatch
+from src.utils.synthetic_data import synthetic_vehicle_frame, synthetic_vehicle_model, synthetic_vehicle_records
+
+
+class TestSyntheticData:
+    """Test class for the shared synthetic vehicle data"""
+
+    def test_records_follow_the_prediction_schema(self):
+        """Test that the synthetic records pass the batch validation used by the routes"""
+        records = synthetic_vehicle_records(50)
+
+        assert list(records[0]) == list(read_prediction_columns())
+        assert VehicleDataBatch(records).size == 50
+        assert not any(record["Vehicle_Age_lt_1_Year"] and record["Vehicle_Age_gt_2_Years"] for record in records)
+        assert synthetic_vehicle_records(5, seed=3) == synthetic_vehicle_records(5, seed=3)
+
+    def test_model_scores_the_synthetic_frame(self):
+        """Test that the fitted model has the production layout and predicts both classes"""
+        model = synthetic_vehicle_model(n_rows=400, n_estimators=5, max_depth=8, seed=1)
+        features = synthetic_vehicle_frame(200, seed=2)
+        assert list(features.columns) == ["id", *read_prediction_columns()]
+
+        # Requests carry no id, the serving path scores them with id 0
+        features["id"] = 0
+        predictions = model.predict(features.copy())
+
+        assert model.trained_model_object.n_estimators == 5
+        assert set(np.unique(predictions)) == {0, 1}
+        records = [VehicleData.from_validated(record) for record in synthetic_vehicle_records(200, seed=2)]
+        assert np.array_equal(model.predict_records(records), predictions)